@@ -5,7 +5,7 @@
 import argparse
 from typing import List
 
-from core import Config, PolicyCrawler
+from core import Config
 from utils import Logger
 
 
@@ -37,9 +37,19 @@ class CLI:
   # 使用代理
   python main.py batch --proxy --kuaidaili-key "key:secret"
 
+  # 按ID哈希分片输出目录
+  python main.py batch --layout hash
+
+  # 查看/重建输出清单
+  python main.py index
+  python main.py index --rebuild
+
   # 查看配置
   python main.py config --show
 
+  # 检查启动时间（超出预算时返回非零退出码）
+  python main.py startup-check
+
   # 修改配置
   python main.py config --set request_delay=3
 
@@ -60,6 +70,10 @@ class CLI:
             '--output', type=str, default=None,
             help='输出目录 (默认: 使用配置文件中的设置)'
         )
+        crawl_parser.add_argument(
+            '--layout', type=str, default=None, choices=['flat', 'hash', 'type_year'],
+            help='输出目录布局: flat-平铺, hash-按ID哈希分片, type_year-按类型/年份分片'
+        )
         crawl_parser.add_argument(
             '--proxy', action='store_true',
             help='启用代理'
@@ -68,6 +82,22 @@ class CLI:
             '--kuaidaili-key', type=str, default=None,
             help='快代理API密钥 (格式: secret_id:secret_key)'
         )
+        crawl_parser.add_argument(
+            '--trace', action='store_true',
+            help='记录链路追踪，结束后导出 Chrome Trace 文件（输出目录/trace.json）'
+        )
+        crawl_parser.add_argument(
+            '--http-cache', action='store_true',
+            help='启用HTTP响应缓存（有效期内不重复请求，过期后条件请求重新验证）'
+        )
+        crawl_parser.add_argument(
+            '--profile', type=str, default=None, choices=['cprofile', 'sample'],
+            help='性能分析: cprofile-确定性分析(.pstats), sample-采样分析(火焰图 .collapsed)，结果写入输出目录'
+        )
+        crawl_parser.add_argument(
+            '--memory', action='store_true',
+            help='内存诊断：按阶段拍摄 tracemalloc 快照，结束后输出分配增长报告（输出目录/memory_*.txt）'
+        )
         
         # batch命令 - 批量爬取
         batch_parser = subparsers.add_parser('batch', help='批量爬取政策')
@@ -79,6 +109,10 @@ class CLI:
             '--output', type=str, default=None,
             help='输出目录 (默认: 使用配置文件中的设置)'
         )
+        batch_parser.add_argument(
+            '--layout', type=str, default=None, choices=['flat', 'hash', 'type_year'],
+            help='输出目录布局: flat-平铺, hash-按ID哈希分片, type_year-按类型/年份分片'
+        )
         batch_parser.add_argument(
             '--proxy', action='store_true',
             help='启用代理'
@@ -87,10 +121,128 @@ class CLI:
             '--kuaidaili-key', type=str, default=None,
             help='快代理API密钥 (格式: secret_id:secret_key)'
         )
+        batch_parser.add_argument(
+            '--trace', action='store_true',
+            help='记录链路追踪，结束后导出 Chrome Trace 文件（输出目录/trace.json）'
+        )
+        batch_parser.add_argument(
+            '--http-cache', action='store_true',
+            help='启用HTTP响应缓存（有效期内不重复请求，过期后条件请求重新验证）'
+        )
+        batch_parser.add_argument(
+            '--profile', type=str, default=None, choices=['cprofile', 'sample'],
+            help='性能分析: cprofile-确定性分析(.pstats), sample-采样分析(火焰图 .collapsed)，结果写入输出目录'
+        )
+        batch_parser.add_argument(
+            '--memory', action='store_true',
+            help='内存诊断：按阶段拍摄 tracemalloc 快照，结束后输出分配增长报告（输出目录/memory_*.txt）'
+        )
+        batch_parser.add_argument(
+            '--since', type=str, metavar='DATE',
+            help='只爬取此日期及之后通过的政策 (格式: YYYY-MM-DD)'
+        )
+        batch_parser.add_argument(
+            '--until', type=str, metavar='DATE',
+            help='只爬取此日期及之前通过的政策 (格式: YYYY-MM-DD)'
+        )
+        batch_parser.add_argument(
+            '--office', type=str,
+            help='只爬取制定机关包含这些关键字的政策，逗号分隔 (如: 广州,深圳)'
+        )
+        batch_parser.add_argument(
+            '--timeliness', type=str,
+            help='只爬取这些时效性的政策，逗号分隔 (如: 现行有效)'
+        )
+        batch_parser.add_argument(
+            '--keyword', type=str,
+            help='只爬取标题包含这些关键字的政策，逗号分隔'
+        )
+        batch_parser.add_argument(
+            '--refresh', action='store_true',
+            help='增量更新：只爬取新增和列表信息有变化的政策，变化记录写入 输出目录/changes.jsonl'
+        )
+        batch_parser.add_argument(
+            '--redownload', action='store_true',
+            help='重新下载全部附件（不使用清单中已记录且校验通过的本地文件，也不跳过负缓存中的附件）'
+        )
+        batch_parser.add_argument(
+            '--retry-failed', action='store_true',
+            help='只重新爬取 输出目录/dead_letter.jsonl 中仍失败的政策（不获取列表）'
+        )
+        batch_parser.add_argument(
+            '--retry-rounds', type=int, default=None,
+            help='结束后重试失败政策的轮数，0 不重试 (默认: 使用配置文件中的设置)'
+        )
         batch_parser.add_argument(
             '--limit', type=int, default=None,
             help='限制爬取数量（用于测试）'
         )
+        batch_parser.add_argument(
+            '--metrics-port', type=int, default=None,
+            help='在本地端口提供 Prometheus 指标 (http://127.0.0.1:PORT/metrics)'
+        )
+        batch_parser.add_argument(
+            '--metrics-file', type=str, default=None,
+            help='定期写入 Prometheus 指标文件 (.prom)'
+        )
+        
+        # index命令 - 输出清单
+        index_parser = subparsers.add_parser('index', help='查看或重建输出清单')
+        index_parser.add_argument(
+            '--output', type=str, default=None,
+            help='输出目录 (默认: 使用配置文件中的设置)'
+        )
+        index_group = index_parser.add_mutually_exclusive_group()
+        index_group.add_argument(
+            '--rebuild', action='store_true',
+            help='扫描现有输出目录重建清单'
+        )
+        index_group.add_argument(
+            '--compact', action='store_true',
+            help='压缩清单（每个政策保留一行）'
+        )
+        index_group.add_argument(
+            '--find', type=str, metavar='POLICY_ID',
+            help='查找政策的输出文件'
+        )
+        
+        # rebuild命令 - 离线重建Markdown
+        rebuild_parser = subparsers.add_parser('rebuild', help='由已保存的JSON和附件离线重建Markdown（不访问网络）')
+        rebuild_parser.add_argument(
+            '--output', type=str, default=None,
+            help='输出目录 (默认: 使用配置文件中的设置)'
+        )
+        rebuild_parser.add_argument(
+            '--since', type=str, metavar='DATE',
+            help='只重建此日期之后爬取的政策 (格式: YYYY-MM-DD)'
+        )
+        rebuild_parser.add_argument(
+            '--only-failed', action='store_true',
+            help='只重建之前附件转换失败的政策'
+        )
+        rebuild_parser.add_argument(
+            '--stale', action='store_true',
+            help='只重建已过期的Markdown（转换器或模板已更新等，见 status 命令）'
+        )
+        rebuild_parser.add_argument(
+            '--workers', type=int,
+            help='进程数 (默认读取配置 rebuild_workers，0 表示CPU核数)'
+        )
+        
+        # status命令 - 输出过期情况
+        status_parser = subparsers.add_parser('status', help='检查输出是否过期（JSON / 附件 / Markdown）')
+        status_parser.add_argument(
+            '--output', type=str, default=None,
+            help='输出目录 (默认: 使用配置文件中的设置)'
+        )
+        status_parser.add_argument(
+            '--verify', action='store_true',
+            help='重新计算JSON和附件的哈希（读取全部文件，较慢）'
+        )
+        status_parser.add_argument(
+            '--list', action='store_true',
+            help='列出过期政策的ID'
+        )
         
         # config命令 - 配置管理
         config_parser = subparsers.add_parser('config', help='配置管理')
@@ -111,6 +263,32 @@ class CLI:
         # version命令 - 版本信息
         subparsers.add_parser('version', help='显示版本信息')
         
+        # startup-check命令 - 启动时间检查
+        startup_parser = subparsers.add_parser('startup-check', help='检查冷启动时间和导入开销')
+        startup_parser.add_argument(
+            '--target', type=str, choices=['version', 'config', 'help'], default='version',
+            help='要检查的入口命令 (默认: version)'
+        )
+        startup_parser.add_argument(
+            '--budget', type=int,
+            help='启动时间预算（毫秒，默认读取配置 startup_budget_ms）'
+        )
+        startup_parser.add_argument(
+            '--runs', type=int, default=5,
+            help='运行次数，取最快一次 (默认: 5)'
+        )
+        
+        # memory-bench命令 - 内存基准
+        membench_parser = subparsers.add_parser('memory-bench', help='离线内存基准：检查内存是否随政策数量线性增长')
+        membench_parser.add_argument(
+            '--sizes', type=str, default='500,1000,2000',
+            help='政策数量列表，逗号分隔 (默认: 500,1000,2000)'
+        )
+        membench_parser.add_argument(
+            '--budget', type=int,
+            help='每条政策允许的持有内存和运行峰值增长（字节，默认读取配置 memory_budget_bytes）'
+        )
+        
         return parser
     
     def run(self, args: List[str] = None):
@@ -130,10 +308,20 @@ class CLI:
             self._crawl_single(parsed_args)
         elif parsed_args.command == 'batch':
             self._crawl_batch(parsed_args)
+        elif parsed_args.command == 'index':
+            self._manage_index(parsed_args)
+        elif parsed_args.command == 'rebuild':
+            self._rebuild(parsed_args)
+        elif parsed_args.command == 'status':
+            self._show_status(parsed_args)
         elif parsed_args.command == 'config':
             self._manage_config(parsed_args)
         elif parsed_args.command == 'version':
             self._show_version()
+        elif parsed_args.command == 'startup-check':
+            self._startup_check(parsed_args)
+        elif parsed_args.command == 'memory-bench':
+            self._memory_bench(parsed_args)
     
     def _crawl_single(self, args):
         """爬取单个政策"""
@@ -144,13 +332,28 @@ class CLI:
         # 应用参数
         if args.output:
             self.config.set("output_dir", args.output)
+        if args.layout:
+            self.config.set("output_layout", args.layout)
         if args.proxy:
             self.config.set("use_proxy", True)
         if args.kuaidaili_key:
             self.config.set("kuaidaili_api_key", args.kuaidaili_key)
             self.config.set("use_proxy", True)
+        if args.trace:
+            self.config.set("trace_enabled", True)
+        if args.http_cache:
+            self.config.set("http_cache", True)
+        if args.profile:
+            self.config.set("profile", args.profile)
+        if args.memory:
+            self.config.set("memory_profile", True)
         
-        # 创建爬虫
+        # 日志经队列由后台线程写入控制台和日志文件
+        Logger.setup_from_config(self.config)
+        
+        # 创建爬虫（延迟导入，version/config 等命令不加载网络和转换模块）
+        from core import PolicyCrawler
+        profiler = self._start_profiler()
         crawler = PolicyCrawler(self.config, progress_callback=self._print_progress)
         
         try:
@@ -162,10 +365,12 @@ class CLI:
                 print("[X] 未找到政策")
                 return
             
-            # 转换为Policy对象
-            from core import Policy
-            rows = result['data']['rows']
-            policies = [Policy.from_dict(row) for row in rows]
+            # 校验并转换为Policy对象
+            from core.codec import decode_policies
+            policies, _ = decode_policies(result['data']['rows'])
+            if not policies:
+                print("[X] 政策列表格式错误")
+                return
             
             print(f"获取到 {len(policies)} 条政策")
             
@@ -189,6 +394,8 @@ class CLI:
             traceback.print_exc()
         finally:
             crawler.close()
+            self._stop_profiler(profiler)
+            Logger.shutdown()
     
     def _crawl_batch(self, args):
         """批量爬取政策"""
@@ -206,18 +413,72 @@ class CLI:
         # 应用参数
         if args.output:
             self.config.set("output_dir", args.output)
+        if args.layout:
+            self.config.set("output_layout", args.layout)
         if args.proxy:
             self.config.set("use_proxy", True)
         if args.kuaidaili_key:
             self.config.set("kuaidaili_api_key", args.kuaidaili_key)
             self.config.set("use_proxy", True)
+        if args.trace:
+            self.config.set("trace_enabled", True)
+        if args.http_cache:
+            self.config.set("http_cache", True)
+        if args.profile:
+            self.config.set("profile", args.profile)
+        if args.memory:
+            self.config.set("memory_profile", True)
+        from core.filters import valid_date
+        for value in (args.since, args.until):
+            if value and not valid_date(value):
+                print(f"[错误] 无效的日期: {value}（格式: YYYY-MM-DD）")
+                return
+        if args.since:
+            self.config.set("filter_date_from", args.since)
+        if args.until:
+            self.config.set("filter_date_to", args.until)
+        if args.office:
+            self.config.set("filter_offices", args.office.split(','))
+        if args.timeliness:
+            self.config.set("filter_timeliness", args.timeliness.split(','))
+        if args.keyword:
+            self.config.set("filter_title_keywords", args.keyword.split(','))
+        if args.redownload:
+            self.config.set("skip_existing_files", False)
+        if args.retry_rounds is not None:
+            self.config.set("retry_rounds", max(0, args.retry_rounds))
+        
+        # 日志经队列由后台线程写入控制台和日志文件
+        Logger.setup_from_config(self.config)
+        if args.metrics_port is not None:
+            self.config.set("metrics_port", args.metrics_port)
+        if args.metrics_file is not None:
+            self.config.set("metrics_file", args.metrics_file)
         
-        # 创建爬虫
+        # 创建爬虫（延迟导入，version/config 等命令不加载网络和转换模块）
+        from core import PolicyCrawler
+        profiler = self._start_profiler()
         crawler = PolicyCrawler(self.config, progress_callback=self._print_progress)
         
         try:
+            if args.retry_failed:
+                # 重试死信文件中的政策（不获取列表）
+                policies = crawler.load_dead_letters()
+                if not policies:
+                    print(f"\n没有需要重试的政策: {crawler.dead_letter_path()}")
+                    return
+                print(f"\n重试死信中的政策: {len(policies)} 条")
+                progress = crawler.crawl_batch(policies=policies)
+                print(f"\n已成功: {progress.completed_count} 条，仍失败: {progress.failed_count} 条")
+            elif args.refresh:
+                # 增量更新（只获取列表，与清单比较后爬取新增和变化的政策）
+                if args.limit:
+                    print("\n[提示] 增量更新模式忽略 --limit")
+                progress = crawler.crawl_batch(law_rule_types, refresh=True)
+                print(f"\n新增或变化: {progress.total_count} 条，已更新: {progress.completed_count} 条")
+                print(f"变化记录: {crawler.config.output_dir}/{crawler.CHANGES_FILENAME}")
             # 如果有限制，先获取政策列表然后截取
-            if args.limit:
+            elif args.limit:
                 print(f"\n[测试模式] 限制爬取数量: {args.limit}")
                 all_policies = []
                 for law_rule_type in law_rule_types:
@@ -248,6 +509,152 @@ class CLI:
             traceback.print_exc()
         finally:
             crawler.close()
+            self._stop_profiler(profiler)
+            Logger.shutdown()
+    
+    def _start_profiler(self):
+        """按配置启动性能分析（未启用时返回None）"""
+        if not self.config.get("profile"):
+            return None
+        from core.profiling import create_profiler
+        return create_profiler(self.config)
+    
+    def _stop_profiler(self, profiler):
+        """停止性能分析并打印输出文件"""
+        if profiler is None:
+            return
+        paths = profiler.stop()
+        if paths:
+            print("\n性能分析结果:")
+            for path in paths:
+                print(f"  {path}")
+    
+    def _manage_index(self, args):
+        """管理输出清单"""
+        from core.manifest import Manifest
+        
+        output_dir = args.output or self.config.output_dir
+        manifest = Manifest(output_dir)
+        
+        if args.rebuild:
+            print(f"扫描输出目录: {output_dir}")
+            count = manifest.rebuild()
+            print(f"[OK] 清单已重建，共 {count} 条政策: {manifest.path}")
+        
+        elif args.compact:
+            manifest.compact()
+            print(f"[OK] 清单已压缩，共 {len(manifest)} 条政策")
+        
+        elif args.find:
+            entry = manifest.get(args.find)
+            if not entry:
+                print(f"[X] 清单中没有该政策: {args.find}")
+                return
+            print(f"标题: {entry.get('title', '')}")
+            for kind in ("json", "markdown", "files"):
+                for path in manifest.resolve(args.find, kind):
+                    print(f"{kind}: {path}")
+        
+        else:
+            print("="*60)
+            print(f"输出清单: {manifest.path}")
+            print("="*60)
+            entries = manifest.entries()
+            print(f"政策总数: {len(entries)}")
+            type_names = {1: "地方性法规", 2: "政府规章", 3: "规范性文件"}
+            counts = {}
+            for entry in entries:
+                law_rule_type = entry.get("law_rule_type")
+                counts[law_rule_type] = counts.get(law_rule_type, 0) + 1
+            for law_rule_type, count in sorted(counts.items(), key=lambda item: str(item[0])):
+                print(f"  {type_names.get(law_rule_type, f'类型{law_rule_type}')}: {count}")
+            print(f"含Markdown: {sum(1 for e in entries if e.get('markdown'))}")
+            print(f"含附件: {sum(1 for e in entries if e.get('files'))}")
+    
+    def _rebuild(self, args):
+        """离线重建Markdown"""
+        import sys
+        from core.filters import valid_date
+        from core.rebuild import rebuild
+        
+        if args.since and not valid_date(args.since):
+            print(f"[错误] 无效的日期: {args.since}（格式: YYYY-MM-DD）")
+            return
+        
+        output_dir = args.output or self.config.output_dir
+        workers = args.workers if args.workers is not None else self.config.get("rebuild_workers", 0)
+        
+        print("="*60)
+        print("离线重建Markdown")
+        print("="*60)
+        print(f"输出目录: {output_dir}")
+        if args.since:
+            print(f"起始日期: {args.since}")
+        if args.only_failed:
+            print("范围: 仅转换失败的政策")
+        if args.stale:
+            print("范围: 仅已过期的Markdown")
+        print()
+        
+        def on_progress(done, total):
+            if done == total or done % 100 == 0:
+                print(f"  进度: {done}/{total}")
+        
+        stats = rebuild(
+            self.config,
+            output_dir=output_dir,
+            since=args.since,
+            only_failed=args.only_failed,
+            only_stale=args.stale,
+            workers=workers or None,
+            progress_callback=on_progress
+        )
+        
+        print()
+        print(f"待重建: {stats['total']}")
+        print(f"已重建: {stats['rebuilt']} (含正文: {stats['converted']})")
+        print(f"失败: {stats['failed']}")
+        for policy_id, error in stats["errors"][:20]:
+            print(f"  [X] {policy_id}: {error}")
+        print(f"耗时: {stats['elapsed']:.1f} 秒")
+        if stats["failed"]:
+            sys.exit(1)
+    
+    def _show_status(self, args):
+        """显示输出过期情况"""
+        from core.manifest import Manifest
+        from core import fingerprint
+        from core.failures import NegativeCache, describe
+        
+        output_dir = args.output or self.config.output_dir
+        manifest = Manifest(output_dir)
+        report = fingerprint.status(manifest, verify=args.verify)
+        versions = fingerprint.current_versions()
+        
+        print("="*60)
+        print(f"输出状态: {output_dir}")
+        print("="*60)
+        print(f"政策总数: {report['total']}")
+        print(f"转换器版本: {versions['converter']}  模板版本: {versions['template']}")
+        print()
+        stage_names = {"json": "JSON", "files": "附件", "markdown": "Markdown"}
+        for stage, stage_report in report["stages"].items():
+            print(f"{stage_names[stage]}: {stage_report['total']} 个，过期 {stage_report['stale']} 个")
+            for reason, count in sorted(stage_report["reasons"].items(), key=lambda item: -item[1]):
+                print(f"  {reason}: {count}")
+            if args.list and report["stale_ids"][stage]:
+                print(f"  ID: {', '.join(report['stale_ids'][stage])}")
+        
+        negative_cache = NegativeCache(output_dir)
+        if len(negative_cache):
+            print()
+            print(f"已知永久失败（跳过至过期）: {len(negative_cache)} 个")
+            for category, count in sorted(negative_cache.counts().items(), key=lambda item: -item[1]):
+                print(f"  {describe(category)}: {count}")
+        
+        if report["stages"]["markdown"]["stale"]:
+            print()
+            print("提示: 运行 python main.py rebuild --stale 离线重建过期的Markdown")
     
     def _manage_config(self, args):
         """管理配置"""
@@ -310,6 +717,128 @@ class CLI:
         print("  - GUI图形界面")
         print("="*60)
     
+    # 轻量命令不应加载的模块（网络请求、文档转换、GUI）
+    HEAVY_MODULES = ("requests", "urllib3", "docx", "lxml", "pypdf", "tkinter", "core.crawler")
+    
+    def _startup_check(self, args):
+        """检查入口命令的冷启动时间
+        
+        在子进程中多次运行 main.py，取最快一次的耗时与预算比较；再用
+        python -X importtime 运行一次，列出累计耗时最多的导入，并检查是否
+        加载了不该在轻量命令中出现的重模块。不通过时以退出码1结束。
+        """
+        import os
+        import sys
+        import time
+        import subprocess
+        
+        budget = args.budget or int(self.config.get("startup_budget_ms", 300))
+        target_args = {
+            'version': ['version'],
+            'config': ['config', '--show'],
+            'help': ['--help'],
+        }[args.target]
+        
+        if getattr(sys, 'frozen', False):
+            command = [sys.executable]
+            profile_command = None
+        else:
+            main_script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+            command = [sys.executable, main_script]
+            profile_command = [sys.executable, '-X', 'importtime', main_script]
+        
+        print("="*60)
+        print(f"启动时间检查: {' '.join(target_args)}")
+        print("="*60)
+        
+        timings = []
+        for _ in range(max(1, args.runs)):
+            started = time.perf_counter()
+            subprocess.run(command + target_args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            timings.append((time.perf_counter() - started) * 1000)
+        best = min(timings)
+        print(f"耗时: 最快 {best:.0f} ms，最慢 {max(timings):.0f} ms（预算 {budget} ms）")
+        
+        heavy = []
+        if profile_command:
+            result = subprocess.run(
+                profile_command + target_args,
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors='replace'
+            )
+            imports = []
+            for line in result.stderr.splitlines():
+                if not line.startswith('import time:'):
+                    continue
+                parts = line[len('import time:'):].split('|')
+                if len(parts) != 3 or not parts[1].strip().isdigit():
+                    continue
+                name = parts[2].rstrip()
+                depth = (len(name) - len(name.lstrip())) // 2
+                module = name.strip()
+                imports.append((int(parts[1]), depth, module))
+                if any(module == m or module.startswith(m + '.') for m in self.HEAVY_MODULES):
+                    heavy.append(module)
+            
+            print("\n累计耗时最多的导入:")
+            for cumulative, depth, module in sorted(imports, reverse=True)[:10]:
+                print(f"  {cumulative / 1000:8.1f} ms  {'  ' * depth}{module}")
+        
+        passed = best <= budget and not heavy
+        if heavy:
+            print(f"\n[X] 加载了重模块: {', '.join(sorted(set(heavy)))}")
+        if best > budget:
+            print(f"\n[X] 启动时间超出预算 {best - budget:.0f} ms")
+        if passed:
+            print("\n[OK] 启动时间在预算内")
+        else:
+            sys.exit(1)
+    
+    def _memory_bench(self, args):
+        """离线内存基准
+        
+        用合成的列表和详情数据（不访问网络、不下载附件）按不同政策数量
+        跑完整的批量爬取流程，比较爬取结束后爬虫仍持有的内存。持有内存
+        随政策数量的增长斜率超过预算时以退出码1结束。
+        """
+        import sys
+        from core.profiling import memory_benchmark
+        
+        try:
+            sizes = sorted({int(size.strip()) for size in args.sizes.split(',') if size.strip()})
+        except ValueError:
+            print(f"[错误] 无效的政策数量列表: {args.sizes}")
+            sys.exit(2)
+        if len(sizes) < 2:
+            print("[错误] 至少需要两个不同的政策数量")
+            sys.exit(2)
+        budget = args.budget or int(self.config.get("memory_budget_bytes", 2560))
+        
+        print("="*60)
+        print(f"内存基准: {', '.join(str(size) for size in sizes)} 条政策")
+        print("="*60)
+        
+        results = memory_benchmark(self.config, sizes)
+        
+        print(f"\n{'政策数':>8}{'持有内存':>14}{'运行峰值':>14}{'每条持有':>12}")
+        for result in results:
+            print(
+                f"{result['policies']:>8}{result['retained'] / 1024:>12.1f}KB"
+                f"{result['peak'] / 1024:>12.1f}KB{result['retained'] / result['policies']:>10.0f} B"
+            )
+        
+        first, last = results[0], results[-1]
+        slope = (last['retained'] - first['retained']) / (last['policies'] - first['policies'])
+        peak_slope = (last['peak'] - first['peak']) / (last['policies'] - first['policies'])
+        print(f"\n持有内存增长: {slope:.0f} B/条（预算 {budget} B/条），运行峰值增长: {peak_slope:.0f} B/条")
+        
+        if slope > budget:
+            print("\n[X] 持有内存随政策数量增长超出预算")
+            sys.exit(1)
+        if peak_slope > budget:
+            print("\n[X] 运行峰值随政策数量增长超出预算")
+            sys.exit(1)
+        print("\n[OK] 内存增长在预算内")
+    
     def _print_progress(self, progress):
         """打印进度信息"""
         if progress.total_count > 0:
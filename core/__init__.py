@@ -8,11 +8,29 @@ __project_name__ = "gd-law-crawler"
 __github_url__ = "https://github.com/ViVi141/gd-law-crawler"
 __email__ = "747384120@qq.com"
 
-from .crawler import PolicyCrawler
-from .converter import DocumentConverter
-from .api_client import APIClient
 from .config import Config
-from .models import Policy, PolicyDetail, FileAttachment, CrawlProgress
+from .models import Policy, PolicyDetail, FileAttachment, CrawlProgress, IdSet
+
+# 依赖 requests 等较重模块的类在首次访问时才导入（加快 version、config 等命令的启动）
+_LAZY_IMPORTS = {
+    "PolicyCrawler": ".crawler",
+    "DocumentConverter": ".converter",
+    "APIClient": ".api_client",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
 
 __all__ = [
     "PolicyCrawler",
@@ -23,5 +41,6 @@ __all__ = [
     "PolicyDetail",
     "FileAttachment",
     "CrawlProgress",
+    "IdSet",
 ]
 
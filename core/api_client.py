@@ -5,8 +5,10 @@ API客户端模块 - 处理所有HTTP请求
 import requests
 import time
 import random
+import logging
 import warnings
-from typing import Dict, Optional, Any
+import threading
+from typing import Dict, Optional, Any, Tuple
 from urllib.parse import quote
 
 # 禁用 urllib3 的 HeaderParsingError 警告（服务器响应头格式不完全标准，但不影响功能）
@@ -17,6 +19,15 @@ except (ImportError, AttributeError):
     pass
 
 from .config import Config
+from . import codec
+from .stats import CrawlStats
+from . import tracing
+from .writer import atomic_write_bytes
+from .http_cache import CacheEntry, HTTPCache, content_hash, create_http_cache
+from . import failures
+from . import filetype
+
+logger = logging.getLogger(__name__)
 
 
 # User-Agent列表
@@ -29,24 +40,81 @@ USER_AGENTS = [
 ]
 
 
+class RateLimiter:
+    """最小间隔限速（线程安全，多个下载线程共享）
+    
+    每次请求前调用 wait()，相邻两次放行至少间隔 interval 秒；遇到限流时
+    pause() 让所有线程一起等待。
+    """
+    
+    def __init__(self, interval: float):
+        self.interval = max(0.0, float(interval or 0))
+        self._next = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """等待到下一个放行时刻"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            tracing.sleep(start - now, reason="download_interval")
+    
+    def pause(self, seconds: float):
+        """之后 seconds 秒内不再放行（限流时使用）"""
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+
 class APIClient:
     """API客户端类"""
     
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, stats: Optional[CrawlStats] = None):
         """初始化API客户端
         
         Args:
             config: 配置对象
+            stats: 运行统计（为空时新建）
         """
         self.config = config
+        self.stats = stats or CrawlStats()
         self.session = self._create_session()
         self.request_count = 0
+        self.network_calls = 0  # 实际发出的请求数（缓存命中不计）
         self.current_proxy = None
         self.q_token = ""
         
+        # 最近一次请求失败的 (类别, 原因)，成功时为None（类别见 core.failures）
+        # 按线程保存：并发下载时各线程读取自己的结果
+        self._local = threading.local()
+        
+        # 会话轮换和代理切换在多个下载线程间共享
+        self._session_lock = threading.RLock()
+        # 各会话上进行中的请求数（id(session) → 数量）；轮换时旧会话等请求结束后再关闭
+        self._session_users: Dict[int, int] = {}
+        
+        # 附件下载限速（所有下载线程共享）
+        self.download_limiter = RateLimiter(config.get("download_interval", 0.3))
+        
+        # 磁盘HTTP缓存（未启用时为None）
+        self.cache: Optional[HTTPCache] = create_http_cache(config)
+        # 为True时列表和详情的缓存即使在有效期内也发送条件请求（增量更新时使用，
+        # 避免漏掉新增政策或用旧详情覆盖变化）
+        self.revalidate = False
+        
         # 初始化代理（如果启用）
         self._init_proxy()
     
+    @property
+    def last_failure(self) -> Optional[Tuple[str, str]]:
+        """当前线程最近一次请求失败的 (类别, 原因)"""
+        return getattr(self._local, "failure", None)
+    
+    @last_failure.setter
+    def last_failure(self, value: Optional[Tuple[str, str]]):
+        self._local.failure = value
+    
     def _create_session(self) -> requests.Session:
         """创建新的会话"""
         session = requests.Session()
@@ -87,13 +155,13 @@ class APIClient:
                 secret_id, secret_key = api_key.split(':', 1)
                 auth = kdl.Auth(secret_id, secret_key)
                 self.kuaidaili_client = kdl.Client(auth, timeout=(8, 12), max_retries=3)
-                print("[信息] 快代理已启用")
+                logger.info("[信息] 快代理已启用")
             else:
-                print("[警告] 快代理API密钥格式错误，需要 secret_id:secret_key")
+                logger.warning("[警告] 快代理API密钥格式错误，需要 secret_id:secret_key")
         except ImportError:
-            print("[警告] 快代理SDK未安装: pip install kdl")
+            logger.warning("[警告] 快代理SDK未安装: pip install kdl")
         except Exception as e:
-            print(f"[警告] 快代理初始化失败: {e}")
+            logger.warning(f"[警告] 快代理初始化失败: {e}")
     
     def _get_proxy(self, force_new: bool = False) -> Optional[Dict[str, str]]:
         """获取代理IP
@@ -107,43 +175,124 @@ class APIClient:
         if not self.config.use_proxy:
             return None
         
-        if force_new or self.current_proxy is None:
-            try:
-                if hasattr(self, 'kuaidaili_client'):
-                    proxy_list = self.kuaidaili_client.get_dps(1, format='json')
-                    if proxy_list and len(proxy_list) > 0:
-                        self.current_proxy = proxy_list[0]
-                        print(f"  [代理] 获取新代理: {self.current_proxy[:50]}...")
-            except Exception as e:
-                if force_new:
-                    print(f"  [警告] 获取代理失败: {e}")
-                self.current_proxy = None
+        with self._session_lock:
+            if force_new or self.current_proxy is None:
+                try:
+                    if hasattr(self, 'kuaidaili_client'):
+                        proxy_list = self.kuaidaili_client.get_dps(1, format='json')
+                        if proxy_list and len(proxy_list) > 0:
+                            self.current_proxy = proxy_list[0]
+                            logger.info(f"  [代理] 获取新代理: {self.current_proxy[:50]}...")
+                except Exception as e:
+                    if force_new:
+                        logger.warning(f"  [警告] 获取代理失败: {e}")
+                    self.current_proxy = None
+            proxy = self.current_proxy
         
-        if self.current_proxy:
+        if proxy:
             return {
-                'http': f'http://{self.current_proxy}',
-                'https': f'http://{self.current_proxy}',
+                'http': f'http://{proxy}',
+                'https': f'http://{proxy}',
             }
         
         return None
     
-    def _rotate_session(self):
-        """轮换会话"""
-        if hasattr(self.session, 'close'):
+    @staticmethod
+    def _close_session(session):
+        """关闭会话（忽略异常）"""
+        if hasattr(session, 'close'):
             try:
-                self.session.close()
+                session.close()
             except Exception:
                 pass
+    
+    def _acquire_session(self):
+        """取得当前会话供一次请求使用，请求结束后必须调用 _release_session
         
-        self.session = self._create_session()
-        self.request_count = 0
-        print("  [会话轮换] 已创建新会话")
+        Returns:
+            会话对象
+        """
+        with self._session_lock:
+            session = self.session
+            key = id(session)
+            self._session_users[key] = self._session_users.get(key, 0) + 1
+            return session
+    
+    def _release_session(self, session):
+        """结束一次请求；已被轮换掉的会话在最后一个请求结束时关闭"""
+        with self._session_lock:
+            key = id(session)
+            remaining = self._session_users.get(key, 1) - 1
+            if remaining > 0:
+                self._session_users[key] = remaining
+                return
+            self._session_users.pop(key, None)
+            retired = session is not self.session
+        if retired:
+            self._close_session(session)
+    
+    def _rotate_session(self):
+        """轮换会话（旧会话上仍有请求时，由最后一个请求结束时关闭）"""
+        with self._session_lock:
+            old = self.session
+            self.session = self._create_session()
+            self.request_count = 0
+            in_use = self._session_users.get(id(old), 0) > 0
+        if not in_use:
+            self._close_session(old)
+        logger.info("  [会话轮换] 已创建新会话")
     
     def _check_and_rotate_session(self):
         """检查并轮换会话"""
-        self.request_count += 1
-        if self.request_count >= self.config.get("session_rotate_interval", 50):
-            self._rotate_session()
+        with self._session_lock:
+            self.request_count += 1
+            self.network_calls += 1
+            if self.request_count >= self.config.get("session_rotate_interval", 50):
+                self._rotate_session()
+    
+    @staticmethod
+    def _parse_json(response) -> Any:
+        """解析响应JSON（优先使用快速解析器，编码异常时回退到 requests）"""
+        try:
+            return codec.loads(response.content)
+        except ValueError:
+            return response.json()
+    
+    def _cache_lookup(self, endpoint: str, url: str, params: Any = None) -> Tuple[Optional[str], Optional[CacheEntry]]:
+        """查询缓存
+        
+        Returns:
+            (缓存键, 缓存记录)，未启用缓存时均为None
+        """
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(url, params)
+        return key, self.cache.get(endpoint, key)
+    
+    def _cache_revalidated(self, endpoint: str, key: Optional[str], entry: Optional[CacheEntry], response) -> bool:
+        """服务器返回 304 时刷新缓存有效期"""
+        if entry is None or response.status_code != 304:
+            return False
+        self.cache.touch(endpoint, key, entry)
+        self.stats.record_cache(endpoint, "revalidated")
+        return True
+    
+    def _cache_store(self, endpoint: str, key: Optional[str], entry: Optional[CacheEntry], response, body: bytes):
+        """保存成功的响应（内容哈希与旧记录相同时记为未变化）"""
+        if key is None:
+            return
+        unchanged = entry is not None and entry.content_hash == content_hash(body)
+        self.cache.put(endpoint, key, body, response.headers)
+        self.stats.record_cache(endpoint, "unchanged" if unchanged else "miss")
+    
+    @staticmethod
+    def _error_status(error: Exception) -> str:
+        """请求异常对应的状态标签（HTTP错误用状态码，其余用异常类型）"""
+        response = getattr(error, 'response', None)
+        status_code = getattr(response, 'status_code', None)
+        if status_code:
+            return str(status_code)
+        return type(error).__name__
     
     def search_policies(
         self,
@@ -162,6 +311,7 @@ class APIClient:
             搜索结果
         """
         url = f"{self.config.api_base_url}/nfrr/law-rule!noSession_es_regulation_search.gx"
+        self.last_failure = None
         
         params = {
             "pageNum": page_num,
@@ -169,18 +319,32 @@ class APIClient:
             "lawRuleType": law_rule_type,
             "orderByColumn": "passDate"
         }
+        # 附加的服务器端查询参数（search_params 配置项，原样发送）
+        extra_params = self.config.get("search_params") or {}
+        if isinstance(extra_params, dict):
+            params.update(extra_params)
         
         headers = {
             'Content-Type': 'application/json',
             'Q-Token': self.q_token
         }
         
+        cache_key, cached = self._cache_lookup("search", url, params)
+        if cached is not None:
+            if cached.fresh and not self.revalidate:
+                self.stats.record_cache("search", "hit")
+                return codec.loads(cached.body)
+            headers.update(cached.conditional_headers())
+        
         self._check_and_rotate_session()
         
         for retry in range(self.config.max_retries):
+            started = time.monotonic()
+            recorded = False
+            session = self._acquire_session()
             try:
                 proxies = self._get_proxy(force_new=(retry > 0))
-                response = self.session.post(
+                response = session.post(
                     url,
                     json=params,
                     headers=headers,
@@ -188,37 +352,64 @@ class APIClient:
                     proxies=proxies
                 )
                 response.raise_for_status()
-                result = response.json()
+                if self._cache_revalidated("search", cache_key, cached, response):
+                    return codec.loads(cached.body)
+                result = self._parse_json(response)
+                ok = result.get('code') == 200
+                self.stats.record_request(
+                    "search", time.monotonic() - started,
+                    ok=ok, nbytes=len(response.content),
+                    status=str(response.status_code) if ok else "api_error"
+                )
+                recorded = True
                 
                 # 更新Q-Token
                 if 'msg' in result:
                     self.q_token = result['msg']
                 
                 if result.get('code') == 200:
+                    self._cache_store("search", cache_key, cached, response, response.content)
                     return result
                 else:
                     error_msg = result.get('msg', '未知错误')
-                    print(f"[X] 搜索失败: {error_msg}")
+                    logger.warning(f"[X] 搜索失败: {error_msg}")
+                    self.last_failure = (failures.SERVER_ERROR, str(error_msg))
                     
                     # 检查是否限流
                     if "Too many requests" in str(error_msg) or "rate limit" in str(error_msg).lower():
+                        self.last_failure = (failures.RATE_LIMITED, str(error_msg))
                         if retry < self.config.max_retries - 1:
                             wait_time = self.config.get("rate_limit_delay", 30) * (retry + 1)
-                            print(f"  [限流] 等待 {wait_time} 秒...")
-                            time.sleep(wait_time)
+                            logger.warning(
+                                f"  [限流] 等待 {wait_time} 秒...",
+                                extra={"endpoint": "search", "attempt": retry + 1, "wait": wait_time}
+                            )
+                            self.stats.record_rate_limit(wait_time)
+                            tracing.sleep(wait_time, reason="rate_limit")
                             continue
                     
                     return None
                     
             except Exception as e:
-                print(f"[X] 请求异常: {e}")
+                logger.warning(f"[X] 请求异常: {e}", extra={"endpoint": "search", "error": type(e).__name__})
+                self.last_failure = (failures.classify_exception(e), str(e))
+                if not recorded:
+                    self.stats.record_request(
+                        "search", time.monotonic() - started, ok=False, status=self._error_status(e)
+                    )
                 
                 if retry < self.config.max_retries - 1:
                     wait_time = self.config.get("retry_delay", 5) * (retry + 1)
-                    print(f"  [重试 {retry + 1}/{self.config.max_retries}] 等待 {wait_time} 秒...")
-                    time.sleep(wait_time)
+                    logger.warning(
+                        f"  [重试 {retry + 1}/{self.config.max_retries}] 等待 {wait_time} 秒...",
+                        extra={"endpoint": "search", "attempt": retry + 1, "wait": wait_time}
+                    )
+                    self.stats.record_retry("search")
+                    tracing.sleep(wait_time, reason="retry")
                 else:
                     return None
+            finally:
+                self._release_session(session)
         
         return None
     
@@ -233,39 +424,70 @@ class APIClient:
         """
         url = f"{self.config.api_base_url}/nfrr/law-rule!noSession_getById.gx"
         data = {'id': policy_id}
+        self.last_failure = None
+        
+        headers = {}
+        cache_key, cached = self._cache_lookup("detail", url, data)
+        if cached is not None:
+            if cached.fresh and not self.revalidate:
+                self.stats.record_cache("detail", "hit")
+                return codec.loads(cached.body)
+            headers.update(cached.conditional_headers())
         
         self._check_and_rotate_session()
         
         for retry in range(self.config.max_retries):
+            started = time.monotonic()
+            recorded = False
+            session = self._acquire_session()
             try:
                 proxies = self._get_proxy(force_new=(retry > 0))
-                response = self.session.post(
+                response = session.post(
                     url,
                     data=data,
+                    headers=headers,
                     timeout=self.config.get("timeout", 30),
                     proxies=proxies
                 )
                 response.raise_for_status()
-                result = response.json()
+                if self._cache_revalidated("detail", cache_key, cached, response):
+                    return codec.loads(cached.body)
+                result = self._parse_json(response)
+                valid = bool(result) and ('lawRule' in result or 'list' in result)
+                self.stats.record_request(
+                    "detail", time.monotonic() - started,
+                    ok=valid, nbytes=len(response.content),
+                    status=str(response.status_code) if valid else "invalid"
+                )
+                recorded = True
                 
-                if result and ('lawRule' in result or 'list' in result):
+                if valid:
+                    self._cache_store("detail", cache_key, cached, response, response.content)
                     return result
                 else:
-                    print("[X] 详情数据格式异常")
-                    if retry < self.config.max_retries - 1:
-                        wait_time = self.config.get("retry_delay", 5) * (retry + 1)
-                        time.sleep(wait_time)
-                        continue
+                    # 服务器正常返回但缺少详情字段，重试也不会变化
+                    logger.warning("[X] 详情数据格式异常")
+                    self.last_failure = (failures.MALFORMED_DETAIL, "详情缺少 lawRule / list 字段")
                     return None
                     
             except Exception as e:
-                print(f"[X] 获取详情失败: {e}")
+                logger.warning(f"[X] 获取详情失败: {e}")
+                if not recorded:
+                    self.stats.record_request(
+                        "detail", time.monotonic() - started, ok=False, status=self._error_status(e)
+                    )
+                self.last_failure = (failures.classify_exception(e), str(e))
+                if self.last_failure[0] in failures.PERMANENT:
+                    return None
                 
                 if retry < self.config.max_retries - 1:
                     wait_time = self.config.get("retry_delay", 5) * (retry + 1)
-                    time.sleep(wait_time)
+                    self.stats.record_retry("detail")
+                    tracing.sleep(wait_time, reason="retry")
                 else:
                     return None
+            finally:
+                self._release_session(session)
         
         return None
     
@@ -275,7 +497,7 @@ class APIClient:
         save_path: str,
         chunk_size: int = 8192
     ) -> bool:
-        """下载文件
+        """下载文件（临时文件 + 替换，避免留下不完整文件）
         
         Args:
             file_path: 文件路径（服务器端）
@@ -285,16 +507,57 @@ class APIClient:
         Returns:
             是否下载成功
         """
+        content = self.fetch_file(file_path, chunk_size=chunk_size)
+        if content is None:
+            return False
+        
+        try:
+            atomic_write_bytes(save_path, content)
+            return True
+        except Exception as e:
+            logger.warning(f"  [X] 保存失败: {e}")
+            return False
+    
+    def fetch_file(
+        self,
+        file_path: str,
+        chunk_size: int = 8192
+    ) -> Optional[bytes]:
+        """下载文件内容到内存（不写磁盘，由调用方决定如何落盘）
+        
+        Args:
+            file_path: 文件路径（服务器端）
+            chunk_size: 分块大小
+            
+        Returns:
+            文件内容，失败返回None（内容是错误页面或超过 max_attachment_size 时中止下载，不重试）
+        """
         # 处理文件路径特殊字符
         processed_path = file_path.replace('(', 'left').replace(')', 'right')
         processed_path = processed_path.replace('（', 'zLeft').replace('）', 'zRight')
         processed_path = processed_path.replace('[', 'lBracket').replace(']', 'rBracket')
         
         url = f"{self.config.api_base_url}/downloadFile?fileFolder={quote(processed_path, safe='')}"
+        self.last_failure = None
+        declared = filetype.ext_from_path(file_path)
+        max_size = int(self.config.get("max_attachment_size", 0) or 0)
+        
+        headers = {}
+        cache_key, cached = self._cache_lookup("download", url)
+        if cached is not None:
+            if cached.fresh:
+                self.stats.record_cache("download", "hit")
+                return cached.body
+            headers.update(cached.conditional_headers())
         
         self._check_and_rotate_session()
         
         for retry in range(self.config.max_retries):
+            # 所有下载线程共享限速
+            self.download_limiter.wait()
+            chunks = []
+            started = time.monotonic()
+            session = self._acquire_session()
             try:
                 proxies = self._get_proxy(force_new=(retry > 0))
                 
@@ -307,67 +570,126 @@ class APIClient:
                     except (ImportError, AttributeError):
                         pass
                     
-                    response = self.session.get(
+                    response = session.get(
                         url,
                         stream=True,
+                        headers=headers,
                         timeout=60,
                         proxies=proxies
                     )
                     response.raise_for_status()
                 
-                # 下载文件
-                import os
-                try:
-                    with open(save_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=chunk_size):
-                            if chunk:
-                                f.write(chunk)
-                    
-                    # 检查文件是否成功下载
-                    if os.path.exists(save_path) and os.path.getsize(save_path) > 0:
-                        return True
-                    else:
-                        print("  [X] 下载失败：文件为空或不存在")
-                        return False
-                        
-                except Exception as download_error:
-                    # 即使下载过程中出错，也检查文件是否已部分下载
-                    if os.path.exists(save_path) and os.path.getsize(save_path) > 0:
-                        # 文件已部分下载，可能是 HeaderParsingError 导致的
-                        error_str = str(download_error)
-                        if 'HeaderParsingError' in error_str or 'NoBoundaryInMultipartDefect' in error_str:
-                            # 忽略这个解析错误，文件已成功下载
-                            return True
-                    raise  # 重新抛出异常
+                if self._cache_revalidated("download", cache_key, cached, response):
+                    response.close()
+                    return cached.body
+                
+                # 超过大小上限时不下载内容；接收到开头后判断是否为错误页面，是则立即中止
+                rejected = self._reject_oversize(response.headers.get('Content-Length'), max_size)
+                received = 0
+                sniffed = False
+                if rejected is None:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if not chunk:
+                            continue
+                        chunks.append(chunk)
+                        received += len(chunk)
+                        if not sniffed and received >= filetype.HEAD_SIZE:
+                            sniffed = True
+                            rejected = self._reject_error_body(b''.join(chunks), declared)
+                        if rejected is None:
+                            rejected = self._reject_oversize(received, max_size)
+                        if rejected is not None:
+                            break
+                    if rejected is None and not sniffed and chunks:
+                        rejected = self._reject_error_body(b''.join(chunks), declared)
+                if rejected is not None:
+                    response.close()
+                    self.stats.record_request(
+                        "download", time.monotonic() - started,
+                        ok=False, nbytes=received, status=rejected[0]
+                    )
+                    logger.warning(f"  [X] 下载已中止: {rejected[1]}", extra={"endpoint": "download"})
+                    self.last_failure = rejected
+                    return None
+                
+                # 检查文件是否成功下载
+                content = b''.join(chunks)
+                self.stats.record_request(
+                    "download", time.monotonic() - started,
+                    ok=bool(content), nbytes=len(content),
+                    status=str(response.status_code) if content else "empty"
+                )
+                if content:
+                    self._cache_store("download", cache_key, cached, response, content)
+                    return content
+                logger.warning("  [X] 下载失败：文件为空")
+                self.last_failure = (failures.EMPTY_FILE, "下载内容为空")
+                return None
                 
             except Exception as e:
-                # 检查是否是 HeaderParsingError（文件可能已成功下载）
-                import os
+                # HeaderParsingError 时内容可能已完整接收
                 error_str = str(e)
                 error_type = type(e).__name__
                 
-                if 'HeaderParsingError' in error_type or 'NoBoundaryInMultipartDefect' in error_str:
-                    # 检查文件是否已成功下载
-                    if os.path.exists(save_path) and os.path.getsize(save_path) > 0:
-                        # 文件已成功下载，忽略这个解析错误
-                        return True
+                if 'HeaderParsingError' in error_type or 'HeaderParsingError' in error_str \
+                        or 'NoBoundaryInMultipartDefect' in error_str:
+                    if chunks:
+                        # 内容已接收，忽略这个解析错误
+                        content = b''.join(chunks)
+                        self.stats.record_request(
+                            "download", time.monotonic() - started,
+                            nbytes=len(content), status="header_parsing_error"
+                        )
+                        return content
                 
-                print(f"  [X] 下载失败: {e}")
+                logger.warning(f"  [X] 下载失败: {e}", extra={"endpoint": "download", "error": type(e).__name__})
+                self.stats.record_request(
+                    "download", time.monotonic() - started, ok=False, status=self._error_status(e)
+                )
+                self.last_failure = (failures.classify_exception(e), str(e))
+                if self.last_failure[0] in failures.PERMANENT:
+                    # 404 等永久失败不重试
+                    return None
+                
+                if self.last_failure[0] == failures.RATE_LIMITED:
+                    # 限流时其他下载线程也暂停
+                    self.download_limiter.pause(self.config.get("rate_limit_delay", 30))
                 
                 if retry < self.config.max_retries - 1:
                     wait_time = self.config.get("retry_delay", 5) * (retry + 1)
-                    print(f"  [重试 {retry + 1}/{self.config.max_retries}] 等待 {wait_time} 秒...")
-                    time.sleep(wait_time)
+                    logger.warning(
+                        f"  [重试 {retry + 1}/{self.config.max_retries}] 等待 {wait_time} 秒...",
+                        extra={"endpoint": "download", "attempt": retry + 1, "wait": wait_time}
+                    )
+                    self.stats.record_retry("download")
+                    tracing.sleep(wait_time, reason="retry")
                 else:
-                    return False
+                    return None
+            finally:
+                self._release_session(session)
         
-        return False
+        return None
+    
+    @staticmethod
+    def _reject_oversize(size, max_size: int) -> Optional[Tuple[str, str]]:
+        """大小超过上限时返回失败 (类别, 原因)（size 可以是 Content-Length 字符串）"""
+        try:
+            size = int(size)
+        except (TypeError, ValueError):
+            return None
+        if max_size and size > max_size:
+            return (failures.TOO_LARGE, f"文件超过大小上限 {max_size} 字节")
+        return None
+    
+    @staticmethod
+    def _reject_error_body(head: bytes, declared: str) -> Optional[Tuple[str, str]]:
+        """附件内容实际是错误页面时返回失败 (类别, 原因)"""
+        if filetype.is_error_body(head, declared):
+            kind = filetype.describe(filetype.sniff(head))
+            return (failures.ERROR_PAGE, f"服务器返回{kind}而不是{filetype.describe(declared)}文件")
+        return None
     
     def close(self):
         """关闭客户端"""
-        if hasattr(self.session, 'close'):
-            try:
-                self.session.close()
-            except Exception:
-                pass
+        self._close_session(self.session)
 
@@ -0,0 +1,188 @@
+"""
+序列化模块 - JSON编解码与上游数据校验
+"""
+
+import json
+from typing import Any, Dict, List, Tuple
+
+from .models import Policy, PolicyDetail, FileAttachment, _intern
+
+# 检查依赖库（可选，安装后自动使用更快的实现）
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+class ValidationError(ValueError):
+    """上游记录格式错误"""
+
+
+def _default(obj: Any) -> Any:
+    """序列化模型对象"""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"无法序列化类型: {type(obj).__name__}")
+
+
+def loads(data) -> Any:
+    """解析JSON（bytes或str）"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """序列化为UTF-8编码的JSON
+
+    Args:
+        obj: 要序列化的对象（模型对象通过 to_dict 转换）
+        indent: 是否缩进2个空格（与 json.dump(indent=2) 一致）
+
+    Returns:
+        JSON字节串
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        default=_default
+    ).encode('utf-8')
+
+
+def _str_field(row: Dict[str, Any], key: str, required: bool = False) -> str:
+    value = row.get(key)
+    if value is None:
+        if required:
+            raise ValidationError(f"缺少字段 {key}")
+        return ""
+    if not isinstance(value, str):
+        raise ValidationError(f"字段 {key} 类型错误: {type(value).__name__}")
+    return value
+
+
+def decode_policy(row: Any) -> Policy:
+    """校验列表接口的一行数据并直接构造Policy
+
+    Raises:
+        ValidationError: 记录格式错误
+    """
+    if not isinstance(row, dict):
+        raise ValidationError(f"记录不是对象: {type(row).__name__}")
+
+    policy_id = _str_field(row, "id", required=True)
+    if not policy_id:
+        raise ValidationError("id 为空")
+
+    law_rule_type = row.get("lawRuleType", 0)
+    if isinstance(law_rule_type, str) and law_rule_type.isdigit():
+        law_rule_type = int(law_rule_type)
+    if not isinstance(law_rule_type, int) or isinstance(law_rule_type, bool):
+        raise ValidationError(f"lawRuleType 类型错误: {law_rule_type!r}")
+
+    office = row.get("officeVo") or {}
+    if not isinstance(office, dict):
+        raise ValidationError("officeVo 类型错误")
+
+    return Policy(
+        id=policy_id,
+        title=_str_field(row, "title"),
+        office=_intern(_str_field(office, "groupName")),
+        pass_date=_str_field(row, "passDate"),
+        law_rule_type=law_rule_type,
+        formulate_mode=_intern(_str_field(row, "formulateMode")),
+        timeliness=_intern(_str_field(row, "timeliness")),
+        file_type=_intern(_str_field(row, "fileType")),
+        tag_names=_intern(_str_field(row, "tagNames")),
+    )
+
+
+def decode_policies(rows: Any) -> Tuple[List[Policy], List[Tuple[Any, str]]]:
+    """批量解码列表数据，格式错误的记录单独返回
+
+    Returns:
+        (政策列表, [(原始记录, 错误原因), ...])
+    """
+    if not isinstance(rows, list):
+        return [], [(rows, "rows 不是数组")]
+
+    policies = []
+    rejected = []
+    for row in rows:
+        try:
+            policies.append(decode_policy(row))
+        except ValidationError as e:
+            rejected.append((row, str(e)))
+    return policies, rejected
+
+
+def decode_attachment(data: Any) -> FileAttachment:
+    """校验并构造附件信息
+
+    Raises:
+        ValidationError: 记录格式错误
+    """
+    if not isinstance(data, dict):
+        raise ValidationError(f"附件不是对象: {type(data).__name__}")
+    return FileAttachment(
+        id=_str_field(data, "id"),
+        file_name=_str_field(data, "fileName"),
+        file_path=_str_field(data, "filePath", required=True),
+        file_ext=_intern(_str_field(data, "fileExt")),
+        file_class=_intern(_str_field(data, "fileClass")),
+    )
+
+
+def decode_detail(policy: Policy, result: Any) -> PolicyDetail:
+    """校验详情接口返回并构造PolicyDetail
+
+    格式错误的附件会被丢弃，不影响其他附件。
+
+    Raises:
+        ValidationError: 详情整体格式错误
+    """
+    if not isinstance(result, dict):
+        raise ValidationError("详情不是对象")
+
+    law_rule = result.get("lawRule") or {}
+    if not isinstance(law_rule, dict):
+        raise ValidationError("lawRule 类型错误")
+
+    file_list = result.get("list") or []
+    if not isinstance(file_list, list):
+        raise ValidationError("附件列表类型错误")
+
+    attachments = []
+    for item in file_list:
+        try:
+            attachments.append(decode_attachment(item))
+        except ValidationError:
+            continue
+
+    def text(key: str) -> str:
+        value = law_rule.get(key)
+        return value if isinstance(value, str) else ""
+
+    return PolicyDetail(
+        policy=policy,
+        law_rule=law_rule,
+        attachments=attachments,
+        keywords=text("keywords"),
+        effective_date=text("effectiveDate"),
+        associate_id=text("associate"),
+    )
+
+
+def encode_record(obj: Any) -> bytes:
+    """序列化为单行JSON（用于 JSON Lines 文件）"""
+    return dumps(obj) + b'\n'
+
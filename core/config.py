@@ -22,22 +22,56 @@ class Config:
         "rate_limit_delay": 30,
         "session_rotate_interval": 50,
         "timeout": 30,
+        "negative_cache_ttl": 604800,  # 永久失败（404、空文件、详情格式错误）的跳过有效期（秒），0 不启用
+        "retry_rounds": 2,  # 批量爬取结束后重试失败政策的轮数，0 不重试（仍失败的写入 dead_letter.jsonl）
+        "retry_cooldown": 30,  # 第一轮重试前的冷却时间（秒），之后每轮翻倍，并加 ±50% 随机抖动
+        
+        # HTTP响应缓存（磁盘缓存 + 条件请求重新验证）
+        "http_cache": False,
+        "http_cache_dir": ".http_cache",  # 相对路径位于输出目录下
+        "http_cache_ttl": {"search": 3600, "detail": 86400, "download": 2592000},  # 各接口有效期（秒）
         
         # 爬取配置
         "page_size": 20,
         "law_rule_types": [1, 2, 3],
+        "search_params": {},  # 附加到列表请求的服务器端查询参数（原样发送）
+        
+        # 政策筛选（获取列表后、获取详情前应用，为空表示不限）
+        "filter_date_from": "",  # 通过日期下限 YYYY-MM-DD
+        "filter_date_to": "",  # 通过日期上限 YYYY-MM-DD
+        "filter_offices": [],  # 制定机关关键字（任一匹配）
+        "filter_timeliness": [],  # 时效性（如 现行有效）
+        "filter_title_keywords": [],  # 标题关键字（任一匹配）
         
         # 输出配置
         "output_dir": "crawled_data",
         "save_json": True,
         "save_markdown": True,
         "save_files": True,
+        "output_layout": "flat",  # flat / hash / type_year
+        "rebuild_workers": 0,  # rebuild 命令的进程数，0 表示CPU核数
+        
+        # 写入配置（独立写入线程，原子写文件）
+        "writer_queue_size": 256,
+        "writer_fsync": True,
+        "writer_fsync_batch": 32,
+        
+        # 压缩存储配置（需要 zstandard）
+        "compression": "none",  # none / zstd
+        "compression_level": 10,
+        "compression_dict_size": 112640,
+        "compression_train_samples": 500,
+        "compress_attachments": True,
         
         # 文件下载配置
         "download_docx": True,
         "download_doc": True,
         "download_pdf": False,
         "download_all_files": False,  # 下载所有形式的附件（忽略文件类型）
+        "skip_existing_files": True,  # 清单中记录过且本地大小、哈希校验通过的附件不再下载
+        "max_attachment_size": 0,  # 附件大小上限（字节），超过时不下载内容，0 不限制
+        "download_workers": 3,  # 同一政策的附件并发下载线程数，1 为逐个下载
+        "download_interval": 0.3,  # 附件下载请求的最小间隔（秒，所有下载线程共享）
         
         # 代理配置
         "use_proxy": False,
@@ -46,10 +80,41 @@ class Config:
         # 日志配置
         "log_level": "INFO",
         "log_file": "crawler.log",
+        "log_format": "text",  # 日志文件格式: text / json（JSON Lines）
+        "log_levels": {},  # 按模块设置级别，如 {"core.api_client": "WARNING"}
+        "log_queue_size": 10000,  # 日志队列容量（满时丢弃 WARNING 以下的新记录，WARNING 及以上最多等待1秒）
+        
+        # 监控指标（Prometheus 文本格式）
+        "metrics_port": 0,  # 本地HTTP端点端口，0 表示不启动
+        "metrics_host": "127.0.0.1",
+        "metrics_file": "",  # 定期写入的 .prom 文件（相对路径位于输出目录下），为空不写
+        "metrics_interval": 15,  # 写文件间隔（秒）
+        
+        # 链路追踪（Chrome Trace JSON，可在 Perfetto 中查看）
+        "trace_enabled": False,
+        "trace_file": "trace.json",  # 相对路径位于输出目录下
+        "trace_max_events": 1000000,
+        
+        # 性能分析（cprofile / sample，为空不启用；结果输出到输出目录）
+        "profile": "",
+        "profile_interval": 0.005,  # 采样间隔（秒，仅 sample 模式）
+        
+        # 内存诊断（tracemalloc 快照，报告输出到输出目录）
+        "memory_profile": False,
+        "memory_every": 100,  # 每处理多少条政策拍摄一次快照
+        "memory_top": 20,  # 每个检查点列出的分配增长条数
+        "memory_frames": 1,  # 分配记录的调用栈深度
+        "memory_budget_bytes": 2560,  # memory-bench 命令：每条政策允许的持有内存和运行峰值增长（字节）
+        
+        # 启动时间预算（startup-check 命令使用，毫秒）
+        "startup_budget_ms": 300,
         
         # GUI配置（优化后的尺寸：1200x1000，确保设置选项卡按钮可见）
         "window_width": 1200,
         "window_height": 1000,
+        "gui_refresh_interval_ms": 150,  # 进度界面刷新间隔（毫秒）
+        "gui_log_max_lines": 2000,  # 日志文本框最多保留的行数
+        "gui_log_queue_size": 5000,  # 日志队列容量（界面跟不上时丢弃并计数）
         "theme": "light",
     }
     
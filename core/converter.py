@@ -3,32 +3,48 @@
 """
 
 import os
-from typing import Optional
+import io
+import time
+import logging
+import tempfile
+import importlib.util
+from typing import Callable, Optional
 
-# 检查依赖库
-try:
-    from docx import Document
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
+from . import metrics
+from . import filetype
 
-try:
-    from pypdf import PdfReader
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
+logger = logging.getLogger(__name__)
 
-try:
-    from poword.api.word import doc2docx
-    POWORD_AVAILABLE = True
-except ImportError:
-    POWORD_AVAILABLE = False
-    doc2docx = None
+
+def _module_available(name: str) -> bool:
+    """检查模块是否已安装（不导入）"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# 检查依赖库（只检查是否安装，首次转换时才导入，避免拖慢启动）
+DOCX_AVAILABLE = _module_available("docx")
+PDF_AVAILABLE = _module_available("pypdf")
+POWORD_AVAILABLE = _module_available("poword")
 
 
 class DocumentConverter:
     """文档转换器"""
     
+    # 转换逻辑版本（输出变化时递增，已生成的Markdown会被视为过期）
+    # 2: 按文件内容识别实际格式选择转换器
+    VERSION = 2
+    
+    @staticmethod
+    def can_convert(ext: str) -> bool:
+        """是否支持该格式且已安装对应的转换库"""
+        ext = ext.lower()
+        if not ext.startswith('.'):
+            ext = f'.{ext}'
+        return {'.docx': DOCX_AVAILABLE, '.doc': POWORD_AVAILABLE, '.pdf': PDF_AVAILABLE}.get(ext, False)
+    
     def convert(self, file_path: str) -> Optional[str]:
         """自动识别并转换文档
         
@@ -39,36 +55,115 @@ class DocumentConverter:
             转换后的Markdown内容
         """
         if not os.path.exists(file_path):
-            print(f"    [X] 文件不存在: {file_path}")
+            logger.warning(f"    [X] 文件不存在: {file_path}")
             return None
         
-        # 根据扩展名选择转换方法
-        ext = os.path.splitext(file_path)[1].lower()
+        # 根据文件内容识别的实际格式选择转换方法（识别不出时按扩展名）
+        try:
+            with open(file_path, 'rb') as f:
+                head = f.read(filetype.HEAD_SIZE)
+        except OSError as e:
+            logger.warning(f"    [X] 文件读取失败: {e}")
+            return None
+        ext = self._route(head, os.path.splitext(file_path)[1])
         
-        if ext == '.docx':
-            return self.docx_to_markdown(file_path)
+        if ext is None:
+            return None
+        elif ext == '.docx':
+            return self._timed(ext, self.docx_to_markdown, file_path)
         elif ext == '.doc':
-            return self.doc_to_markdown(file_path)
+            return self._timed(ext, self.doc_to_markdown, file_path)
         elif ext == '.pdf':
-            return self.pdf_to_markdown(file_path)
+            return self._timed(ext, self.pdf_to_markdown, file_path)
         else:
-            print(f"    [X] 不支持的文件格式: {ext}")
+            logger.warning(f"    [X] 不支持的文件格式: {ext}")
             return None
     
-    def docx_to_markdown(self, docx_path: str) -> Optional[str]:
+    def convert_bytes(self, data: bytes, ext: str) -> Optional[str]:
+        """从内存中的文件内容转换文档（不经过磁盘）
+        
+        Args:
+            data: 文件内容
+            ext: 扩展名（如 '.docx'）
+            
+        Returns:
+            转换后的Markdown内容
+        """
+        if not data:
+            logger.warning("    [X] 文件内容为空")
+            return None
+        
+        ext = self._route(data[:filetype.HEAD_SIZE], ext)
+        
+        if ext is None:
+            return None
+        elif ext == '.docx':
+            return self._timed(ext, self.docx_to_markdown, io.BytesIO(data))
+        elif ext == '.pdf':
+            return self._timed(ext, self.pdf_to_markdown, io.BytesIO(data))
+        elif ext == '.doc':
+            return self._timed(ext, self._doc_bytes_to_markdown, data)
+        else:
+            logger.warning(f"    [X] 不支持的文件格式: {ext}")
+            return None
+    
+    @staticmethod
+    def _route(head: bytes, ext: str) -> Optional[str]:
+        """根据文件开头判断用于转换的格式
+        
+        Args:
+            head: 文件开头（filetype.HEAD_SIZE 字节）
+            ext: 文件扩展名
+            
+        Returns:
+            实际格式的扩展名；内容是错误页面时返回None
+        """
+        ext = filetype.normalize_ext(ext)
+        if filetype.is_error_body(head, ext):
+            logger.warning(f"    [X] 内容是{filetype.describe(filetype.sniff(head))}，不是{filetype.describe(ext)}文件")
+            return None
+        actual = filetype.detect(head, ext)
+        if actual != ext:
+            logger.info(f"    [格式] 扩展名为 {ext}，实际为 {filetype.describe(actual)}，按实际格式转换")
+        return actual
+    
+    def _doc_bytes_to_markdown(self, data: bytes) -> Optional[str]:
+        """转换内存中的DOC（poword 只能处理磁盘文件，写入临时目录后转换）"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            doc_path = os.path.join(tmpdir, 'source.doc')
+            with open(doc_path, 'wb') as f:
+                f.write(data)
+            return self.doc_to_markdown(doc_path)
+    
+    @staticmethod
+    def _timed(ext: str, func: Callable[..., Optional[str]], source) -> Optional[str]:
+        """执行转换并记录耗时和结果指标"""
+        fmt = ext.lstrip('.')
+        started = time.perf_counter()
+        result = None
+        try:
+            result = func(source)
+            return result
+        finally:
+            metrics.CONVERSION_SECONDS.observe(time.perf_counter() - started, format=fmt)
+            metrics.CONVERSIONS.inc(format=fmt, result="success" if result else "failed")
+    
+    def docx_to_markdown(self, docx_path) -> Optional[str]:
         """将DOCX文件转换为Markdown
         
         Args:
-            docx_path: DOCX文件路径
+            docx_path: DOCX文件路径或文件对象
             
         Returns:
             Markdown内容
         """
         if not DOCX_AVAILABLE:
-            print("    [X] python-docx未安装，无法转换DOCX")
+            logger.warning("    [X] python-docx未安装，无法转换DOCX")
             return None
         
         try:
+            from docx import Document
+            
             doc = Document(docx_path)
             markdown_lines = []
             
@@ -107,11 +202,11 @@ class DocumentConverter:
                 markdown_lines.append('')
             
             content = '\n'.join(markdown_lines)
-            print(f"    [OK] DOCX转换成功，内容长度: {len(content)} 字符")
+            logger.info(f"    [OK] DOCX转换成功，内容长度: {len(content)} 字符")
             return content
             
         except Exception as e:
-            print(f"    [X] DOCX转换失败: {e}")
+            logger.warning(f"    [X] DOCX转换失败: {e}")
             return None
     
     def _process_paragraph_runs(self, paragraph) -> str:
@@ -149,25 +244,27 @@ class DocumentConverter:
         
         return '\n'.join(markdown_lines)
     
-    def pdf_to_markdown(self, pdf_path: str) -> Optional[str]:
+    def pdf_to_markdown(self, pdf_path) -> Optional[str]:
         """将PDF文件转换为Markdown
         
         Args:
-            pdf_path: PDF文件路径
+            pdf_path: PDF文件路径或文件对象
             
         Returns:
             Markdown内容
         """
         if not PDF_AVAILABLE:
-            print("    [X] pypdf未安装，无法提取PDF文本")
+            logger.warning("    [X] pypdf未安装，无法提取PDF文本")
             return None
         
         try:
+            from pypdf import PdfReader
+            
             reader = PdfReader(pdf_path)
             markdown_lines = []
             
             total_pages = len(reader.pages)
-            print(f"    PDF页数: {total_pages}")
+            logger.info(f"    PDF页数: {total_pages}")
             
             extracted_text_count = 0
             
@@ -183,23 +280,23 @@ class DocumentConverter:
                                 markdown_lines.append(line)
                         markdown_lines.append('')
                 except Exception as e:
-                    print(f"    页面 {page_num} 提取失败: {e}")
+                    logger.warning(f"    页面 {page_num} 提取失败: {e}")
                     continue
             
             if extracted_text_count == 0:
-                print("    [X] PDF可能是扫描版，无法提取文本（需要OCR）")
+                logger.warning("    [X] PDF可能是扫描版，无法提取文本（需要OCR）")
                 return None
             
             content = '\n'.join(markdown_lines).strip()
             if len(content) > 100:
-                print(f"    [OK] 成功提取 {extracted_text_count}/{total_pages} 页文本")
+                logger.info(f"    [OK] 成功提取 {extracted_text_count}/{total_pages} 页文本")
                 return content
             else:
-                print(f"    [X] 提取的文本内容过少: {len(content)} 字符")
+                logger.warning(f"    [X] 提取的文本内容过少: {len(content)} 字符")
                 return None
             
         except Exception as e:
-            print(f"    [X] PDF提取失败: {e}")
+            logger.warning(f"    [X] PDF提取失败: {e}")
             return None
     
     def doc_to_markdown(self, doc_path: str) -> Optional[str]:
@@ -212,17 +309,16 @@ class DocumentConverter:
             Markdown内容
         """
         if not os.path.exists(doc_path):
-            print(f"    [X] 文件不存在: {doc_path}")
+            logger.warning(f"    [X] 文件不存在: {doc_path}")
             return None
         
         # 使用poword转换DOC -> DOCX -> Markdown
         if not POWORD_AVAILABLE:
-            print("    [X] poword未安装，无法转换DOC文件")
-            print("    请安装: pip install poword")
+            logger.warning("    [X] poword未安装，无法转换DOC文件")
+            logger.warning("    请安装: pip install poword")
             return None
         
         try:
-            import tempfile
             from poword.api.word import doc2docx
             
             with tempfile.TemporaryDirectory() as tmpdir:
@@ -236,16 +332,16 @@ class DocumentConverter:
                     # 将DOCX转换为Markdown
                     content = self.docx_to_markdown(docx_path)
                     if content:
-                        print("    [OK] 使用poword转换DOC成功")
+                        logger.info("    [OK] 使用poword转换DOC成功")
                         return content
                     else:
-                        print("    [X] DOCX转换失败")
+                        logger.warning("    [X] DOCX转换失败")
                         return None
                 else:
-                    print("    [X] poword转换失败，未生成DOCX文件")
+                    logger.warning("    [X] poword转换失败，未生成DOCX文件")
                     return None
                     
         except Exception as e:
-            print(f"    [X] DOC转换失败: {e}")
+            logger.warning(f"    [X] DOC转换失败: {e}")
             return None
 
@@ -3,21 +3,48 @@
 """
 
 import os
-import json
 import time
+import random
 import logging
-from typing import Dict, List, Optional, Callable
+import dataclasses
+from typing import Dict, List, Optional, Callable, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .config import Config
 from .api_client import APIClient
 from .converter import DocumentConverter
+from .writer import AsyncFileWriter, atomic_write_bytes
+from .stats import CrawlStats
+from .metrics import MetricsExporter
+from .profiling import create_memory_profiler
+from . import tracing
+from .manifest import OutputLayout, Manifest, safe_filename
+from . import rag_markdown
+from . import fingerprint
+from .http_cache import content_hash
+from utils.compression import ZstdCodec, ZSTD_AVAILABLE
+from utils.file_handler import FileHandler
+from utils.logger import Logger
 from .models import Policy, PolicyDetail, FileAttachment, CrawlProgress
+from .codec import decode_policies, decode_detail, ValidationError
+from .filters import PolicyFilter, ListingCutoff
+from . import failures
+from . import filetype
+from . import codec
+
+logger = logging.getLogger(__name__)
 
 
 class PolicyCrawler:
     """政策爬虫核心类"""
     
+    # 增量更新的变化记录（JSON Lines，位于输出目录）
+    CHANGES_FILENAME = "changes.jsonl"
+    
+    # 重试后仍失败的政策（JSON Lines，位于输出目录，可用 --retry-failed 重新爬取）
+    DEAD_LETTER_FILENAME = "dead_letter.jsonl"
+    
     def __init__(self, config: Config, progress_callback: Optional[Callable] = None):
         """初始化爬虫
         
@@ -26,14 +53,97 @@ class PolicyCrawler:
             progress_callback: 进度回调函数 (progress: CrawlProgress) -> None
         """
         self.config = config
-        self.api_client = APIClient(config)
+        self.stats = CrawlStats()
+        self.api_client = APIClient(config, stats=self.stats)
         self.converter = DocumentConverter()
         self.progress_callback = progress_callback
         self.stop_requested = False  # 停止标志
         self.progress = CrawlProgress()
         
+        # 独立写入线程：爬取线程只入队，不等待磁盘
+        self.writer = AsyncFileWriter(
+            max_queue_size=config.get("writer_queue_size", 256),
+            fsync=config.get("writer_fsync", True),
+            fsync_batch=config.get("writer_fsync_batch", 32),
+            codec=self._create_codec()
+        )
+        self.writer.start()
+        
+        # 跳过清单中已记录且本地校验通过的附件
+        self.skip_existing = bool(config.get("skip_existing_files", True))
+        
+        # 同一政策的附件并发下载的线程数
+        self.download_workers = max(1, int(config.get("download_workers", 3) or 1))
+        # 下载线程池在整个爬虫生命周期内复用，close() 时关闭
+        self._download_pool: Optional[ThreadPoolExecutor] = None
+        if self.download_workers > 1:
+            self._download_pool = ThreadPoolExecutor(
+                max_workers=self.download_workers, thread_name_prefix="download"
+            )
+        
+        # 文件编号（首次使用时扫描一次目录，之后在内存中递增）
+        self._markdown_counter: Optional[int] = None
+        self._file_counter: Optional[int] = None
+        
         # 创建输出目录
         self._create_output_dirs()
+        
+        # 永久失败的负缓存（有效期内跳过已知不存在的详情和附件）
+        self.negative_cache = failures.create_negative_cache(config)
+        self.last_failure: Optional[Dict[str, str]] = None  # 最近一个失败政策的阶段、类别和原因
+        
+        # 政策筛选条件（获取列表后、获取详情前应用）
+        self.filter = PolicyFilter.from_config(config)
+        
+        # 输出布局和清单（政策ID → 文件路径）
+        self.layout = OutputLayout(config.output_dir, config.get("output_layout", "flat"))
+        self.manifest = Manifest(config.output_dir, writer=self.writer)
+        
+        # 监控指标导出（HTTP端点 / .prom 文件，均未配置时不启动）
+        self.metrics_exporter = self._create_metrics_exporter()
+        
+        # 链路追踪（关闭爬虫时导出 Chrome Trace 文件）
+        self._trace_enabled = bool(config.get("trace_enabled", False))
+        if self._trace_enabled:
+            tracing.TRACER.enable(config.get("trace_max_events", 1000000))
+        
+        # 内存诊断（tracemalloc 快照，每 memory_every 条政策一个检查点，关闭爬虫时输出报告）
+        self.memory_profiler = create_memory_profiler(config)
+        self._memory_every = max(1, int(config.get("memory_every", 100)))
+        self._policies_seen = 0
+    
+    def _create_metrics_exporter(self) -> Optional[MetricsExporter]:
+        """创建指标导出器（未配置端口和文件时返回None）"""
+        port = int(self.config.get("metrics_port", 0) or 0)
+        file_path = self.config.get("metrics_file", "") or ""
+        if not port and not file_path:
+            return None
+        if file_path and not os.path.isabs(file_path):
+            file_path = os.path.join(self.config.output_dir, file_path)
+        exporter = MetricsExporter(
+            port=port,
+            host=self.config.get("metrics_host", "127.0.0.1"),
+            file_path=file_path,
+            interval=self.config.get("metrics_interval", 15)
+        )
+        exporter.start()
+        return exporter
+    
+    def _create_codec(self) -> Optional[ZstdCodec]:
+        """创建落盘压缩编解码器（未启用或缺少依赖时返回None）"""
+        if self.config.get("compression", "none") != "zstd":
+            return None
+        if not ZSTD_AVAILABLE:
+            logger.warning("[警告] zstandard未安装，已禁用压缩: pip install zstandard")
+            return None
+        os.makedirs(self.config.output_dir, exist_ok=True)
+        return ZstdCodec(
+            self.config.output_dir,
+            level=self.config.get("compression_level", 10),
+            dict_size=self.config.get("compression_dict_size", 112640),
+            train_samples=self.config.get("compression_train_samples", 500),
+            compress_attachments=self.config.get("compress_attachments", True)
+        )
     
     def _create_output_dirs(self):
         """创建输出目录"""
@@ -46,13 +156,15 @@ class PolicyCrawler:
     def request_stop(self):
         """请求停止爬取"""
         self.stop_requested = True
-        logging.info("\n[停止] 收到停止请求，正在停止...")
+        logger.info("\n[停止] 收到停止请求，正在停止...")
     
     def _update_progress(self, **kwargs):
         """更新进度并触发回调"""
         for key, value in kwargs.items():
             setattr(self.progress, key, value)
         
+        self.progress.write_queue_depth = self.writer.queue_depth
+        
         if self.progress_callback:
             self.progress_callback(self.progress)
     
@@ -68,18 +180,23 @@ class PolicyCrawler:
         policies = []
         page_num = 1
         page_size = self.config.get("page_size", 20)
+        listed = 0
+        cutoff = ListingCutoff(self.filter.date_from) if self.filter.date_from else None
         
         type_names = {1: "地方性法规", 2: "政府规章", 3: "规范性文件"}
         type_name = type_names.get(law_rule_type, f"类型{law_rule_type}")
         
-        logging.info(f"\n▶ 正在获取【{type_name}】列表（仅标题和基本信息，不含详细内容）...")
+        logger.info(f"\n▶ 正在获取【{type_name}】列表（仅标题和基本信息，不含详细内容）...")
+        if self.filter.active:
+            logger.info(f"  筛选条件: {self.filter.describe()}")
         
         while True:
             # 检查停止标志
             if self.stop_requested:
-                logging.info(f"  [停止] 停止获取 {type_name} 列表")
+                logger.info(f"  [停止] 停止获取 {type_name} 列表")
                 break
             
+            calls_before = self.api_client.network_calls
             result = self.api_client.search_policies(law_rule_type, page_num, page_size)
             
             if not result:
@@ -92,24 +209,38 @@ class PolicyCrawler:
             if not rows:
                 break
             
-            # 转换为Policy对象
-            for row in rows:
-                policy = Policy.from_dict(row)
-                policies.append(policy)
+            # 校验并转换为Policy对象（格式错误的记录直接丢弃）
+            page_policies, rejected = decode_policies(rows)
+            for row, reason in rejected:
+                row_id = row.get('id', '') if isinstance(row, dict) else ''
+                logger.info(f"  [跳过] 列表记录格式错误: {reason} {row_id}")
             
-            logging.info(f"  ├─ 列表第 {page_num} 页: {len(rows)} 条，累计 {len(policies)}/{total} 条")
+            # 筛选（在获取详情之前丢弃不需要的政策）
+            listed += len(rows)
+            if self.filter.active:
+                policies.extend(policy for policy in page_policies if self.filter.matches(policy))
+                logger.info(f"  ├─ 列表第 {page_num} 页: {len(rows)} 条，符合筛选条件累计 {len(policies)} 条（已获取 {listed}/{total}）")
+            else:
+                policies.extend(page_policies)
+                logger.info(f"  ├─ 列表第 {page_num} 页: {len(rows)} 条，累计 {len(policies)}/{total} 条")
             
             # 实时更新进度（显示用时）
             self._update_progress()
             
             # 如果已获取所有数据，退出
-            if len(rows) < page_size or len(policies) >= total:
+            if len(rows) < page_size or listed >= total:
+                break
+            
+            # 列表按通过日期降序时，之后的页都早于起始日期
+            if cutoff is not None and cutoff.add_page(page_policies):
+                logger.info(f"  ├─ 已早于起始日期 {self.filter.date_from}，停止翻页")
                 break
             
             page_num += 1
-            time.sleep(self.config.request_delay)
+            if self.api_client.network_calls != calls_before:
+                tracing.sleep(self.config.request_delay, reason="request_delay")
         
-        logging.info(f"  └─ 完成获取【{type_name}】列表，共 {len(policies)} 条政策")
+        logger.info(f"  └─ 完成获取【{type_name}】列表，共 {len(policies)} 条政策")
         return policies
     
     def crawl_single_policy(self, policy: Policy) -> bool:
@@ -121,130 +252,303 @@ class PolicyCrawler:
         Returns:
             是否成功
         """
+        with tracing.span("policy", policy_id=policy.id, title=policy.title) as span:
+            success = self._crawl_single_policy(policy)
+            span.set(success=success)
+        
+        if self.memory_profiler is not None:
+            self._policies_seen += 1
+            if self._policies_seen % self._memory_every == 0:
+                self.memory_profiler.checkpoint(f"已处理 {self._policies_seen} 条")
+        return success
+    
+    def _crawl_single_policy(self, policy: Policy) -> bool:
+        """爬取单个政策（crawl_single_policy 的实现）"""
         self._update_progress(
             current_policy_id=policy.id,
             current_policy_title=policy.title
         )
         
-        logging.info(f"\n爬取政策: {policy.title}")
-        logging.info(f"ID: {policy.id}")
-        logging.info("=" * 60)
+        logger.info(f"\n爬取政策: {policy.title}")
+        logger.info(f"ID: {policy.id}")
+        logger.info("=" * 60)
+        self.last_failure = None
         
-        # 1. 获取详情
-        detail_data = self.api_client.get_policy_detail(policy.id)
-        if not detail_data:
-            logging.info("[X] 获取详情失败")
+        # 1. 获取详情（已知永久失败时直接跳过）
+        known = self.negative_cache.get("detail", policy.id) if self.negative_cache is not None else None
+        if known is not None:
+            logger.info(f"[跳过] 详情已知失败（{failures.describe(known['category'])}）: {known['reason']}")
+            self._record_failure("detail", known["category"], known["reason"])
             return False
         
-        law_rule = detail_data.get('lawRule', {})
-        file_list = detail_data.get('list', [])
+        with tracing.span("detail"):
+            detail_data = self.api_client.get_policy_detail(policy.id)
+        if not detail_data:
+            category, reason = self.api_client.last_failure or (failures.NETWORK, "获取详情失败")
+            logger.warning(f"[X] 获取详情失败（{failures.describe(category)}）", extra={"policy_id": policy.id})
+            self._record_failure("detail", category, reason, key=policy.id)
+            return False
         
-        # 转换附件列表
-        attachments = [FileAttachment.from_dict(f) for f in file_list]
+        # 校验并创建PolicyDetail对象
+        try:
+            detail = decode_detail(policy, detail_data)
+        except ValidationError as e:
+            logger.warning(f"[X] 详情数据格式错误: {e}", extra={"policy_id": policy.id})
+            self._record_failure("detail", failures.MALFORMED_DETAIL, str(e), key=policy.id)
+            return False
+        if self.negative_cache is not None:
+            # 负缓存过期后重新请求成功，移除旧的失败记录
+            self.negative_cache.discard("detail", policy.id)
+        attachments = detail.attachments
         
-        # 创建PolicyDetail对象
-        detail = PolicyDetail(
-            policy=policy,
-            law_rule=law_rule,
-            attachments=attachments,
-            keywords=law_rule.get('keywords', ''),
-            effective_date=law_rule.get('effectiveDate', ''),
-            associate_id=law_rule.get('associate', '')
-        )
+        # 本次的输入指纹（与清单中上次的记录比较，未变化的阶段直接跳过）
+        output_dir = self.config.output_dir
+        detail_dict = detail.to_dict()
+        previous = self.manifest.get(policy.id) or {}
+        inputs = fingerprint.current_versions()
+        inputs["list"] = fingerprint.list_hash(policy)
+        inputs["detail"] = fingerprint.detail_hash(detail_dict)
         
         # 2. 保存JSON数据
+        json_path = None
         if self.config.get("save_json", True):
-            self._save_json(policy.id, detail.to_dict())
+            if fingerprint.json_fresh(previous, output_dir, inputs["detail"]):
+                json_path = previous["json"]
+                self.stats.record_skip("json")
+                logger.info("[跳过] JSON未变化")
+            else:
+                with tracing.span("save_json"):
+                    json_path = self._save_json(policy, detail_dict)
         
-        # 3. 获取文件编号（markdown 和 files 文件夹各自独立递增）
-        markdown_number = self._get_next_markdown_number()
-        file_number = self._get_next_file_number()
+        # 3. 获取文件编号（markdown 和 files 文件夹各自独立递增，已爬取过的政策沿用原编号）
+        markdown_number = previous.get("markdown_number") or self._get_next_markdown_number()
+        file_number = previous.get("file_number") or self._get_next_file_number()
         
-        # 4. 下载并转换附件（如果启用了保存文件）
-        markdown_content = None
+        # 4. 下载附件（如果启用了保存文件）
+        downloaded: List[Tuple[str, str, str, bytes]] = []
+        preconverted: Dict[str, Optional[str]] = {}
+        attachment_records: List[Dict] = []
+        files_reused = False
         if self.config.get("save_files", True):
-            markdown_content = self._download_and_convert_files(policy, attachments, file_number)
+            target_files = self._select_attachments(attachments)
+            inputs["attachments"] = fingerprint.attachments_hash(target_files)
+            if self.skip_existing and target_files and fingerprint.files_fresh(previous, output_dir, inputs["attachments"]):
+                files_reused = True
+                self.stats.record_skip("files")
+                logger.info(f"[跳过] 附件未变化（{len(previous['files'])} 个）")
+            else:
+                # 生成Markdown时每个附件下载完成即转换，与其余附件的下载重叠
+                def convert_downloaded(file):
+                    preconverted[file[2]] = self._convert_file(file)
+                
+                on_downloaded = convert_downloaded if self.config.get("save_markdown", True) else None
+                # 清单中记录过且校验通过的附件直接使用本地文件，不再下载
+                existing = previous.get("attachments") if self.skip_existing else None
+                with tracing.span("attachments", count=len(target_files)):
+                    downloaded, attachment_records = self._download_files(
+                        policy, target_files, file_number, on_downloaded, existing
+                    )
+                if len(downloaded) < len(target_files):
+                    # 有附件下载失败，下次爬取时重新下载
+                    inputs["attachments"] = ""
+                if downloaded and not previous.get("file_number"):
+                    self._file_counter = file_number
         
-        # 5. 生成RAG Markdown
+        if files_reused:
+            saved_files = list(previous["files"])
+            saved_names = list(previous.get("file_names") or [])
+            inputs["files"] = list(previous["inputs"]["files"])
+            attachment_records = list(previous.get("attachments") or [])
+        else:
+            saved_files = [rel_path for _, _, rel_path, _ in downloaded]
+            saved_names = [name for name, _, _, _ in downloaded]
+            inputs["files"] = [content_hash(content) for _, _, _, content in downloaded]
+        
+        # 5. 转换附件并生成RAG Markdown
+        markdown_path = None
+        converted = bool(previous.get("converted"))
         if self.config.get("save_markdown", True):
-            self._generate_rag_markdown(policy, detail, markdown_content, markdown_number)
+            if fingerprint.markdown_fresh(previous, output_dir, inputs):
+                markdown_path = previous["markdown"]
+                self.stats.record_skip("markdown")
+                logger.info("[跳过] Markdown未变化")
+            else:
+                if files_reused:
+                    downloaded = self._load_saved_files(saved_files, saved_names)
+                markdown_content = self._convert_files(downloaded, preconverted)
+                converted = bool(markdown_content)
+                with tracing.span("markdown"):
+                    markdown_path = self._generate_rag_markdown(policy, detail, markdown_content, markdown_number)
+                if markdown_path and not previous.get("markdown_number"):
+                    self._markdown_counter = markdown_number
         
-        logging.info("   ✓ 政策详细内容爬取完成")
+        # 6. 更新清单
+        entry = {"inputs": inputs}
+        if json_path:
+            entry["json"] = json_path
+        if markdown_path:
+            entry["markdown"] = markdown_path
+            entry["markdown_number"] = markdown_number
+            entry["converted"] = converted
+        if saved_files:
+            entry["files"] = saved_files
+            entry["file_names"] = saved_names
+            entry["file_number"] = file_number
+        if attachment_records:
+            entry["attachments"] = attachment_records
+        self.manifest.record_policy(policy, **entry)
+        
+        # 标题、通过日期或类型变化后输出路径改变时，删除旧路径的文件
+        # （附件只在全部保存成功时清理，避免下载失败时丢失旧文件）
+        replaced = self._replaced_outputs(previous, entry, files_complete=bool(inputs.get("attachments")))
+        if replaced:
+            self._remove_outputs(replaced)
+        
+        if inputs.get("attachments") == "":
+            # 已保存的部分保留在清单中，重试时只重新下载失败的附件
+            logger.warning("[X] 部分附件下载失败", extra={"policy_id": policy.id})
+            return False
+        
+        logger.info("   ✓ 政策详细内容爬取完成")
         return True
     
-    def _download_and_convert_files(
-        self,
-        policy: Policy,
-        attachments: List[FileAttachment],
-        file_number: int
-    ) -> Optional[str]:
-        """下载并转换附件文件
+    @staticmethod
+    def _replaced_outputs(previous: Dict, entry: Dict, files_complete: bool) -> List[str]:
+        """上次的输出中被本次新路径替代的文件（相对路径）
+        
+        Args:
+            previous: 上次的清单记录
+            entry: 本次写入清单的字段
+            files_complete: 本次附件是否全部保存成功
+            
+        Returns:
+            需要删除的旧文件
+        """
+        replaced = []
+        for kind in ("json", "markdown"):
+            if entry.get(kind) and previous.get(kind) and previous[kind] != entry[kind]:
+                replaced.append(previous[kind])
+        if files_complete and "files" in entry:
+            current = set(entry["files"])
+            replaced.extend(path for path in previous.get("files") or [] if path not in current)
+        return replaced
+    
+    def _remove_outputs(self, rel_paths: List[str]):
+        """等待写入队列落盘后删除旧路径的文件（新文件已提交写入）"""
+        self.writer.flush()
+        for rel_path in rel_paths:
+            path = self.layout.absolute_path(rel_path)
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+                    logger.info(f"[清理] 已删除旧路径的文件: {rel_path}")
+            except OSError as e:
+                logger.warning(f"[警告] 旧文件删除失败: {rel_path}: {e}")
+    
+    def _record_failure(self, stage: str, category: str, reason: str, key: Optional[str] = None):
+        """记录失败（永久失败写入负缓存）
+        
+        Args:
+            stage: detail / download
+            category: 失败类别（见 core.failures）
+            reason: 原因
+            key: 负缓存键（政策ID或附件服务器路径），为空时不写入
+        """
+        self.stats.record_failure(stage, category)
+        # 同一政策有多个附件失败时优先保留可重试的失败，政策才会进入重试阶段
+        if self.last_failure is None or self.last_failure["category"] in failures.PERMANENT:
+            self.last_failure = {"stage": stage, "category": category, "reason": reason}
+        if key and category in failures.PERMANENT and self.negative_cache is not None:
+            self.negative_cache.add(stage, key, category, reason)
+    
+    def _select_attachments(self, attachments: List[FileAttachment]) -> List[FileAttachment]:
+        """按配置筛选需要下载的附件
         
         Args:
-            policy: 政策对象
             attachments: 附件列表
             
         Returns:
-            转换后的Markdown内容
+            需要下载的附件
         """
         if not attachments:
-            return None
-        
-        # 筛选需要下载的文件
-        target_files = []
+            return []
         
-        # 如果启用了"下载所有文件"选项，直接添加所有附件
+        # 如果启用了"下载所有文件"选项，直接返回所有附件
         if self.config.get("download_all_files", False):
-            target_files = attachments
-            logging.info(f"\n[下载所有文件] 已启用，将下载所有 {len(attachments)} 个附件（忽略文件类型）")
-        else:
-            # 按文件类型筛选
-            for att in attachments:
-                # 同时检查 file_ext 和从 file_name 提取的扩展名，确保准确性
-                file_ext_lower = (att.file_ext or "").lower().strip()
-                # 从文件名提取扩展名（去掉点号）
-                file_name_ext = os.path.splitext(att.file_name)[1].lower().strip('.')
-                
-                # 优先使用 file_name 的扩展名（更可靠），如果为空则使用 file_ext
-                ext_to_check = file_name_ext if file_name_ext else file_ext_lower
-                
-                # 如果扩展名都为空，跳过
-                if not ext_to_check:
-                    continue
-                
-                # 严格匹配扩展名（完全匹配，避免误判）
-                is_docx = ext_to_check == 'docx'
-                is_doc = ext_to_check == 'doc' and not is_docx
-                is_pdf = ext_to_check == 'pdf'
-                
-                # 根据配置决定是否下载
-                should_download = False
-                if is_docx and self.config.get("download_docx", True):
-                    should_download = True
-                elif is_doc and self.config.get("download_doc", True):
-                    should_download = True
-                elif is_pdf and self.config.get("download_pdf", False):
-                    should_download = True
-                
-                if should_download:
-                    target_files.append(att)
+            logger.info(f"\n[下载所有文件] 已启用，将下载所有 {len(attachments)} 个附件（忽略文件类型）")
+            return list(attachments)
+        
+        # 按文件类型筛选
+        target_files = []
+        for att in attachments:
+            # 同时检查 file_ext 和从 file_name 提取的扩展名，确保准确性
+            file_ext_lower = (att.file_ext or "").lower().strip()
+            # 从文件名提取扩展名（去掉点号）
+            file_name_ext = os.path.splitext(att.file_name)[1].lower().strip('.')
+            
+            # 优先使用 file_name 的扩展名（更可靠），如果为空则使用 file_ext
+            ext_to_check = file_name_ext if file_name_ext else file_ext_lower
+            
+            # 如果扩展名都为空，跳过
+            if not ext_to_check:
+                continue
             
-            if target_files:
-                logging.info(f"\n从 {len(attachments)} 个附件中筛选出 {len(target_files)} 个文件")
+            # 严格匹配扩展名（完全匹配，避免误判）
+            is_docx = ext_to_check == 'docx'
+            is_doc = ext_to_check == 'doc' and not is_docx
+            is_pdf = ext_to_check == 'pdf'
+            
+            # 根据配置决定是否下载
+            should_download = False
+            if is_docx and self.config.get("download_docx", True):
+                should_download = True
+            elif is_doc and self.config.get("download_doc", True):
+                should_download = True
+            elif is_pdf and self.config.get("download_pdf", False):
+                should_download = True
+            
+            if should_download:
+                target_files.append(att)
         
-        if not target_files:
-            return None
+        if target_files:
+            logger.info(f"\n从 {len(attachments)} 个附件中筛选出 {len(target_files)} 个文件")
+        return target_files
+    
+    def _download_files(
+        self,
+        policy: Policy,
+        target_files: List[FileAttachment],
+        file_number: int,
+        on_downloaded: Optional[Callable[[Tuple[str, str, str, bytes]], None]] = None,
+        existing: Optional[List[Dict]] = None
+    ) -> Tuple[List[Tuple[str, str, str, bytes]], List[Dict]]:
+        """下载附件并提交写入
         
-        markdown_parts = []
+        附件由 download_workers 个线程并发下载（共享 APIClient 的下载限速），
+        每个附件下载完成后立即在当前线程提交写入并调用 on_downloaded（如转换），
+        不必等待其他附件。existing 中记录过（服务器路径和附件ID一致）且本地
+        文件大小、哈希校验通过的附件直接读取本地文件，不发请求，也不调用
+        on_downloaded。
+        
+        Args:
+            policy: 政策对象
+            target_files: 需要下载的附件
+            file_number: 附件文件编号
+            on_downloaded: 每个附件下载成功后的回调（按完成顺序，在调用线程中执行；使用本地文件的附件不调用）
+            existing: 清单中上次记录的附件（见 _attachment_record）
+            
+        Returns:
+            (成功的附件 [(原文件名, 扩展名, 相对路径, 内容), ...], 对应的附件记录)，按附件原顺序
+        """
+        recorded = {record.get("path"): record for record in existing or []}
+        results: Dict[int, Tuple[str, str, str, bytes]] = {}
+        records: Dict[int, Dict] = {}
         
         # 准备政策名称的安全版本（用于文件命名）
-        safe_title = "".join(c for c in policy.title if c.isalnum() or c in (' ', '-', '_')).strip()
-        if not safe_title:
-            safe_title = f"政策_{policy.id[:8]}"
+        safe_title = safe_filename(policy.title, policy.id)
         
+        jobs = []
         for i, att in enumerate(target_files, 1):
-            logging.info(f"\n  [{i}/{len(target_files)}] 处理: {att.file_name}")
-            
             # 获取附件文件名（去掉扩展名）
             att_name_without_ext = os.path.splitext(att.file_name)[0]
             ext = os.path.splitext(att.file_name)[1] or f'.{att.file_ext}'
@@ -265,42 +569,180 @@ class PolicyCrawler:
                     safe_att_name = f"附件_{i}"
                 save_filename = f"{file_number:04d}_{safe_title}_{safe_att_name}{ext}"
             
-            save_path = f"{self.config.output_dir}/files/{save_filename}"
+            record = recorded.get(att.file_path)
+            if record is not None and record.get("id", att.id) == att.id:
+                content = self._read_existing_file(record)
+                if content is not None:
+                    logger.info(f"\n  [{i}/{len(target_files)}] [跳过] 本地文件已存在且校验通过: {record['file']}")
+                    self.stats.record_skip("download")
+                    # 不调用 on_downloaded：Markdown 可能无需重新生成，需要时由 _convert_files 转换
+                    results[i] = (att.file_name, ext, record["file"], content)
+                    records[i] = record
+                    continue
             
-            if self.api_client.download_file(att.file_path, save_path):
-                logging.info(f"    [OK] 下载成功: {save_path}")
-                
-                # 转换为Markdown
-                logging.info("    转换为Markdown...")
-                content = self.converter.convert(save_path)
-                
-                if content:
-                    markdown_parts.append(f"\n\n## {att.file_name}\n\n")
-                    markdown_parts.append(content)
-                
-                # 文件间延迟
-                if i < len(target_files):
-                    time.sleep(0.3)
-            else:
-                logging.info("    [X] 下载失败")
+            # 强制重新下载（skip_existing_files 为 false）时也不使用负缓存
+            known = None
+            if self.negative_cache is not None and self.skip_existing:
+                known = self.negative_cache.get("download", att.file_path)
+            if known is not None:
+                logger.info(f"\n  [{i}/{len(target_files)}] [跳过] {att.file_name} 已知失败"
+                            f"（{failures.describe(known['category'])}）: {known['reason']}")
+                self._record_failure("download", known["category"], known["reason"])
+                continue
+            
+            jobs.append((i, att, ext, self.layout.relative_path("files", policy, save_filename)))
         
-        if markdown_parts:
-            result = '\n'.join(markdown_parts)
-            logging.info(f"\n  [OK] 已合并 {len(target_files)} 个文件的内容")
-            return result
+        def finish(job, outcome):
+            i, att, ext, rel_path = job
+            content, failure = outcome
+            if content is None:
+                category, reason = failure or (failures.NETWORK, "下载失败")
+                logger.warning(f"    [X] 下载失败（{failures.describe(category)}）: {att.file_name}")
+                self._record_failure("download", category, reason, key=att.file_path)
+                return
+            if self.negative_cache is not None:
+                self.negative_cache.discard("download", att.file_path)
+            # 交给写入线程落盘，转换直接使用内存中的内容
+            save_path = self.writer.write_bytes(self.layout.absolute_path(rel_path), content)
+            results[i] = (att.file_name, ext, self.layout.to_relative(save_path), content)
+            records[i] = self._attachment_record(att, results[i][2], content)
+            logger.info(f"    [OK] 下载成功: {save_path}")
+            if on_downloaded is not None:
+                on_downloaded(results[i])
         
-        return None
+        if self._download_pool is None or len(jobs) <= 1:
+            for job in jobs:
+                finish(job, self._fetch_attachment(job[1], job[0], len(target_files)))
+        else:
+            futures = {
+                self._download_pool.submit(self._fetch_attachment, job[1], job[0], len(target_files)): job
+                for job in jobs
+            }
+            for future in as_completed(futures):
+                finish(futures[future], future.result())
+        
+        order = sorted(results)
+        return [results[i] for i in order], [records[i] for i in order]
     
-    def _save_json(self, policy_id: str, data: Dict):
-        """保存JSON数据"""
-        filepath = f"{self.config.output_dir}/json/policy_{policy_id}.json"
+    @staticmethod
+    def _attachment_record(att: FileAttachment, rel_path: str, content: bytes) -> Dict:
+        """清单中的附件记录（用于下次爬取时跳过已下载的附件）"""
+        return {
+            "path": att.file_path,
+            "id": att.id,
+            "file": rel_path,
+            "size": len(content),
+            "sha256": content_hash(content),
+        }
+    
+    def _read_existing_file(self, record: Dict) -> Optional[bytes]:
+        """读取清单中记录的本地附件并校验大小和哈希
+        
+        Returns:
+            文件内容，文件缺失或与记录不符时返回None
+        """
+        path = self.layout.absolute_path(record.get("file") or "")
+        if not record.get("file") or not os.path.exists(path):
+            return None
+        size = record.get("size")
+        if size is not None and not path.endswith(ZstdCodec.SUFFIX) and os.path.getsize(path) != size:
+            logger.info(f"    [校验] 大小与记录不符，重新下载: {record['file']}")
+            return None
+        content = FileHandler.read_bytes(path)
+        if content is None or (size is not None and len(content) != size):
+            logger.info(f"    [校验] 大小与记录不符，重新下载: {record['file']}")
+            return None
+        if record.get("sha256") and content_hash(content) != record["sha256"]:
+            logger.info(f"    [校验] 哈希与记录不符，重新下载: {record['file']}")
+            return None
+        return content
+    
+    def _fetch_attachment(self, att: FileAttachment, index: int, total: int) -> Tuple[Optional[bytes], Optional[Tuple[str, str]]]:
+        """下载一个附件（可在下载线程中执行）
+        
+        Returns:
+            (内容, 失败的 (类别, 原因))，成功时失败为None
+        """
+        logger.info(f"\n  [{index}/{total}] 下载: {att.file_name}")
+        with tracing.span("download", file_name=att.file_name) as span:
+            content = self.api_client.fetch_file(att.file_path)
+            span.set(bytes=len(content) if content else 0)
+        # last_failure 按线程保存，必须在下载线程中读取
+        return content, (self.api_client.last_failure if content is None else None)
+    
+    def _load_saved_files(self, saved_files: List[str], saved_names: List[str]) -> List[Tuple[str, str, str, bytes]]:
+        """读取上次保存的附件（附件未变化但需要重新生成Markdown时使用）"""
+        loaded = []
+        for i, rel_path in enumerate(saved_files):
+            content = FileHandler.read_bytes(self.layout.absolute_path(rel_path))
+            if not content:
+                continue
+            plain_path = rel_path[:-len(ZstdCodec.SUFFIX)] if rel_path.endswith(ZstdCodec.SUFFIX) else rel_path
+            name = saved_names[i] if i < len(saved_names) else os.path.basename(plain_path)
+            loaded.append((name, os.path.splitext(plain_path)[1], rel_path, content))
+        return loaded
+    
+    def _convert_file(self, file: Tuple[str, str, str, bytes]) -> Optional[str]:
+        """转换一个附件为Markdown（记录耗时）"""
+        file_name, ext, _, content = file
+        logger.info(f"  转换为Markdown: {file_name}")
+        convert_started = time.monotonic()
+        with tracing.span("convert", format=ext.lstrip('.').lower()):
+            converted = self.converter.convert_bytes(content, ext)
+        self.stats.record_stage("convert", time.monotonic() - convert_started)
+        return converted
+    
+    def _convert_files(
+        self,
+        files: List[Tuple[str, str, str, bytes]],
+        converted: Optional[Dict[str, Optional[str]]] = None
+    ) -> Optional[str]:
+        """转换附件并合并为Markdown正文
+        
+        Args:
+            files: [(原文件名, 扩展名, 相对路径, 内容), ...]
+            converted: 下载时已转换的结果（相对路径 → Markdown），其余附件在此转换
+            
+        Returns:
+            转换后的Markdown内容（各附件按 files 的顺序合并）
+        """
+        converted = converted or {}
+        sections = []
+        for file in files:
+            file_name, ext, rel_path, content = file
+            text = converted[rel_path] if rel_path in converted else self._convert_file(file)
+            
+            head = content[:filetype.HEAD_SIZE]
+            if text:
+                sections.append((file_name, text))
+            elif filetype.is_error_body(head, ext):
+                self.stats.record_failure("convert", failures.ERROR_PAGE)
+            elif DocumentConverter.can_convert(filetype.detect(head, ext)):
+                self.stats.record_failure("convert", failures.CONVERSION_ERROR)
+            else:
+                self.stats.record_failure("convert", failures.UNSUPPORTED_FORMAT)
+        
+        result = rag_markdown.join_attachments(sections)
+        if result:
+            logger.info(f"\n  [OK] 已合并 {len(sections)} 个文件的内容")
+        return result
+    
+    def _save_json(self, policy: Policy, data: Dict) -> Optional[str]:
+        """保存JSON数据
+        
+        Returns:
+            相对于输出目录的路径，失败返回None
+        """
+        rel_path = self.layout.relative_path("json", policy, f"policy_{policy.id}.json")
+        filepath = self.layout.absolute_path(rel_path)
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            logging.info(f"[OK] JSON已保存: {filepath}")
+            filepath = self.writer.write_json(filepath, data)
+            logger.info(f"[OK] JSON已提交写入: {filepath}")
+            return self.layout.to_relative(filepath)
         except Exception as e:
-            logging.info(f"[X] JSON保存失败: {e}")
+            logger.error(f"[X] JSON保存失败: {e}")
+            return None
     
     def _generate_rag_markdown(
         self,
@@ -308,152 +750,360 @@ class PolicyCrawler:
         detail: PolicyDetail,
         markdown_content: Optional[str],
         file_number: int
-    ):
-        """生成RAG格式的Markdown文件"""
+    ) -> Optional[str]:
+        """生成RAG格式的Markdown文件
+        
+        Returns:
+            相对于输出目录的路径，失败返回None
+        """
         try:
-            md_lines = []
-            
-            # YAML Front Matter
-            md_lines.append('---')
-            md_lines.append(f'title: "{policy.title}"')
-            md_lines.append(f'policy_id: "{policy.id}"')
-            md_lines.append(f'law_rule_type: "{policy.law_rule_type}"')
-            md_lines.append(f'office: "{policy.office}"')
-            md_lines.append(f'pass_date: "{policy.pass_date[:10]}"')
-            md_lines.append(f'effective_date: "{detail.effective_date[:10] if detail.effective_date else ""}"')
-            md_lines.append(f'file_type: "{policy.file_type}"')
-            md_lines.append(f'timeliness: "{policy.timeliness}"')
-            md_lines.append(f'formulate_mode: "{policy.formulate_mode}"')
-            
-            # 关键词
-            if detail.keywords:
-                keywords_list = [k.strip() for k in detail.keywords.split(',') if k.strip()]
-                md_lines.append(f'keywords: {json.dumps(keywords_list, ensure_ascii=False)}')
-            
-            # 标签
-            if policy.tag_names:
-                tags_list = [t.strip() for t in policy.tag_names.split('、') if t.strip()]
-                md_lines.append(f'tags: {json.dumps(tags_list, ensure_ascii=False)}')
-            
-            # 来源链接
-            detail_url = f"https://www.gdpc.gov.cn:443/bascdata/securityJsp/nfrr_inner/internet/lawRule/lawRuleDetail.jsp?id={policy.id}&lawRuleType={policy.law_rule_type}"
-            md_lines.append(f'source_url: "{detail_url}"')
-            md_lines.append(f'crawl_time: "{time.strftime("%Y-%m-%d %H:%M:%S")}"')
-            md_lines.append('---')
-            md_lines.append('')
-            
-            # 标题
-            md_lines.append(f'# {policy.title}')
-            md_lines.append('')
-            
-            # 基本信息
-            md_lines.append('## 基本信息')
-            md_lines.append('')
-            md_lines.append(f'- **制定机关**: {policy.office}')
-            md_lines.append(f'- **通过日期**: {policy.pass_date[:10]}')
-            if detail.effective_date:
-                md_lines.append(f'- **生效日期**: {detail.effective_date[:10]}')
-            md_lines.append(f'- **时效性**: {policy.timeliness}')
-            md_lines.append(f'- **制定形式**: {policy.formulate_mode}')
-            md_lines.append(f'- **来源链接**: [查看原文]({detail_url})')
-            md_lines.append('')
-            
-            # 关键词
-            if detail.keywords:
-                md_lines.append('## 关键词')
-                md_lines.append('')
-                keywords_list = [k.strip() for k in detail.keywords.split(',') if k.strip()][:20]
-                md_lines.append(', '.join(keywords_list))
-                md_lines.append('')
-            
-            # 正文内容
-            if markdown_content:
-                md_lines.append('---')
-                md_lines.append('')
-                md_lines.append('## 正文内容')
-                md_lines.append('')
-                md_lines.append(markdown_content)
-            else:
-                md_lines.append('---')
-                md_lines.append('')
-                md_lines.append('## 正文内容')
-                md_lines.append('')
-                md_lines.append('> **注意**: 该政策的附件文件无法自动转换为文本格式。')
-                md_lines.append('> ')
-                md_lines.append('> 请访问[来源链接](#基本信息)查看完整文档内容。')
+            content = rag_markdown.render(policy, detail, markdown_content)
             
             # 保存文件
-            safe_title = "".join(c for c in policy.title if c.isalnum() or c in (' ', '-', '_')).strip()
-            if not safe_title:
-                safe_title = f"政策_{policy.id[:8]}"
+            rel_path = self.layout.relative_path("markdown", policy, rag_markdown.markdown_filename(policy, file_number))
+            md_filepath = self.layout.absolute_path(rel_path)
             
-            md_filename = f"{file_number:04d}_{safe_title}.md"
-            md_filepath = f"{self.config.output_dir}/markdown/{md_filename}"
+            md_filepath = self.writer.write_text(md_filepath, content)
             
-            with open(md_filepath, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(md_lines))
-            
-            logging.info(f"[OK] Markdown已保存: {md_filepath}")
+            logger.info(f"[OK] Markdown已提交写入: {md_filepath}")
+            return self.layout.to_relative(md_filepath)
             
         except Exception as e:
-            logging.info(f"[X] Markdown生成失败: {e}")
+            logger.error(f"[X] Markdown生成失败: {e}")
+            return None
     
     def _get_next_markdown_number(self) -> int:
-        """获取下一个 Markdown 文件编号（仅检查 markdown 文件夹）"""
-        markdown_dir = f"{self.config.output_dir}/markdown"
-        
-        if not os.path.exists(markdown_dir):
-            return 1
-        
-        existing_files = [f for f in os.listdir(markdown_dir) if f.endswith('.md')]
+        """获取下一个 Markdown 文件编号（markdown 编号独立递增）"""
+        if self._markdown_counter is None:
+            self._markdown_counter = self._initial_number("markdown", "markdown_number", '.md')
+        return self._markdown_counter + 1
+    
+    def _get_next_file_number(self) -> int:
+        """获取下一个附件文件编号（files 编号独立递增）"""
+        if self._file_counter is None:
+            self._file_counter = self._initial_number("files", "file_number")
+        return self._file_counter + 1
+    
+    def _initial_number(self, kind: str, manifest_key: str, extension: Optional[str] = None) -> int:
+        """已使用的最大编号：优先读取清单，旧版平铺目录没有清单时扫描一次目录"""
+        number = self.manifest.max_number(manifest_key)
+        if len(self.manifest) == 0 and self.layout.mode == "flat":
+            number = max(number, self._scan_max_number(f"{self.config.output_dir}/{kind}", extension))
+        return number
+    
+    @staticmethod
+    def _scan_max_number(directory: str, extension: Optional[str] = None) -> int:
+        """扫描目录中已有的最大编号（文件名格式：数字_...）
         
-        if not existing_files:
-            return 1
+        写入是异步的，目录内容可能落后于已分配的编号，因此只在启动时扫描一次。
+        """
+        if not os.path.exists(directory):
+            return 0
         
         numbers = []
-        for filename in existing_files:
+        for filename in os.listdir(directory):
+            if extension and not filename.endswith(extension):
+                continue
             parts = filename.split('_', 1)
             if parts and len(parts) >= 2 and parts[0].isdigit():
                 numbers.append(int(parts[0]))
         
-        if not numbers:
-            return 1
+        return max(numbers) if numbers else 0
+    
+    def plan_refresh(self, policies: List[Policy]) -> Tuple[List[Policy], Dict[str, Dict]]:
+        """增量更新：比较列表元数据与清单，筛选需要重新爬取的政策
+        
+        Args:
+            policies: 本次获取的政策列表
+            
+        列表元数据未变化、但上次的输出缺失或未完成（如附件下载失败、没有生成
+        Markdown）的政策也会重新爬取，变化类型为 "incomplete"。
+        
+        Returns:
+            (需要爬取的政策, {政策ID: {"change": "new" / "updated" / "incomplete",
+             "fields": {字段: [旧值, 新值]}, "missing": [阶段]}})
+        """
+        stages = [
+            stage for stage, key in (("json", "save_json"), ("files", "save_files"), ("markdown", "save_markdown"))
+            if self.config.get(key, True)
+        ]
+        targets = []
+        changes: Dict[str, Dict] = {}
+        for policy in policies:
+            entry = self.manifest.get(policy.id)
+            if entry is None:
+                changes[policy.id] = {"change": "new", "fields": {}}
+            else:
+                fields = fingerprint.list_changes(entry, policy)
+                missing = fingerprint.missing_outputs(entry, self.config.output_dir, stages)
+                if fields is None and not missing:
+                    continue
+                changes[policy.id] = {
+                    "change": "updated" if fields is not None else "incomplete",
+                    "fields": fields or {},
+                }
+                if missing:
+                    changes[policy.id]["missing"] = missing
+            targets.append(policy)
         
-        return max(numbers) + 1
+        counts = {kind: 0 for kind in ("new", "updated", "incomplete")}
+        for change in changes.values():
+            counts[change["change"]] += 1
+        logger.info(
+            f"\n▶ 增量更新: 新增 {counts['new']} 条，变化 {counts['updated']} 条，"
+            f"输出不完整 {counts['incomplete']} 条，未变化 {len(policies) - len(targets)} 条"
+        )
+        return targets, changes
     
-    def _get_next_file_number(self) -> int:
-        """获取下一个附件文件编号（仅检查 files 文件夹）"""
-        files_dir = f"{self.config.output_dir}/files"
+    def _record_change(self, policy: Policy, change: Dict, previous: Optional[Dict]):
+        """追加一条变化记录到 changes.jsonl（爬取成功后调用）"""
+        record = {
+            "time": datetime.now().isoformat(timespec='seconds'),
+            "id": policy.id,
+            "title": policy.title,
+            "law_rule_type": policy.law_rule_type,
+            "change": change["change"],
+            "fields": change["fields"],
+        }
+        if change.get("missing"):
+            record["missing"] = change["missing"]
+        if previous is not None:
+            current = self.manifest.get(policy.id) or {}
+            before = previous.get("inputs") or {}
+            after = current.get("inputs") or {}
+            record["detail_changed"] = before.get("detail") != after.get("detail")
+            record["attachments_changed"] = (
+                before.get("attachments") != after.get("attachments")
+                or before.get("files") != after.get("files")
+            )
+            # 输出路径变化（旧文件已删除）：{类型: [旧路径, 新路径]}
+            moved = {
+                kind: [previous[kind], current[kind]]
+                for kind in ("json", "markdown")
+                if previous.get(kind) and current.get(kind) and previous[kind] != current[kind]
+            }
+            if moved:
+                record["moved"] = moved
+        path = f"{self.config.output_dir}/{self.CHANGES_FILENAME}"
+        self.writer.append_bytes(path, codec.encode_record(record))
+    
+    def _crawl_with_delay(self, policy: Policy, refresh: bool, changes: Dict[str, Dict]) -> bool:
+        """爬取一个政策并记录结果（成功时计入完成数，失败时由调用方记录），之后按请求间隔等待
         
-        if not os.path.exists(files_dir):
-            return 1
+        Args:
+            policy: 政策
+            refresh: 是否为增量更新（成功时写入变化记录）
+            changes: 增量更新的变化（政策ID → 变化）
+            
+        Returns:
+            是否成功
+        """
+        calls_before = self.api_client.network_calls
+        previous = self.manifest.get(policy.id) if refresh else None
+        success = self.crawl_single_policy(policy)
         
-        existing_files = os.listdir(files_dir)
+        if success:
+            self.progress.completed_count += 1
+            self.progress.completed_policies.add(policy.id)
+            if refresh:
+                self._record_change(policy, changes[policy.id], previous)
         
-        if not existing_files:
-            return 1
+        # 请求间隔（全部由HTTP缓存提供时无需等待）
+        if self.api_client.network_calls != calls_before:
+            tracing.sleep(self.config.request_delay, reason="request_delay")
+        return success
+    
+    def _failure_record(self, policy: Policy, attempts: int = 1) -> Dict:
+        """根据最近一次失败生成失败记录（进度中的 failed_policies 条目）"""
+        failure = self.last_failure or {}
+        category = failure.get("category", "")
+        return {
+            'id': policy.id,
+            'title': policy.title,
+            'reason': failures.describe(category) if category else '爬取失败',
+            'category': category,
+            'detail': failure.get("reason", ""),
+            'attempts': attempts
+        }
+    
+    def _wait(self, seconds: float, reason: str):
+        """可被停止请求打断的等待"""
+        deadline = time.monotonic() + seconds
+        while not self.stop_requested:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            tracing.sleep(min(1.0, remaining), reason=reason)
+    
+    def _retry_failed(self, failed: List[Policy], refresh: bool, changes: Dict[str, Dict]) -> List[Policy]:
+        """重试阶段：本次失败的政策冷却后重新爬取
         
-        numbers = []
-        for filename in existing_files:
-            # 检查文件名是否以数字开头（格式：数字_...）
-            parts = filename.split('_', 1)
-            if parts and len(parts) >= 2 and parts[0].isdigit():
-                numbers.append(int(parts[0]))
+        最多 retry_rounds 轮，第 n 轮前等待 retry_cooldown × 2^(n-1) 秒并加
+        ±50% 随机抖动；永久失败（详情不存在、格式错误等）不重试。已完成的
+        阶段由输入指纹跳过，重试只补做失败的部分。
+        
+        Args:
+            failed: 失败的政策
+            refresh: 是否为增量更新
+            changes: 增量更新的变化
+            
+        Returns:
+            最终仍失败的政策
+        """
+        rounds = int(self.config.get("retry_rounds", 2) or 0)
+        cooldown = float(self.config.get("retry_cooldown", 30) or 0)
+        records = {record['id']: record for record in self.progress.failed_policies}
+        
+        for round_no in range(1, rounds + 1):
+            retryable = [
+                policy for policy in failed
+                if records[policy.id].get('category') not in failures.PERMANENT
+            ]
+            if not retryable or self.stop_requested:
+                break
+            
+            delay = cooldown * (2 ** (round_no - 1)) * random.uniform(0.5, 1.5)
+            logger.info("\n" + "=" * 60)
+            logger.info(f"▶ 重试第 {round_no}/{rounds} 轮: {len(retryable)} 条失败政策，{delay:.0f} 秒后开始")
+            logger.info("=" * 60)
+            self._wait(delay, reason="retry_cooldown")
+            
+            for i, policy in enumerate(retryable, 1):
+                if self.stop_requested:
+                    logger.info("[停止] 停止重试")
+                    break
+                
+                logger.info(f"\n重试: [{i}/{len(retryable)}]")
+                self.progress.current_policy_id = policy.id
+                self.progress.current_policy_title = policy.title
+                self._update_progress()
+                
+                self.stats.record_retry("policy")
+                success = self._crawl_with_delay(policy, refresh, changes)
+                self.stats.record_policy(success, retried=True)
+                if success:
+                    self.progress.failed_count -= 1
+                    del records[policy.id]
+                    failed.remove(policy)
+                else:
+                    records[policy.id] = self._failure_record(policy, records[policy.id]['attempts'] + 1)
+                
+                # 替换列表（GUI按列表对象判断是否需要重新显示失败列表）
+                self.progress.failed_policies = [records[p.id] for p in failed]
+                self._update_progress()
+        
+        return failed
+    
+    def dead_letter_path(self) -> str:
+        """死信文件路径"""
+        return os.path.join(self.config.output_dir, self.DEAD_LETTER_FILENAME)
+    
+    def _read_dead_letters(self) -> List[Dict]:
+        """读取死信记录（文件不存在时为空）"""
+        records = []
+        path = self.dead_letter_path()
+        if not os.path.exists(path):
+            return records
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = codec.loads(line)
+                except ValueError:
+                    logger.warning("[警告] 跳过无法解析的死信记录")
+                    continue
+                if isinstance(record, dict) and record.get("id"):
+                    records.append(record)
+        return records
+    
+    def load_dead_letters(self) -> List[Policy]:
+        """读取死信文件中的政策（用于 --retry-failed，无需重新获取列表）
+        
+        Returns:
+            政策列表
+        """
+        names = {f.name for f in dataclasses.fields(Policy)}
+        policies = []
+        for record in self._read_dead_letters():
+            data = record.get("policy") or {}
+            try:
+                policies.append(Policy(**{key: value for key, value in data.items() if key in names}))
+            except TypeError:
+                logger.warning(f"[警告] 死信记录缺少政策信息，已跳过: {record.get('id')}")
+        return policies
+    
+    def _update_dead_letters(self, failed: List[Policy]):
+        """更新死信文件：移除本次已成功的政策，写入本次最终失败的政策
+        
+        死信文件始终只包含尚未成功的政策，每行一条，含政策列表信息、失败
+        类别、原因和累计尝试次数。
+        """
+        previous = {record["id"]: record for record in self._read_dead_letters()}
+        if not previous and not failed:
+            return
         
-        if not numbers:
-            return 1
+        records = {record['id']: record for record in self.progress.failed_policies}
+        now = datetime.now().isoformat(timespec='seconds')
+        for policy in failed:
+            record = records.get(policy.id) or self._failure_record(policy)
+            attempts = record.get('attempts', 1) + (previous.get(policy.id) or {}).get("attempts", 0)
+            previous[policy.id] = {
+                "time": now,
+                "id": policy.id,
+                "title": policy.title,
+                "category": record.get('category', ''),
+                "reason": record.get('detail') or record.get('reason', ''),
+                "attempts": attempts,
+                "policy": policy.to_dict(),
+            }
+        for policy_id in self.progress.completed_policies:
+            previous.pop(policy_id, None)
         
-        return max(numbers) + 1
+        data = b"".join(codec.encode_record(record) for record in previous.values())
+        try:
+            atomic_write_bytes(self.dead_letter_path(), data, fsync=False)
+        except OSError as e:
+            logger.warning(f"[警告] 死信文件写入失败: {e}")
+            return
+        if previous:
+            logger.info(f"死信: {len(previous)} 条政策仍失败 → {self.DEAD_LETTER_FILENAME}（可用 batch --retry-failed 重试）")
     
-    def crawl_batch(self, law_rule_types: List[int] = [1, 2, 3]) -> CrawlProgress:
+    def crawl_batch(
+        self,
+        law_rule_types: List[int] = [1, 2, 3],
+        refresh: bool = False,
+        policies: Optional[List[Policy]] = None
+    ) -> CrawlProgress:
         """批量爬取
         
+        增量更新时列表和详情的HTTP缓存只用于条件请求（有效期内也重新验证）。
+        
+        失败的政策在本轮结束后按 retry_rounds / retry_cooldown 重试，仍失败的
+        写入 dead_letter.jsonl。
+        
         Args:
             law_rule_types: 政策类型列表
+            refresh: 增量更新（只爬取新增和列表元数据变化的政策，变化记录写入 changes.jsonl）
+            policies: 直接爬取这些政策，不获取列表（如 load_dead_letters 的结果）
             
         Returns:
             爬取进度
         """
+        self.api_client.revalidate = refresh
+        try:
+            return self._crawl_batch(law_rule_types, refresh, policies)
+        finally:
+            self.api_client.revalidate = False
+    
+    def _crawl_batch(
+        self,
+        law_rule_types: List[int],
+        refresh: bool,
+        policies: Optional[List[Policy]]
+    ) -> CrawlProgress:
+        """批量爬取（crawl_batch 的实现）"""
         # 在开始搜索列表时就设置start_time（开始计时）
         # 保留已有的start_time（如果GUI已经设置），否则创建新的
         if not hasattr(self, 'progress') or self.progress is None:
@@ -472,18 +1122,18 @@ class PolicyCrawler:
         # 立即更新进度（显示开始时间和用时）
         self._update_progress()
         
-        all_policies = []
+        all_policies = list(policies) if policies is not None else []
         
-        # 获取所有政策（实时更新进度）
-        for law_rule_type in law_rule_types:
+        # 获取所有政策（实时更新进度；直接给定政策时跳过）
+        for law_rule_type in (law_rule_types if policies is None else []):
             # 检查停止标志
             if self.stop_requested:
-                logging.info("[停止] 停止获取政策列表")
+                logger.info("[停止] 停止获取政策列表")
                 break
             
             # 搜索政策列表（此时已经开始计时）
-            policies = self.search_all_policies(law_rule_type)
-            all_policies.extend(policies)
+            listed = self.search_all_policies(law_rule_type)
+            all_policies.extend(listed)
             
             # 实时更新已获取的政策数量（临时显示）
             self.progress.total_count = len(all_policies)
@@ -495,22 +1145,31 @@ class PolicyCrawler:
             self._update_progress()
             return self.progress
         
+        # 增量更新：只保留新增和变化的政策
+        changes: Dict[str, Dict] = {}
+        if refresh:
+            all_policies, changes = self.plan_refresh(all_policies)
+        
         # 最终确认总数并更新
         self.progress.total_count = len(all_policies)
         self._update_progress()
         
-        logging.info("\n" + "=" * 60)
-        logging.info(f"▶▶ 开始爬取政策详细内容，共 {len(all_policies)} 条政策")
-        logging.info("=" * 60)
+        if self.memory_profiler is not None:
+            self.memory_profiler.checkpoint(f"列表获取完成（{len(all_policies)} 条）")
+        
+        logger.info("\n" + "=" * 60)
+        logger.info(f"▶▶ 开始爬取政策详细内容，共 {len(all_policies)} 条政策")
+        logger.info("=" * 60)
         
         # 爬取每个政策
+        failed: List[Policy] = []
         for i, policy in enumerate(all_policies, 1):
             # 检查停止标志
             if self.stop_requested:
-                logging.info("[停止] 停止爬取政策")
+                logger.info("[停止] 停止爬取政策")
                 break
             
-            logging.info(f"\n进度: [{i}/{len(all_policies)}]")
+            logger.info(f"\n进度: [{i}/{len(all_policies)}]")
             
             # 更新当前政策信息（在爬取前）
             self.progress.current_policy_id = policy.id
@@ -518,41 +1177,93 @@ class PolicyCrawler:
             self._update_progress()
             
             # 爬取政策（crawl_single_policy内部也会更新当前政策信息，但这里先设置确保显示）
-            success = self.crawl_single_policy(policy)
+            success = self._crawl_with_delay(policy, refresh, changes)
+            self.stats.record_policy(success)
             
-            if success:
-                self.progress.completed_count += 1
-                self.progress.completed_policies.append(policy.id)
-            else:
+            if not success:
+                failed.append(policy)
                 self.progress.failed_count += 1
-                self.progress.failed_policies.append({
-                    'id': policy.id,
-                    'title': policy.title,
-                    'reason': '爬取失败'
-                })
+                self.progress.failed_policies.append(self._failure_record(policy))
             
             # 实时更新进度（每次爬取后立即更新）
             self._update_progress()
-            
-            # 请求间隔
-            time.sleep(self.config.request_delay)
+        
+        # 重试阶段：冷却后重新爬取失败的政策，仍失败的写入死信文件
+        failed = self._retry_failed(failed, refresh, changes)
+        self._update_dead_letters(failed)
         
         self.progress.end_time = datetime.now()
         self._update_progress()
         
         # 输出统计
-        logging.info("\n" + "=" * 60)
-        logging.info("爬取完成")
-        logging.info("=" * 60)
-        logging.info(f"总计: {self.progress.total_count} 条")
-        logging.info(f"成功: {self.progress.completed_count} 条")
-        logging.info(f"失败: {self.progress.failed_count} 条")
-        logging.info(f"成功率: {self.progress.success_rate:.2f}%")
+        logger.info("\n" + "=" * 60)
+        logger.info("爬取完成")
+        logger.info("=" * 60)
+        logger.info(f"总计: {self.progress.total_count} 条")
+        logger.info(f"成功: {self.progress.completed_count} 条")
+        logger.info(f"失败: {self.progress.failed_count} 条")
+        logger.info(f"成功率: {self.progress.success_rate:.2f}%")
+        if refresh:
+            logger.info(f"变化记录: {self.progress.completed_count} 条 → {self.CHANGES_FILENAME}")
+        retried = self.stats.retries.get("policy", 0)
+        if retried:
+            logger.info(f"重试: {retried} 次，仍失败 {self.progress.failed_count} 条")
+        
+        writer_stats = self.writer.stats()
+        logger.info(
+            f"写入: {writer_stats['written_count']} 个文件，"
+            f"待写入队列: {writer_stats['queue_depth']}，失败: {writer_stats['error_count']}"
+        )
+        dropped = Logger.dropped_count()
+        if dropped:
+            logger.warning(f"日志队列已满，已丢弃 {dropped} 条日志（可调大 log_queue_size）")
         
         return self.progress
     
+    def stats_snapshot(self) -> Dict:
+        """运行统计快照（供GUI仪表盘轮询）"""
+        progress = self.progress
+        remaining = None
+        if progress.total_count:
+            remaining = max(0, progress.total_count - progress.completed_count - progress.failed_count)
+        return self.stats.snapshot(
+            remaining=remaining,
+            queue_depths={"write": self.writer.queue_depth}
+        )
+    
+    def _export_trace(self):
+        """导出追踪文件并停止记录"""
+        self._trace_enabled = False
+        tracing.TRACER.disable()
+        trace_file = self.config.get("trace_file", "trace.json") or "trace.json"
+        if not os.path.isabs(trace_file):
+            trace_file = os.path.join(self.config.output_dir, trace_file)
+        try:
+            count = tracing.TRACER.export(trace_file)
+            logger.info(f"追踪文件已导出（{count} 个区间）: {trace_file}")
+            logger.info("  可在 https://ui.perfetto.dev 或 chrome://tracing 中打开")
+        except Exception as e:
+            logger.warning(f"[X] 追踪文件导出失败: {e}")
+    
     def close(self):
-        """关闭爬虫"""
+        """关闭爬虫（等待写入队列落盘）"""
+        if getattr(self, '_download_pool', None) is not None:
+            self._download_pool.shutdown(wait=True)
+            self._download_pool = None
+        if getattr(self, 'negative_cache', None) is not None:
+            self.negative_cache.flush()
+        if hasattr(self, 'manifest'):
+            self.manifest.close()
+        if hasattr(self, 'writer'):
+            self.writer.close()
+        if getattr(self, 'memory_profiler', None):
+            self.memory_profiler.stop()
+            self.memory_profiler = None
+        if getattr(self, 'metrics_exporter', None):
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
+        if getattr(self, '_trace_enabled', False):
+            self._export_trace()
         if hasattr(self.api_client, 'close'):
             self.api_client.close()
 
@@ -0,0 +1,210 @@
+"""
+失败分类模块 - 失败原因分类和永久失败的负缓存（有效期内不再请求）
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from . import codec
+from .writer import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+# 失败类别
+NETWORK = "network"  # 超时、连接失败等
+SERVER_ERROR = "server_error"  # 5xx、接口返回错误码
+RATE_LIMITED = "rate_limited"  # 429 或接口提示限流
+CLIENT_ERROR = "client_error"  # 403 等其他 4xx
+NOT_FOUND = "not_found"  # 404 / 410
+EMPTY_FILE = "empty_file"  # 下载内容为空
+MALFORMED_DETAIL = "malformed_detail"  # 详情数据格式错误
+UNSUPPORTED_FORMAT = "unsupported_format"  # 附件格式不支持或缺少转换依赖
+CONVERSION_ERROR = "conversion_error"  # 附件转换失败
+ERROR_PAGE = "error_page"  # 下载内容是HTML错误页面或接口错误JSON
+TOO_LARGE = "too_large"  # 附件超过 max_attachment_size
+
+CATEGORY_NAMES = {
+    NETWORK: "网络错误",
+    SERVER_ERROR: "服务器错误",
+    RATE_LIMITED: "限流",
+    CLIENT_ERROR: "请求被拒绝",
+    NOT_FOUND: "资源不存在",
+    EMPTY_FILE: "文件为空",
+    MALFORMED_DETAIL: "详情格式错误",
+    UNSUPPORTED_FORMAT: "格式不支持",
+    CONVERSION_ERROR: "转换失败",
+    ERROR_PAGE: "错误页面",
+    TOO_LARGE: "文件过大",
+}
+
+# 重试也不会成功的失败（不重试，并写入负缓存）
+PERMANENT = frozenset({NOT_FOUND, EMPTY_FILE, MALFORMED_DETAIL})
+
+
+def classify_exception(error: Exception) -> str:
+    """根据请求异常判断失败类别"""
+    response = getattr(error, 'response', None)
+    status_code = getattr(response, 'status_code', None)
+    if status_code:
+        if status_code in (404, 410):
+            return NOT_FOUND
+        if status_code == 429:
+            return RATE_LIMITED
+        if status_code >= 500:
+            return SERVER_ERROR
+        if status_code >= 400:
+            return CLIENT_ERROR
+    if isinstance(error, ValueError):
+        # 响应不是合法JSON（多为网关错误页）
+        return SERVER_ERROR
+    return NETWORK
+
+
+def describe(category: str) -> str:
+    """失败类别的中文说明"""
+    return CATEGORY_NAMES.get(category, category)
+
+
+class NegativeCache:
+    """永久失败的负缓存
+
+    记录详情不存在、附件404或为空等重试无效的失败，有效期内再次遇到时直接
+    跳过，不发请求、不等待重试。保存为输出目录下的 JSON 文件，键为
+    "detail:<政策ID>" 或 "download:<服务器路径>"。过期后会重新尝试一次。
+    变更累计 SAVE_EVERY 次或距上次保存超过 SAVE_INTERVAL 秒时写入磁盘，
+    其余由 flush() 写入。
+    """
+
+    FILENAME = "negative_cache.json"
+
+    # 批量保存：累计变更次数 / 最长间隔（秒）
+    SAVE_EVERY = 50
+    SAVE_INTERVAL = 30.0
+
+    def __init__(self, output_dir: str, ttl: float = 7 * 86400):
+        """初始化
+
+        Args:
+            output_dir: 输出根目录
+            ttl: 有效期（秒）
+        """
+        self.path = os.path.join(output_dir, self.FILENAME)
+        self.ttl = ttl
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._pending = 0  # 尚未保存的变更数
+        self._saved_at = time.monotonic()
+        self.load()
+
+    def load(self) -> int:
+        """从磁盘加载（丢弃已过期的记录）
+
+        Returns:
+            有效记录数
+        """
+        entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'rb') as f:
+                    data = codec.loads(f.read())
+                if isinstance(data, dict):
+                    entries = data
+            except (OSError, ValueError) as e:
+                logger.warning(f"[警告] 负缓存读取失败，已忽略: {e}")
+        now = time.time()
+        with self._lock:
+            self._entries = {
+                key: entry for key, entry in entries.items()
+                if isinstance(entry, dict) and entry.get("expires", 0) > now
+            }
+            return len(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """查询未过期的失败记录
+
+        Args:
+            kind: detail / download
+            key: 政策ID或服务器路径
+
+        Returns:
+            {"category", "reason", "count", "first_seen", "last_seen", "expires"}，没有时返回None
+        """
+        with self._lock:
+            entry = self._entries.get(f"{kind}:{key}")
+            if entry is None:
+                return None
+            if entry.get("expires", 0) <= time.time():
+                del self._entries[f"{kind}:{key}"]
+                return None
+            return dict(entry)
+
+    def add(self, kind: str, key: str, category: str, reason: str = ""):
+        """记录一次永久失败"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.setdefault(f"{kind}:{key}", {"first_seen": now, "count": 0})
+            entry.update(
+                category=category,
+                reason=reason or describe(category),
+                last_seen=now,
+                expires=now + self.ttl,
+            )
+            entry["count"] += 1
+        self._changed()
+
+    def discard(self, kind: str, key: str):
+        """移除记录（请求已恢复成功）"""
+        with self._lock:
+            removed = self._entries.pop(f"{kind}:{key}", None)
+        if removed is not None:
+            self._changed()
+
+    def counts(self) -> Dict[str, int]:
+        """按类别统计有效记录数"""
+        now = time.time()
+        result: Dict[str, int] = {}
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.get("expires", 0) > now:
+                    category = entry.get("category", "")
+                    result[category] = result.get(category, 0) + 1
+        return result
+
+    def _changed(self):
+        """记录一次变更，达到批量条件时保存"""
+        with self._lock:
+            self._pending += 1
+            due = (self._pending >= self.SAVE_EVERY
+                   or time.monotonic() - self._saved_at >= self.SAVE_INTERVAL)
+        if due:
+            self.save()
+
+    def flush(self):
+        """保存尚未写入磁盘的变更"""
+        if self._pending:
+            self.save()
+
+    def save(self):
+        """原子写入磁盘"""
+        with self._lock:
+            data = codec.dumps(self._entries)
+            self._pending = 0
+            self._saved_at = time.monotonic()
+        try:
+            atomic_write_bytes(self.path, data, fsync=False)
+        except OSError as e:
+            logger.warning(f"[警告] 负缓存保存失败: {e}")
+
+
+def create_negative_cache(config) -> Optional[NegativeCache]:
+    """根据配置创建负缓存（negative_cache_ttl 为 0 时不启用）"""
+    ttl = float(config.get("negative_cache_ttl", 7 * 86400) or 0)
+    if ttl <= 0:
+        return None
+    return NegativeCache(config.output_dir, ttl=ttl)
@@ -0,0 +1,107 @@
+"""
+文件类型识别模块 - 根据文件开头的魔数判断附件的实际格式
+
+服务器给出的扩展名并不可靠：扩展名为 .doc 的附件可能实际是 DOCX，
+扩展名为 .pdf 的下载可能是网关返回的 HTML 错误页面。这里只看内容的前
+HEAD_SIZE 个字节，下载时用于尽早中止错误页面，转换时用于选择转换器。
+"""
+
+import os
+
+# 判断类型需要读取的字节数
+HEAD_SIZE = 2048
+
+# 可能被服务器以错误页面代替的文档格式
+DOCUMENT_EXTS = frozenset({'.pdf', '.doc', '.docx', '.wps', '.rtf', '.xls', '.xlsx', '.ppt', '.pptx', '.ofd'})
+
+# Word 格式（OLE2 / ZIP 内容按 Word 处理）
+WORD_EXTS = frozenset({'.doc', '.docx', '.wps'})
+
+# 错误响应的格式
+ERROR_BODY_TYPES = frozenset({'.html', '.json'})
+
+_OLE2_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+_ZIP_MAGIC = b'PK\x03\x04'
+_HTML_MARKERS = (b'<!doctype html', b'<html', b'<head', b'<body', b'<title', b'<script')
+
+TYPE_NAMES = {
+    '.pdf': 'PDF',
+    '.doc': 'DOC',
+    '.docx': 'DOCX',
+    '.zip': 'ZIP',
+    '.rtf': 'RTF',
+    '.html': 'HTML页面',
+    '.json': 'JSON响应',
+}
+
+
+def normalize_ext(ext: str) -> str:
+    """扩展名统一为小写并带点（如 'PDF' → '.pdf'）"""
+    ext = (ext or '').strip().lower()
+    if ext and not ext.startswith('.'):
+        ext = f'.{ext}'
+    return ext
+
+
+def sniff(head: bytes) -> str:
+    """根据开头的字节判断格式
+
+    Args:
+        head: 文件开头（至少前几个字节，建议 HEAD_SIZE）
+
+    Returns:
+        扩展名（.pdf / .doc / .docx / .zip / .rtf / .html / .json），无法判断时为空字符串
+    """
+    if head.startswith(_OLE2_MAGIC):
+        return '.doc'
+    if head.startswith(_ZIP_MAGIC):
+        return '.docx' if b'word/' in head else '.zip'
+    # PDF 头前允许有少量垃圾字节
+    if b'%PDF-' in head[:1024]:
+        return '.pdf'
+    text = head.lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    if text.startswith(b'{\\rtf'):
+        return '.rtf'
+    if text.startswith((b'{', b'[')) and (b'"code"' in text or b'"msg"' in text or b'"message"' in text):
+        return '.json'
+    if text.startswith(b'<') and any(marker in text for marker in _HTML_MARKERS):
+        return '.html'
+    return ''
+
+
+def detect(head: bytes, declared_ext: str) -> str:
+    """判断用于转换的实际格式
+
+    Args:
+        head: 文件开头
+        declared_ext: 文件名或服务器给出的扩展名
+
+    Returns:
+        实际扩展名；无法判断或与声明兼容时返回声明的扩展名
+    """
+    declared = normalize_ext(declared_ext)
+    kind = sniff(head)
+    if not kind:
+        return declared
+    if kind == '.zip':
+        # 只看开头无法确认 ZIP 内是否为 Word 文档，声明为 Word 格式时按 DOCX 处理
+        return '.docx' if declared in WORD_EXTS else declared
+    if kind == '.doc' and declared not in WORD_EXTS:
+        # OLE2 也可能是 XLS / PPT
+        return declared
+    return kind
+
+
+def is_error_body(head: bytes, declared_ext: str) -> bool:
+    """声明为文档的内容是否实际是错误页面（HTML 或接口的 JSON 错误）"""
+    return normalize_ext(declared_ext) in DOCUMENT_EXTS and sniff(head) in ERROR_BODY_TYPES
+
+
+def ext_from_path(file_path: str) -> str:
+    """从服务器路径或文件名中取扩展名"""
+    return normalize_ext(os.path.splitext(file_path)[1])
+
+
+def describe(ext: str) -> str:
+    """格式的中文说明"""
+    return TYPE_NAMES.get(ext, ext.lstrip('.').upper() or '未知格式')
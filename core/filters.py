@@ -0,0 +1,116 @@
+"""
+政策筛选模块 - 获取列表后、获取详情前按通过日期、制定机关、时效性等条件筛选政策
+"""
+
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from .models import Policy
+
+
+def _split(value: Any) -> List[str]:
+    """配置值转为字符串列表（支持列表或逗号分隔的字符串）"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace('，', ',').split(',')
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def valid_date(text: str) -> bool:
+    """是否为 YYYY-MM-DD 格式的日期（空字符串表示不限，视为有效）"""
+    if not text:
+        return True
+    try:
+        datetime.strptime(text, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+@dataclass
+class PolicyFilter:
+    """政策筛选条件（各条件同时满足，列表内任一匹配即可）"""
+    date_from: str = ""  # 通过日期下限（YYYY-MM-DD，含）
+    date_to: str = ""  # 通过日期上限（YYYY-MM-DD，含）
+    offices: List[str] = field(default_factory=list)  # 制定机关包含其中任一关键字
+    timeliness: List[str] = field(default_factory=list)  # 时效性等于其中之一
+    title_keywords: List[str] = field(default_factory=list)  # 标题包含其中任一关键字
+
+    @classmethod
+    def from_config(cls, config) -> "PolicyFilter":
+        """从配置创建（读取 filter_* 配置项）"""
+        return cls(
+            date_from=(config.get("filter_date_from", "") or "").strip(),
+            date_to=(config.get("filter_date_to", "") or "").strip(),
+            offices=_split(config.get("filter_offices")),
+            timeliness=_split(config.get("filter_timeliness")),
+            title_keywords=_split(config.get("filter_title_keywords")),
+        )
+
+    @property
+    def active(self) -> bool:
+        """是否设置了任何条件"""
+        return bool(self.date_from or self.date_to or self.offices or self.timeliness or self.title_keywords)
+
+    def matches(self, policy: Policy) -> bool:
+        """政策是否满足全部条件"""
+        pass_date = (policy.pass_date or "")[:10]
+        if self.date_from and pass_date < self.date_from:
+            return False
+        if self.date_to and pass_date > self.date_to:
+            return False
+        if self.offices and not any(office in (policy.office or "") for office in self.offices):
+            return False
+        if self.timeliness and (policy.timeliness or "") not in self.timeliness:
+            return False
+        if self.title_keywords and not any(keyword in (policy.title or "") for keyword in self.title_keywords):
+            return False
+        return True
+
+    def describe(self) -> str:
+        """条件的简短说明（用于日志）"""
+        parts = []
+        if self.date_from or self.date_to:
+            parts.append(f"通过日期 {self.date_from or '…'} ~ {self.date_to or '…'}")
+        if self.offices:
+            parts.append(f"制定机关 {'/'.join(self.offices)}")
+        if self.timeliness:
+            parts.append(f"时效性 {'/'.join(self.timeliness)}")
+        if self.title_keywords:
+            parts.append(f"标题 {'/'.join(self.title_keywords)}")
+        return "，".join(parts) or "无"
+
+
+class ListingCutoff:
+    """按通过日期提前结束翻页
+
+    列表请求按 passDate 排序，但接口未说明升序还是降序。这里记录已获取的
+    通过日期：只要至今为止非递增（降序），且最后一条已早于 date_from，
+    后面的页都不可能满足条件，可以停止翻页；一旦发现顺序不是降序则不再提前结束。
+    """
+
+    def __init__(self, date_from: str):
+        self.date_from = date_from
+        self._last: Optional[str] = None
+        self._descending = True
+
+    def add_page(self, policies: List[Policy]) -> bool:
+        """记录一页政策（筛选前）
+
+        Returns:
+            是否可以停止翻页
+        """
+        for policy in policies:
+            pass_date = (policy.pass_date or "")[:10]
+            if not pass_date:
+                continue
+            if self._last is not None and pass_date > self._last:
+                self._descending = False
+            self._last = pass_date
+        return bool(
+            self.date_from and self._descending
+            and self._last is not None and self._last < self.date_from
+        )
+
@@ -0,0 +1,231 @@
+"""
+输入指纹模块 - 记录每个政策各输出阶段的输入，判断输出是否需要重新生成
+
+清单中每个政策的 inputs 字段记录生成当前输出时的输入：
+
+    list         列表元数据的哈希（增量更新时判断是否需要重新爬取）
+    detail       详情JSON的哈希（JSON 阶段）
+    attachments  需要下载的附件列表（服务器路径）的哈希（附件阶段）
+    files        已保存附件内容的哈希，与 files 一一对应
+    converter    DocumentConverter.VERSION
+    template     rag_markdown.TEMPLATE_VERSION
+
+Markdown 阶段依赖 detail、files、converter 和 template。某阶段的输入
+与上次相同且输出文件仍在时跳过该阶段。
+"""
+
+import os
+import json
+from typing import Any, Dict, Iterable, List, Optional
+
+from .converter import DocumentConverter
+from .http_cache import content_hash
+from .manifest import Manifest
+from . import rag_markdown
+from utils.file_handler import FileHandler
+from utils.compression import ZstdCodec
+
+STAGES = ("json", "files", "markdown")
+
+# Markdown 阶段依赖的输入
+MARKDOWN_INPUTS = ("detail", "files", "converter", "template")
+
+
+def list_hash(policy) -> str:
+    """列表元数据（Policy.to_dict 的输出）的哈希"""
+    raw = json.dumps(policy.to_dict(), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return content_hash(raw.encode("utf-8"))
+
+
+def list_changes(entry: Dict[str, Any], policy) -> Optional[Dict[str, List[Any]]]:
+    """比较列表元数据与清单记录
+
+    Args:
+        entry: 清单记录
+        policy: 本次列表中的政策
+
+    Returns:
+        None 表示未变化；否则为 {字段: [旧值, 新值]}（只列出清单中保存的字段，
+        其他字段如标签变化时为空字典）
+    """
+    fields = {}
+    for name in Manifest.POLICY_FIELDS:
+        old, new = entry.get(name), getattr(policy, name)
+        if old != new:
+            fields[name] = [old, new]
+
+    recorded = (entry.get("inputs") or {}).get("list")
+    if recorded:
+        return fields if recorded != list_hash(policy) else None
+    # 旧版本清单没有列表哈希，只比较保存的字段
+    return fields or None
+
+
+def detail_hash(data: Dict[str, Any]) -> str:
+    """详情数据（PolicyDetail.to_dict 的输出）的哈希，与字段顺序无关"""
+    raw = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return content_hash(raw.encode("utf-8"))
+
+
+def attachments_hash(attachments: Iterable) -> str:
+    """需要下载的附件列表的哈希（附件顺序和服务器路径）"""
+    return content_hash("\n".join(att.file_path for att in attachments).encode("utf-8"))
+
+
+def current_versions() -> Dict[str, int]:
+    """当前的转换器和模板版本"""
+    return {
+        "converter": DocumentConverter.VERSION,
+        "template": rag_markdown.TEMPLATE_VERSION,
+    }
+
+
+def _exists(output_dir: str, rel_path: Optional[str]) -> bool:
+    return bool(rel_path) and os.path.exists(f"{output_dir}/{rel_path}")
+
+
+def _size_matches(output_dir: str, record: Dict[str, Any]) -> bool:
+    """附件记录的本地文件大小是否与记录一致（压缩文件无法从大小判断，视为一致）"""
+    path = f"{output_dir}/{record.get('file')}"
+    if record.get("size") is None or path.endswith(ZstdCodec.SUFFIX):
+        return True
+    return os.path.exists(path) and os.path.getsize(path) == record["size"]
+
+
+def json_fresh(entry: Dict[str, Any], output_dir: str, detail: str) -> bool:
+    """JSON 是否无需重写（详情未变化且文件仍在）"""
+    inputs = entry.get("inputs") or {}
+    return inputs.get("detail") == detail and _exists(output_dir, entry.get("json"))
+
+
+def files_fresh(entry: Dict[str, Any], output_dir: str, attachments: str) -> bool:
+    """附件是否无需重新下载（附件列表未变化、上次全部下载成功且文件仍在，大小与附件记录一致）"""
+    inputs = entry.get("inputs") or {}
+    files = entry.get("files") or []
+    return (
+        bool(inputs.get("attachments"))
+        and inputs.get("attachments") == attachments
+        and len(inputs.get("files") or []) == len(files)
+        and all(_exists(output_dir, path) for path in files)
+        and all(_size_matches(output_dir, record) for record in entry.get("attachments") or [])
+    )
+
+
+def markdown_fresh(entry: Dict[str, Any], output_dir: str, inputs: Dict[str, Any]) -> bool:
+    """Markdown 是否无需重新生成（依赖的输入全部未变化且文件仍在）"""
+    previous = entry.get("inputs") or {}
+    return (
+        _exists(output_dir, entry.get("markdown"))
+        and all(previous.get(key) == inputs.get(key) for key in MARKDOWN_INPUTS)
+    )
+
+
+def missing_outputs(entry: Dict[str, Any], output_dir: str, stages: Iterable[str]) -> List[str]:
+    """清单记录中缺失或上次未完成的输出阶段（只检查文件是否存在，不读取内容）
+
+    Args:
+        entry: 清单记录
+        output_dir: 输出根目录
+        stages: 当前配置启用的阶段（json / files / markdown）
+
+    Returns:
+        缺失的阶段，按 STAGES 顺序
+    """
+    inputs = entry.get("inputs") or {}
+    missing = []
+    for stage in STAGES:
+        if stage not in stages:
+            continue
+        if stage == "files":
+            # 上次有附件下载失败时 attachments 记录为空字符串
+            if inputs.get("attachments") == "" or not all(
+                _exists(output_dir, path) for path in entry.get("files") or []
+            ):
+                missing.append(stage)
+        elif not _exists(output_dir, entry.get(stage)):
+            missing.append(stage)
+    return missing
+
+
+def stale_reasons(entry: Dict[str, Any], output_dir: str, verify: bool = False) -> Dict[str, str]:
+    """离线检查清单记录中哪些输出已过期
+
+    Args:
+        entry: 清单记录
+        output_dir: 输出根目录
+        verify: 重新计算JSON和附件的哈希（读取全部文件，较慢）
+
+    Returns:
+        {阶段: 原因}，不包含未过期的阶段
+    """
+    reasons: Dict[str, str] = {}
+    inputs = entry.get("inputs") or {}
+
+    if entry.get("json"):
+        if not _exists(output_dir, entry["json"]):
+            reasons["json"] = "文件缺失"
+        elif not inputs.get("detail"):
+            reasons["json"] = "无输入记录"
+        elif verify:
+            data = FileHandler.read_json(f"{output_dir}/{entry['json']}")
+            if not isinstance(data, dict) or detail_hash(data) != inputs["detail"]:
+                reasons["json"] = "内容与记录不符"
+
+    files = entry.get("files") or []
+    if files:
+        hashes: List[str] = inputs.get("files") or []
+        if not all(_exists(output_dir, path) for path in files):
+            reasons["files"] = "文件缺失"
+        elif len(hashes) != len(files):
+            reasons["files"] = "无输入记录"
+        elif verify:
+            for path, expected in zip(files, hashes):
+                content = FileHandler.read_bytes(f"{output_dir}/{path}")
+                if content is None or content_hash(content) != expected:
+                    reasons["files"] = "内容与记录不符"
+                    break
+
+    if entry.get("markdown"):
+        versions = current_versions()
+        if not _exists(output_dir, entry["markdown"]):
+            reasons["markdown"] = "文件缺失"
+        elif not all(key in inputs for key in MARKDOWN_INPUTS):
+            reasons["markdown"] = "无输入记录"
+        elif inputs.get("converter") != versions["converter"]:
+            reasons["markdown"] = "转换器已更新"
+        elif inputs.get("template") != versions["template"]:
+            reasons["markdown"] = "模板已更新"
+        elif "json" in reasons or "files" in reasons:
+            reasons["markdown"] = "输入已变化"
+    return reasons
+
+
+def status(manifest, verify: bool = False) -> Dict[str, Any]:
+    """统计输出目录中各阶段的过期情况
+
+    Args:
+        manifest: 输出清单
+        verify: 重新计算JSON和附件的哈希
+
+    Returns:
+        {"total", "stages": {阶段: {"total", "stale", "reasons": {原因: 数量}}}, "stale_ids": {阶段: [ID]}}
+    """
+    report = {
+        "total": 0,
+        "stages": {stage: {"total": 0, "stale": 0, "reasons": {}} for stage in STAGES},
+        "stale_ids": {stage: [] for stage in STAGES},
+    }
+    for entry in manifest.entries():
+        report["total"] += 1
+        reasons = stale_reasons(entry, manifest.output_dir, verify=verify)
+        for stage in STAGES:
+            if not entry.get(stage):
+                continue
+            stage_report = report["stages"][stage]
+            stage_report["total"] += 1
+            reason = reasons.get(stage)
+            if reason:
+                stage_report["stale"] += 1
+                stage_report["reasons"][reason] = stage_report["reasons"].get(reason, 0) + 1
+                report["stale_ids"][stage].append(entry["id"])
+    return report
@@ -0,0 +1,183 @@
+"""
+HTTP响应缓存模块 - 磁盘缓存、条件请求重新验证、按接口设置有效期
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from typing import Any, Dict, Optional
+
+from .writer import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(data: bytes) -> str:
+    """响应内容的哈希（服务器不提供 ETag / Last-Modified 时作为验证器）"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class CacheEntry:
+    """一条缓存记录"""
+
+    __slots__ = ("body", "etag", "last_modified", "content_hash", "stored_at", "ttl")
+
+    def __init__(
+        self,
+        body: bytes,
+        etag: str = "",
+        last_modified: str = "",
+        content_hash: str = "",
+        stored_at: float = 0.0,
+        ttl: float = 0.0
+    ):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content_hash = content_hash
+        self.stored_at = stored_at
+        self.ttl = ttl
+
+    @property
+    def fresh(self) -> bool:
+        """是否仍在有效期内（有效期内直接使用，不发请求）"""
+        return time.time() - self.stored_at < self.ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """条件请求头（服务器支持时返回 304 Not Modified）"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """磁盘HTTP响应缓存
+
+    每条记录保存为两个文件：响应内容 <key>.body 和元数据 <key>.json
+    （ETag、Last-Modified、内容哈希、保存时间），按接口和键前两位分目录。
+    两个文件都通过临时文件 + os.replace 原子写入，读取时校验内容哈希，
+    多个线程或进程同时读写时只会读到完整的旧记录、完整的新记录或未命中。
+    """
+
+    DEFAULT_TTLS = {
+        "search": 3600,  # 列表会出现新发布的政策
+        "detail": 86400,
+        "download": 30 * 86400,  # 附件发布后基本不变
+    }
+
+    def __init__(self, cache_dir: str, ttls: Optional[Dict[str, float]] = None):
+        """初始化
+
+        Args:
+            cache_dir: 缓存目录
+            ttls: 各接口的有效期（秒），0 表示每次都重新验证
+        """
+        self.cache_dir = cache_dir
+        self.ttls = dict(self.DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+
+    @staticmethod
+    def make_key(url: str, params: Any = None) -> str:
+        """根据URL和请求参数生成缓存键"""
+        raw = url
+        if params is not None:
+            raw += "\n" + json.dumps(params, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, endpoint: str, key: str):
+        directory = os.path.join(self.cache_dir, endpoint, key[:2])
+        return os.path.join(directory, f"{key}.body"), os.path.join(directory, f"{key}.json")
+
+    def get(self, endpoint: str, key: str) -> Optional[CacheEntry]:
+        """读取缓存记录（不论是否过期），不存在或不完整时返回None"""
+        body_path, meta_path = self._paths(endpoint, key)
+        try:
+            with open(meta_path, "rb") as f:
+                meta = json.loads(f.read())
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict) or meta.get("content_hash") != content_hash(body):
+            # 元数据和内容不匹配（另一个进程正在写入），视为未命中
+            return None
+        return CacheEntry(
+            body,
+            etag=meta.get("etag", ""),
+            last_modified=meta.get("last_modified", ""),
+            content_hash=meta["content_hash"],
+            stored_at=meta.get("stored_at", 0.0),
+            ttl=self.ttls.get(endpoint, 0),
+        )
+
+    def put(self, endpoint: str, key: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> Optional[CacheEntry]:
+        """保存响应（先写内容再写元数据）
+
+        Args:
+            endpoint: 接口名
+            key: 缓存键
+            body: 响应内容
+            headers: 响应头（读取 ETag / Last-Modified）
+
+        Returns:
+            新的缓存记录，写入失败时返回None
+        """
+        headers = headers or {}
+        entry = CacheEntry(
+            body,
+            etag=headers.get("ETag", "") or "",
+            last_modified=headers.get("Last-Modified", "") or "",
+            content_hash=content_hash(body),
+            stored_at=time.time(),
+            ttl=self.ttls.get(endpoint, 0),
+        )
+        body_path, meta_path = self._paths(endpoint, key)
+        try:
+            atomic_write_bytes(body_path, body, fsync=False)
+            self._write_meta(meta_path, entry)
+        except OSError as e:
+            # 缓存只是优化，写入失败（如 Windows 下文件正被读取）不影响爬取
+            logger.debug(f"缓存写入失败: {body_path}: {e}")
+            return None
+        return entry
+
+    def touch(self, endpoint: str, key: str, entry: CacheEntry):
+        """重新验证通过（304 或内容未变）后刷新保存时间"""
+        entry.stored_at = time.time()
+        _, meta_path = self._paths(endpoint, key)
+        try:
+            self._write_meta(meta_path, entry)
+        except OSError as e:
+            logger.debug(f"缓存写入失败: {meta_path}: {e}")
+
+    @staticmethod
+    def _write_meta(meta_path: str, entry: CacheEntry):
+        meta = {
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "content_hash": entry.content_hash,
+            "stored_at": entry.stored_at,
+        }
+        atomic_write_bytes(meta_path, json.dumps(meta).encode("utf-8"), fsync=False)
+
+
+def create_http_cache(config) -> Optional[HTTPCache]:
+    """根据配置创建HTTP缓存（未启用时返回None）
+
+    Args:
+        config: 配置对象（读取 http_cache、http_cache_dir、http_cache_ttl、output_dir）
+
+    Returns:
+        缓存对象
+    """
+    if not config.get("http_cache", False):
+        return None
+    cache_dir = config.get("http_cache_dir", "") or ".http_cache"
+    if not os.path.isabs(cache_dir):
+        cache_dir = os.path.join(config.output_dir, cache_dir)
+    return HTTPCache(cache_dir, ttls=config.get("http_cache_ttl") or {})
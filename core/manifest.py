@@ -0,0 +1,338 @@
+"""
+输出清单模块 - 输出目录布局与 政策ID → 文件路径 映射
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .writer import AsyncFileWriter, atomic_write_bytes
+from . import codec
+from utils.file_handler import FileHandler
+from utils.compression import ZstdCodec
+
+logger = logging.getLogger(__name__)
+
+
+class OutputLayout:
+    """输出目录布局
+
+    - flat: 所有文件直接放在 json/、files/、markdown/ 下（默认，兼容旧版本）
+    - hash: 按政策ID哈希前两位分片，如 json/3f/policy_{id}.json
+    - type_year: 按政策类型和通过年份分片，如 markdown/1/2023/0001_xxx.md
+    """
+
+    MODES = ("flat", "hash", "type_year")
+
+    def __init__(self, output_dir: str, mode: str = "flat"):
+        """初始化布局
+
+        Args:
+            output_dir: 输出根目录
+            mode: 布局模式
+        """
+        if mode not in self.MODES:
+            logger.warning(f"[警告] 未知的输出布局: {mode}，使用 flat")
+            mode = "flat"
+        self.output_dir = output_dir
+        self.mode = mode
+
+    def shard(self, policy_id: str, law_rule_type: Any = "", pass_date: str = "") -> str:
+        """计算分片子目录（相对路径，flat 模式为空）"""
+        if self.mode == "hash":
+            return hashlib.sha1(policy_id.encode('utf-8')).hexdigest()[:2]
+        if self.mode == "type_year":
+            year = (pass_date or "")[:4]
+            if not year.isdigit():
+                year = "unknown"
+            return f"{law_rule_type or 0}/{year}"
+        return ""
+
+    def relative_path(self, kind: str, policy, filename: str) -> str:
+        """计算相对于输出根目录的路径
+
+        Args:
+            kind: json / files / markdown
+            policy: 政策对象
+            filename: 文件名
+        """
+        shard = self.shard(policy.id, policy.law_rule_type, policy.pass_date)
+        if shard:
+            return f"{kind}/{shard}/{filename}"
+        return f"{kind}/{filename}"
+
+    def absolute_path(self, relative_path: str) -> str:
+        """相对路径转为输出目录下的完整路径"""
+        return f"{self.output_dir}/{relative_path}"
+
+    def to_relative(self, path: str) -> str:
+        """输出目录下的完整路径转为相对路径"""
+        prefix = f"{self.output_dir}/"
+        if path.startswith(prefix):
+            return path[len(prefix):]
+        return os.path.relpath(path, self.output_dir).replace(os.sep, '/')
+
+
+class Manifest:
+    """输出清单
+
+    以追加写入的 JSON Lines 文件保存每个政策的元数据和输出文件路径，
+    同一政策的后续记录覆盖之前的字段。GUI、CLI 和重新处理命令通过
+    清单定位文件，而不必反复 os.listdir 大目录。文件中的记录数远多于
+    政策数时，close() 将其压缩为每个政策一行。
+    """
+
+    FILENAME = "manifest.jsonl"
+
+    # 记录数超过政策数的倍数（且不少于最小记录数）时自动压缩
+    AUTO_COMPACT_RATIO = 3
+    AUTO_COMPACT_MIN_RECORDS = 1000
+
+    # 清单中保存的政策元数据字段
+    POLICY_FIELDS = (
+        "title", "office", "pass_date", "law_rule_type",
+        "timeliness", "file_type", "formulate_mode",
+    )
+
+    def __init__(self, output_dir: str, writer: Optional[AsyncFileWriter] = None):
+        """初始化清单
+
+        Args:
+            output_dir: 输出根目录
+            writer: 异步写入器（为空时同步追加）
+        """
+        self.output_dir = output_dir
+        self.path = f"{output_dir}/{self.FILENAME}"
+        self.writer = writer
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._records = 0  # 清单文件中的记录行数
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> int:
+        """从磁盘加载清单
+
+        Returns:
+            加载的政策数
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+        records = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = codec.loads(line)
+                    except ValueError:
+                        # 崩溃时最后一行可能不完整，跳过
+                        continue
+                    policy_id = record.get("id")
+                    if policy_id:
+                        entries.setdefault(policy_id, {}).update(record)
+                        records += 1
+        with self._lock:
+            self._entries = entries
+            self._records = records
+        return len(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, policy_id: str) -> bool:
+        return policy_id in self._entries
+
+    def get(self, policy_id: str) -> Optional[Dict[str, Any]]:
+        """获取政策的清单记录"""
+        entry = self._entries.get(policy_id)
+        return dict(entry) if entry else None
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """所有清单记录（副本）"""
+        with self._lock:
+            return [dict(entry) for entry in self._entries.values()]
+
+    def update(self, policy_id: str, **fields):
+        """合并更新政策记录并追加到清单文件
+
+        Args:
+            policy_id: 政策ID
+            **fields: 要更新的字段
+        """
+        record = {"id": policy_id}
+        record.update(fields)
+        with self._lock:
+            self._entries.setdefault(policy_id, {}).update(record)
+            self._records += 1
+        line = codec.encode_record(record)
+        if self.writer is not None:
+            self.writer.append_bytes(self.path, line)
+        else:
+            with self._lock:
+                os.makedirs(self.output_dir, exist_ok=True)
+                with open(self.path, 'ab') as f:
+                    f.write(line)
+
+    def record_policy(self, policy, **fields):
+        """记录政策元数据及输出路径"""
+        data = {name: getattr(policy, name) for name in self.POLICY_FIELDS}
+        data["updated_at"] = datetime.now().isoformat(timespec='seconds')
+        data.update(fields)
+        self.update(policy.id, **data)
+
+    def max_number(self, key: str) -> int:
+        """清单中记录的最大编号（如 markdown_number、file_number）"""
+        with self._lock:
+            numbers = [entry.get(key) or 0 for entry in self._entries.values()]
+        return max(numbers) if numbers else 0
+
+    def resolve(self, policy_id: str, kind: str) -> List[str]:
+        """解析政策某类输出文件的完整路径
+
+        Args:
+            policy_id: 政策ID
+            kind: json / markdown / files
+
+        Returns:
+            文件路径列表
+        """
+        entry = self._entries.get(policy_id) or {}
+        value = entry.get(kind)
+        if not value:
+            return []
+        paths = value if isinstance(value, list) else [value]
+        return [f"{self.output_dir}/{path}" for path in paths]
+
+    def compact(self):
+        """将清单重写为每个政策一行"""
+        with self._lock:
+            data = b''.join(codec.encode_record(entry) for entry in self._entries.values())
+            self._records = len(self._entries)
+        if self.writer is not None:
+            self.writer.flush()
+        atomic_write_bytes(self.path, data)
+
+    def needs_compact(self) -> bool:
+        """清单文件中的记录数是否远多于政策数"""
+        with self._lock:
+            records, entries = self._records, len(self._entries)
+        return records >= self.AUTO_COMPACT_MIN_RECORDS and records > entries * self.AUTO_COMPACT_RATIO
+
+    def close(self):
+        """结束写入（记录数远多于政策数时压缩清单）"""
+        if not self.needs_compact():
+            return
+        records = self._records
+        try:
+            self.compact()
+        except OSError as e:
+            logger.warning(f"[警告] 清单压缩失败: {e}")
+            return
+        logger.info(f"[清单] 已压缩: {records} 条记录 → {len(self)} 条政策")
+
+    def rebuild(self) -> int:
+        """扫描现有输出目录重建清单（用于旧版本的平铺目录）
+
+        Returns:
+            重建后的政策数
+        """
+        entries: Dict[str, Dict[str, Any]] = {}
+
+        # 1. JSON数据：policy_{id}.json
+        for rel_path in self._walk("json"):
+            filename = _strip_suffix(os.path.basename(rel_path))
+            if not (filename.startswith("policy_") and filename.endswith(".json")):
+                continue
+            policy_id = filename[len("policy_"):-len(".json")]
+            entry = entries.setdefault(policy_id, {"id": policy_id})
+            entry["json"] = rel_path
+            try:
+                with FileHandler.open_text(f"{self.output_dir}/{rel_path}") as f:
+                    policy_data = json.load(f).get("policy", {})
+                for name in self.POLICY_FIELDS:
+                    if name in policy_data:
+                        entry[name] = policy_data[name]
+            except Exception as e:
+                logger.warning(f"[警告] 读取JSON失败: {rel_path}: {e}")
+
+        # 2. Markdown：从 front matter 读取 policy_id
+        for rel_path in self._walk("markdown"):
+            if not _strip_suffix(rel_path).endswith(".md"):
+                continue
+            policy_id = self._read_front_matter_id(f"{self.output_dir}/{rel_path}")
+            if not policy_id:
+                continue
+            entry = entries.setdefault(policy_id, {"id": policy_id})
+            entry["markdown"] = rel_path
+            number = os.path.basename(rel_path).split('_', 1)[0]
+            if number.isdigit():
+                entry["markdown_number"] = int(number)
+
+        # 3. 附件：{编号}_{政策名称}... 按政策名称前缀匹配
+        by_title = {}
+        for policy_id, entry in entries.items():
+            title = entry.get("title")
+            if title:
+                by_title.setdefault(safe_filename(title, policy_id), policy_id)
+        titles = sorted(by_title, key=len, reverse=True)
+        for rel_path in self._walk("files"):
+            parts = os.path.basename(rel_path).split('_', 1)
+            if len(parts) < 2 or not parts[0].isdigit():
+                continue
+            for title in titles:
+                if parts[1].startswith(title):
+                    entry = entries[by_title[title]]
+                    entry.setdefault("files", []).append(rel_path)
+                    entry["file_number"] = int(parts[0])
+                    break
+
+        with self._lock:
+            self._entries = entries
+        self.compact()
+        return len(entries)
+
+    def _walk(self, kind: str) -> List[str]:
+        """列出某类输出目录（含分片子目录）下的文件相对路径"""
+        root = f"{self.output_dir}/{kind}"
+        result = []
+        for dirpath, _, filenames in os.walk(root):
+            rel_dir = os.path.relpath(dirpath, self.output_dir).replace(os.sep, '/')
+            for filename in filenames:
+                if filename.endswith(".tmp") or filename == ZstdCodec.DICT_FILENAME:
+                    continue
+                result.append(f"{rel_dir}/{filename}")
+        return result
+
+    @staticmethod
+    def _read_front_matter_id(filepath: str) -> Optional[str]:
+        """从Markdown的YAML front matter中读取policy_id"""
+        try:
+            with FileHandler.open_text(filepath) as f:
+                for i, line in enumerate(f):
+                    if i > 30:
+                        break
+                    if line.startswith('policy_id:'):
+                        return line.split(':', 1)[1].strip().strip('"')
+        except Exception:
+            pass
+        return None
+
+
+def safe_filename(title: str, policy_id: str) -> str:
+    """生成用于文件命名的安全政策名称"""
+    safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
+    if not safe_title:
+        safe_title = f"政策_{policy_id[:8]}"
+    return safe_title
+
+
+def _strip_suffix(filename: str) -> str:
+    """去掉压缩后缀"""
+    if filename.endswith(ZstdCodec.SUFFIX):
+        return filename[:-len(ZstdCodec.SUFFIX)]
+    return filename
@@ -0,0 +1,366 @@
+"""
+监控指标模块 - 计数器/仪表/直方图，Prometheus 文本格式输出
+"""
+
+import os
+import bisect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Prometheus 文本格式的 Content-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 默认直方图分桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    """转义标签值"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """指标基类（按标签值分组保存，线程安全）"""
+
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 需要标签 {self.labelnames}，实际为 {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """生成该指标的文本格式"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.TYPE}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines) + "\n"
+
+
+class Counter(_Metric):
+    """只增计数器"""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        """增加计数"""
+        if amount < 0:
+            raise ValueError("计数器只能增加")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        """当前值"""
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """可增可减的仪表（也可在输出时调用函数取值）"""
+
+    TYPE = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._function = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function):
+        """输出时调用 function() 取值（仅限无标签的仪表，传 None 取消）"""
+        self._function = function
+
+    def get(self, **labels) -> float:
+        if self._function is not None and not labels:
+            return self._function()
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        function = self._function
+        if function is not None:
+            try:
+                return [f"{self.name} {_format_value(function())}"]
+            except Exception:
+                return []
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """直方图（累计分桶计数 + 总和 + 次数）"""
+
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 标签值 -> [各分桶计数..., 总和, 次数]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        """记录一次观测值"""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = [0] * (len(self.buckets) + 2)
+                self._values[key] = data
+            if index < len(self.buckets):
+                data[index] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(data)) for key, data in self._values.items())
+        lines = []
+        for key, data in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, data):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key, ("le", "+Inf"))
+            lines.append(f"{self.name}_bucket{labels} {_format_value(data[-1])}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(data[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(data[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"指标 {name} 已注册为 {metric.TYPE}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """获取或创建计数器"""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """获取或创建仪表"""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """获取或创建直方图"""
+        return self._register(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self) -> str:
+        """生成所有指标的 Prometheus 文本格式"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(metric.render() for metric in metrics)
+
+    def write_file(self, path: str):
+        """原子写入 .prom 文件（可供 node_exporter textfile collector 读取）"""
+        from .writer import atomic_write_bytes
+        atomic_write_bytes(path, self.render().encode('utf-8'), fsync=False)
+
+
+# 默认注册表和爬虫使用的指标
+REGISTRY = MetricsRegistry()
+
+REQUESTS = REGISTRY.counter(
+    "gdlaw_requests_total", "HTTP请求次数（按接口和状态）", ("endpoint", "status"))
+REQUEST_SECONDS = REGISTRY.histogram(
+    "gdlaw_request_duration_seconds", "HTTP请求耗时", ("endpoint",))
+RETRIES = REGISTRY.counter(
+    "gdlaw_retries_total", "重试次数", ("endpoint",))
+RATE_LIMITS = REGISTRY.counter(
+    "gdlaw_rate_limits_total", "触发限流次数")
+RATE_LIMIT_WAIT = REGISTRY.counter(
+    "gdlaw_rate_limit_wait_seconds_total", "限流等待总时长")
+DOWNLOADED_BYTES = REGISTRY.counter(
+    "gdlaw_downloaded_bytes_total", "下载字节数", ("endpoint",))
+HTTP_CACHE = REGISTRY.counter(
+    "gdlaw_http_cache_total", "HTTP缓存查询次数（按接口和结果）", ("endpoint", "result"))
+FAILURES = REGISTRY.counter(
+    "gdlaw_failures_total", "失败次数（按阶段和类别）", ("stage", "category"))
+STAGES_SKIPPED = REGISTRY.counter(
+    "gdlaw_stages_skipped_total", "输入未变化而跳过的输出阶段数", ("stage",))
+POLICIES = REGISTRY.counter(
+    "gdlaw_policies_total", "处理完成的政策数（最终失败数 = failed - recovered）", ("result",))
+CONVERSIONS = REGISTRY.counter(
+    "gdlaw_conversions_total", "文档转换次数", ("format", "result"))
+CONVERSION_SECONDS = REGISTRY.histogram(
+    "gdlaw_conversion_duration_seconds", "文档转换耗时", ("format",))
+WRITER_LATENCY = REGISTRY.histogram(
+    "gdlaw_writer_latency_seconds", "文件从提交到落盘的耗时",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+WRITER_BYTES = REGISTRY.counter(
+    "gdlaw_writer_bytes_total", "写入磁盘的字节数")
+WRITER_ERRORS = REGISTRY.counter(
+    "gdlaw_writer_errors_total", "文件写入失败次数")
+WRITER_QUEUE_DEPTH = REGISTRY.gauge(
+    "gdlaw_writer_queue_depth", "待写入的任务数")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self):
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 不把每次抓取写入日志
+        pass
+
+
+class MetricsExporter:
+    """指标导出：本地 HTTP 端点和/或定期写入 .prom 文件"""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry = REGISTRY,
+        port: int = 0,
+        host: str = "127.0.0.1",
+        file_path: str = "",
+        interval: float = 15.0
+    ):
+        """初始化
+
+        Args:
+            registry: 指标注册表
+            port: HTTP端口（0 表示不启动）
+            host: 监听地址
+            file_path: .prom 文件路径（为空表示不写文件）
+            interval: 写文件间隔（秒）
+        """
+        self.registry = registry
+        self.port = port
+        self.host = host
+        self.file_path = file_path
+        self.interval = max(1.0, interval)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        """启动导出线程"""
+        if self.port:
+            handler = type("MetricsHandler", (_MetricsHandler,), {"registry": self.registry})
+            try:
+                self._server = ThreadingHTTPServer((self.host, self.port), handler)
+                self._server.daemon_threads = True
+            except OSError as e:
+                logger.warning(f"[警告] 指标端口 {self.host}:{self.port} 启动失败: {e}")
+                self._server = None
+            else:
+                thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+                logger.info(f"指标端点: http://{self.host}:{self.port}/metrics")
+
+        if self.file_path:
+            directory = os.path.dirname(self.file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            thread = threading.Thread(target=self._dump_loop, name="MetricsDumper", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _dump_loop(self):
+        while not self._stop.wait(self.interval):
+            self._dump()
+
+    def _dump(self):
+        try:
+            self.registry.write_file(self.file_path)
+        except Exception as e:
+            logger.warning(f"[警告] 写入指标文件失败: {e}")
+
+    def stop(self):
+        """停止导出（写文件模式会在停止前最后写一次）"""
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+        if self.file_path:
+            self._dump()
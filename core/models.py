@@ -2,11 +2,35 @@
 数据模型定义
 """
 
-from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+import sys
+from dataclasses import dataclass, field, fields
+from typing import List, Dict, Iterable, Iterator, Optional, Any, Union
 from datetime import datetime
 
 
+def _slotted(cls):
+    """为dataclass添加__slots__（等价于 Python 3.10 的 dataclass(slots=True)）
+    
+    列表阶段会同时持有十万级 Policy 对象，去掉每个实例的 __dict__ 能显著降低内存。
+    """
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(f.name for f in fields(cls))
+    cls_dict['__slots__'] = field_names
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+def _intern(value: Any) -> Any:
+    """驻留取值有限的字符串字段（时效性、文件类型、制定机关等），相同取值共享一个对象"""
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+@_slotted
 @dataclass
 class Policy:
     """政策基本信息"""
@@ -40,16 +64,17 @@ class Policy:
         return cls(
             id=data.get("id", ""),
             title=data.get("title", ""),
-            office=data.get("officeVo", {}).get("groupName", ""),
+            office=_intern((data.get("officeVo") or {}).get("groupName", "")),
             pass_date=data.get("passDate", ""),
             law_rule_type=data.get("lawRuleType", 0),
-            formulate_mode=data.get("formulateMode", ""),
-            timeliness=data.get("timeliness", ""),
-            file_type=data.get("fileType", ""),
-            tag_names=data.get("tagNames", ""),
+            formulate_mode=_intern(data.get("formulateMode", "")),
+            timeliness=_intern(data.get("timeliness", "")),
+            file_type=_intern(data.get("fileType", "")),
+            tag_names=_intern(data.get("tagNames", "")),
         )
 
 
+@_slotted
 @dataclass
 class FileAttachment:
     """附件信息"""
@@ -76,11 +101,12 @@ class FileAttachment:
             id=data.get("id", ""),
             file_name=data.get("fileName", ""),
             file_path=data.get("filePath", ""),
-            file_ext=data.get("fileExt", ""),
-            file_class=data.get("fileClass", ""),
+            file_ext=_intern(data.get("fileExt", "")),
+            file_class=_intern(data.get("fileClass", "")),
         )
 
 
+@_slotted
 @dataclass
 class PolicyDetail:
     """政策详细信息"""
@@ -103,6 +129,62 @@ class PolicyDetail:
         }
 
 
+def _pack_id(policy_id: str) -> Union[bytes, str]:
+    """UUID格式的ID压缩为16字节，其他ID原样返回"""
+    if len(policy_id) == 36:
+        try:
+            packed = bytes.fromhex(policy_id.replace('-', ''))
+        except ValueError:
+            return policy_id
+        # 只有能无损还原（小写、标准分隔）时才压缩
+        if len(packed) == 16 and _unpack_id(packed) == policy_id:
+            return packed
+    return policy_id
+
+
+def _unpack_id(value: Union[bytes, str]) -> str:
+    """还原 _pack_id 压缩的ID"""
+    if isinstance(value, bytes):
+        h = value.hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+    return value
+
+
+class IdSet:
+    """紧凑的政策ID集合
+    
+    UUID字符串（36字符，约85字节）以16字节形式保存，适合记录十万级的已完成政策。
+    迭代时还原为原始字符串。
+    """
+    
+    __slots__ = ("_ids",)
+    
+    def __init__(self, ids: Iterable[str] = ()):
+        self._ids = set()
+        for policy_id in ids:
+            self.add(policy_id)
+    
+    def add(self, policy_id: str):
+        """添加ID"""
+        self._ids.add(_pack_id(policy_id))
+    
+    def discard(self, policy_id: str):
+        """移除ID（不存在时忽略）"""
+        self._ids.discard(_pack_id(policy_id))
+    
+    def __contains__(self, policy_id: object) -> bool:
+        return isinstance(policy_id, str) and _pack_id(policy_id) in self._ids
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __iter__(self) -> Iterator[str]:
+        return (_unpack_id(value) for value in self._ids)
+    
+    def __repr__(self) -> str:
+        return f"IdSet({len(self._ids)} ids)"
+
+
 @dataclass
 class CrawlProgress:
     """爬取进度"""
@@ -113,7 +195,8 @@ class CrawlProgress:
     current_policy_title: str = ""
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
-    completed_policies: List[str] = field(default_factory=list)
+    write_queue_depth: int = 0
+    completed_policies: IdSet = field(default_factory=IdSet)
     failed_policies: List[Dict[str, str]] = field(default_factory=list)
     
     @property
@@ -138,9 +221,13 @@ class CrawlProgress:
         end = self.end_time or datetime.now()
         return (end - self.start_time).total_seconds()
     
-    def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        return {
+    def to_dict(self, include_ids: bool = False) -> Dict[str, Any]:
+        """转换为字典
+        
+        Args:
+            include_ids: 是否包含已完成政策的ID列表（数量大时开销明显，默认不包含）
+        """
+        data = {
             "total_count": self.total_count,
             "completed_count": self.completed_count,
             "failed_count": self.failed_count,
@@ -148,10 +235,13 @@ class CrawlProgress:
             "current_policy_title": self.current_policy_title,
             "start_time": self.start_time.isoformat() if self.start_time else None,
             "end_time": self.end_time.isoformat() if self.end_time else None,
-            "completed_policies": self.completed_policies,
+            "write_queue_depth": self.write_queue_depth,
             "failed_policies": self.failed_policies,
             "success_rate": self.success_rate,
             "progress_percentage": self.progress_percentage,
             "elapsed_time": self.elapsed_time,
         }
+        if include_ids:
+            data["completed_policies"] = list(self.completed_policies)
+        return data
 
@@ -0,0 +1,656 @@
+"""
+性能分析模块 - cProfile 确定性分析 / 采样分析（火焰图）/ tracemalloc 内存诊断
+"""
+
+import gc
+import io
+import os
+import sys
+import time
+import pstats
+import cProfile
+import logging
+import sysconfig
+import threading
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import codec
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    # Windows
+    RESOURCE_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class Profiler:
+    """爬取过程性能分析器
+
+    - cprofile: 确定性分析。当前线程和之后启动的所有线程（爬取、写入、
+      下载线程）各自使用一个 cProfile.Profile，结束时合并为一个 .pstats
+      文件（Python 3.12+ 的 cProfile 本身覆盖所有线程，只用一个实例）。
+    - sample: 墙钟采样。后台线程按固定间隔读取所有线程的调用栈，输出
+      collapsed-stack 格式（可直接用 flamegraph.pl / speedscope 查看）。
+
+    两种模式都会额外输出一个文本摘要，按第三方包（pypdf、docx、requests、
+    json 等）和函数汇总耗时。
+    """
+
+    MODES = ("cprofile", "sample")
+
+    def __init__(
+        self,
+        mode: str,
+        output_dir: str,
+        interval: float = 0.005,
+        include_current_thread: bool = True
+    ):
+        """初始化
+
+        Args:
+            mode: cprofile / sample
+            output_dir: 输出目录
+            interval: 采样间隔（秒，仅 sample 模式）
+            include_current_thread: 是否分析调用 start() 的线程（GUI主线程传False）
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"未知的性能分析模式: {mode}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.interval = max(0.001, interval)
+        self.include_current_thread = include_current_thread
+
+        self._lock = threading.Lock()
+        self._running = False
+        self._started = 0.0
+        self._starter_ident = 0
+
+        # cprofile 模式
+        self._profiles: List[cProfile.Profile] = []
+        self._current_profile: Optional[cProfile.Profile] = None
+
+        # sample 模式
+        self._stacks: Counter = Counter()
+        self._sample_count = 0
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        """开始分析"""
+        if self._running:
+            return
+        self._running = True
+        self._started = time.monotonic()
+        self._starter_ident = threading.get_ident()
+
+        if self.mode == "cprofile":
+            if sys.version_info >= (3, 12):
+                # 3.12+ 基于 sys.monitoring，一个实例即覆盖所有线程
+                self._current_profile = cProfile.Profile()
+                self._profiles.append(self._current_profile)
+                self._current_profile.enable()
+            else:
+                threading.setprofile(self._thread_hook)
+                if self.include_current_thread:
+                    self._current_profile = cProfile.Profile()
+                    self._profiles.append(self._current_profile)
+                    self._current_profile.enable()
+        else:
+            self._stop_event.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name="Profiler", daemon=True)
+            self._sampler.start()
+
+        logger.info(f"[性能分析] 已启动（{self.mode}）")
+
+    def _thread_hook(self, frame, event, arg):
+        """新线程的第一个事件：为该线程创建并启用 cProfile"""
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        with self._lock:
+            if not self._running:
+                return
+            self._profiles.append(profile)
+        profile.enable()
+
+    def _sample_loop(self):
+        """采样线程主循环"""
+        skip = {threading.get_ident()}
+        if not self.include_current_thread:
+            skip.add(self._starter_ident)
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident in skip:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                stack.reverse()
+                self._stacks[";".join(stack)] += 1
+            self._sample_count += 1
+
+    def stop(self) -> List[str]:
+        """停止分析并写出结果
+
+        Returns:
+            输出文件路径列表
+        """
+        if not self._running:
+            return []
+        elapsed = time.monotonic() - self._started
+
+        if self.mode == "cprofile":
+            if sys.version_info < (3, 12):
+                threading.setprofile(None)
+            with self._lock:
+                self._running = False
+                profiles = list(self._profiles)
+            if self._current_profile is not None:
+                self._current_profile.disable()
+        else:
+            self._stop_event.set()
+            if self._sampler is not None:
+                self._sampler.join()
+            self._running = False
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = os.path.join(self.output_dir, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+        if self.mode == "cprofile":
+            paths = self._write_cprofile(profiles, prefix, elapsed)
+        else:
+            paths = self._write_samples(prefix, elapsed)
+
+        for path in paths:
+            logger.info(f"[性能分析] 已输出: {path}")
+        return paths
+
+    def _write_cprofile(self, profiles: List[cProfile.Profile], prefix: str, elapsed: float) -> List[str]:
+        """合并各线程的分析结果并输出 .pstats 和摘要"""
+        stats = None
+        for profile in profiles:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profile)
+                else:
+                    stats.add(profile)
+            except TypeError:
+                # 线程未产生任何调用记录
+                continue
+        if stats is None:
+            return []
+
+        pstats_path = f"{prefix}.pstats"
+        stats.dump_stats(pstats_path)
+
+        # 按包汇总自身耗时
+        package_time: Dict[str, float] = {}
+        for (filename, _, _), (_, _, self_time, _, _) in stats.stats.items():
+            package = _package_of(filename)
+            package_time[package] = package_time.get(package, 0.0) + self_time
+
+        out = io.StringIO()
+        out.write(f"模式: cprofile  线程数: {len(profiles)}  运行时长: {elapsed:.1f}s\n\n")
+        out.write("按包汇总（自身耗时，秒）:\n")
+        for package, seconds in sorted(package_time.items(), key=lambda item: item[1], reverse=True)[:25]:
+            out.write(f"  {seconds:10.3f}  {package}\n")
+        out.write("\n")
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(50)
+        stats.sort_stats("tottime").print_stats(30)
+
+        summary_path = f"{prefix}.txt"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(out.getvalue())
+        return [pstats_path, summary_path]
+
+    def _write_samples(self, prefix: str, elapsed: float) -> List[str]:
+        """输出 collapsed-stack 文件和摘要"""
+        collapsed_path = f"{prefix}.collapsed"
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        # 叶子函数（自身）和包的采样数
+        leaf_counts: Counter = Counter()
+        package_counts: Counter = Counter()
+        total = 0
+        for stack, count in self._stacks.items():
+            leaf = stack.rsplit(";", 1)[-1]
+            leaf_counts[leaf] += count
+            package_counts[_package_of(_leaf_path(leaf))] += count
+            total += count
+
+        lines = [
+            f"模式: sample  间隔: {self.interval * 1000:.1f}ms  采样轮数: {self._sample_count}  运行时长: {elapsed:.1f}s",
+            "（墙钟采样：等待网络、磁盘和锁的时间也计入）",
+            "",
+            "按包汇总（叶子帧采样占比）:",
+        ]
+        for package, count in package_counts.most_common(25):
+            lines.append(f"  {count / max(1, total) * 100:6.1f}%  {package}")
+        lines.append("")
+        lines.append("叶子函数:")
+        for leaf, count in leaf_counts.most_common(40):
+            lines.append(f"  {count / max(1, total) * 100:6.1f}%  {leaf}")
+
+        summary_path = f"{prefix}.txt"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        return [collapsed_path, summary_path]
+
+
+_STDLIB_DIR = sysconfig.get_paths().get("stdlib", "").replace("\\", "/").rstrip("/") + "/"
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))).replace("\\", "/").rstrip("/") + "/"
+
+
+def _short_path(filename: str) -> str:
+    """缩短文件路径（site-packages 之后的部分、stdlib/... 或项目内相对路径）"""
+    normalized = filename.replace("\\", "/")
+    for marker in ("site-packages/", "dist-packages/"):
+        index = normalized.rfind(marker)
+        if index >= 0:
+            return normalized[index + len(marker):]
+    if _STDLIB_DIR != "/" and normalized.startswith(_STDLIB_DIR):
+        return "stdlib/" + normalized[len(_STDLIB_DIR):]
+    if normalized.startswith(_PROJECT_DIR):
+        return normalized[len(_PROJECT_DIR):]
+    return normalized
+
+
+def _leaf_path(leaf: str) -> str:
+    """从 'func (path:line)' 中取出路径"""
+    if leaf.endswith(")") and "(" in leaf:
+        return leaf[leaf.rfind("(") + 1:-1].rsplit(":", 1)[0]
+    return leaf
+
+
+def _package_of(filename: str) -> str:
+    """文件所属的包（第三方包名 / stdlib / 项目模块 / 内置）"""
+    if filename.startswith("<") or filename == "~":
+        return "builtins"
+    path = _short_path(filename)
+    if path.startswith("stdlib/"):
+        return "stdlib:" + path[len("stdlib/"):].split("/", 1)[0].split(".", 1)[0]
+    top = path.split("/", 1)[0]
+    return top[:-3] if top.endswith(".py") else top
+
+
+def create_profiler(config, include_current_thread: bool = True) -> Optional[Profiler]:
+    """根据配置创建并启动性能分析器（profile 为空时返回None）
+
+    Args:
+        config: 配置对象（读取 profile、profile_interval、output_dir）
+        include_current_thread: 是否分析当前线程
+
+    Returns:
+        已启动的分析器
+    """
+    mode = config.get("profile", "") or ""
+    if not mode:
+        return None
+    if mode not in Profiler.MODES:
+        logger.warning(f"[警告] 未知的性能分析模式: {mode}，已忽略")
+        return None
+    profiler = Profiler(
+        mode,
+        config.output_dir,
+        interval=config.get("profile_interval", 0.005),
+        include_current_thread=include_current_thread
+    )
+    profiler.start()
+    return profiler
+
+
+def current_rss() -> Optional[int]:
+    """当前进程常驻内存（字节），无法获取时返回None"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def peak_rss() -> Optional[int]:
+    """进程常驻内存峰值（字节），无法获取时返回None"""
+    if RESOURCE_AVAILABLE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 单位为字节，Linux 为 KB
+        return peak if sys.platform == "darwin" else peak * 1024
+    if PSUTIL_AVAILABLE:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    return None
+
+
+def _format_bytes(size: Optional[float]) -> str:
+    if size is None:
+        return "-"
+    sign = "-" if size < 0 else ""
+    size = abs(size)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{sign}{size:.0f}{unit}" if unit == "B" else f"{sign}{size:.1f}{unit}"
+        size /= 1024
+    return f"{sign}{size:.2f}GB"
+
+
+class MemoryProfiler:
+    """内存诊断（tracemalloc 快照）
+
+    在各阶段边界（列表获取完成、每处理 N 条政策、爬取结束）调用
+    checkpoint() 拍摄快照，与上一个快照比较，记录按代码行汇总的分配
+    增长 Top N、tracemalloc 当前/峰值和进程 RSS。stop() 时再与起始快照
+    比较一次，报告写入输出目录的 memory_<时间>.txt（另有 .json 便于对比）。
+    """
+
+    def __init__(self, output_dir: str, top: int = 20, frames: int = 1):
+        """初始化
+
+        Args:
+            output_dir: 输出目录
+            top: 每个检查点列出的分配增长条数
+            frames: 每次分配记录的调用栈深度（越深越慢）
+        """
+        self.output_dir = output_dir
+        self.top = max(1, top)
+        self.frames = max(1, frames)
+        self._lock = threading.Lock()
+        self._running = False
+        self._started_tracing = False
+        self._started = 0.0
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self.checkpoints: List[Dict[str, Any]] = []
+
+    def start(self):
+        """开始记录分配并拍摄起始快照"""
+        if self._running:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self._running = True
+        self._started = time.monotonic()
+        self._baseline = self._previous = self._take_snapshot()
+        logger.info(f"[内存诊断] 已启动（调用栈深度 {self.frames}）")
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        gc.collect()
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def checkpoint(self, label: str) -> Optional[Dict[str, Any]]:
+        """拍摄快照并记录与上一个检查点的差异
+
+        Args:
+            label: 检查点名称（如 "列表获取完成"、"已处理 500 条"）
+
+        Returns:
+            检查点记录（未启动时返回None）
+        """
+        with self._lock:
+            if not self._running:
+                return None
+            snapshot = self._take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            top = self._diff(snapshot, self._previous)
+            self._previous = snapshot
+            record = {
+                "label": label,
+                "elapsed": round(time.monotonic() - self._started, 3),
+                "traced_current": current,
+                "traced_peak": peak,
+                "rss": current_rss(),
+                "peak_rss": peak_rss(),
+                "top": top,
+            }
+            self.checkpoints.append(record)
+        logger.info(
+            f"[内存诊断] {label}: 已分配 {_format_bytes(current)}，峰值 {_format_bytes(peak)}，"
+            f"RSS {_format_bytes(record['rss'])}"
+        )
+        return record
+
+    def _diff(self, snapshot: tracemalloc.Snapshot, previous: Optional[tracemalloc.Snapshot]) -> List[Dict[str, Any]]:
+        """按代码行比较两个快照，返回增长最多的分配"""
+        if previous is None:
+            return []
+        stats = snapshot.compare_to(previous, "lineno")
+        stats.sort(key=lambda stat: stat.size_diff, reverse=True)
+        top = []
+        for stat in stats[:self.top]:
+            if stat.size_diff <= 0:
+                break
+            frame = stat.traceback[0]
+            top.append({
+                "location": f"{_short_path(frame.filename)}:{frame.lineno}",
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff,
+                "size": stat.size,
+            })
+        return top
+
+    def stop(self) -> List[str]:
+        """拍摄最终快照、写出报告并停止记录
+
+        Returns:
+            输出文件路径列表
+        """
+        if not self._running:
+            return []
+        self.checkpoint("结束")
+        with self._lock:
+            self._running = False
+            final = self._previous
+            overall = self._diff(final, self._baseline) if final is not None else []
+            self._baseline = self._previous = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = os.path.join(self.output_dir, f"memory_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+        lines = [
+            f"内存诊断报告  检查点: {len(self.checkpoints)}  进程RSS峰值: {_format_bytes(peak_rss())}",
+            "",
+            f"{'检查点':<24}{'用时(s)':>10}{'已分配':>12}{'分配峰值':>12}{'RSS':>12}{'RSS峰值':>12}",
+        ]
+        for record in self.checkpoints:
+            lines.append(
+                f"{record['label']:<24}{record['elapsed']:>10.1f}"
+                f"{_format_bytes(record['traced_current']):>12}{_format_bytes(record['traced_peak']):>12}"
+                f"{_format_bytes(record['rss']):>12}{_format_bytes(record['peak_rss']):>12}"
+            )
+        lines.append("")
+        lines.append("从开始到结束仍未释放的分配增长（按代码行）:")
+        lines.extend(self._format_top(overall))
+        for record in self.checkpoints:
+            if not record["top"]:
+                continue
+            lines.append("")
+            lines.append(f"[{record['label']}] 相比上一个检查点的分配增长:")
+            lines.extend(self._format_top(record["top"]))
+
+        report_path = f"{prefix}.txt"
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+        json_path = f"{prefix}.json"
+        with open(json_path, 'wb') as f:
+            f.write(codec.dumps({"checkpoints": self.checkpoints, "overall": overall}, indent=True))
+
+        for path in (report_path, json_path):
+            logger.info(f"[内存诊断] 已输出: {path}")
+        return [report_path, json_path]
+
+    @staticmethod
+    def _format_top(top: List[Dict[str, Any]]) -> List[str]:
+        if not top:
+            return ["  （无）"]
+        return [
+            f"  {_format_bytes(item['size_diff']):>10}  {item['count_diff']:>+8} 个  {item['location']}"
+            for item in top
+        ]
+
+
+def create_memory_profiler(config) -> Optional[MemoryProfiler]:
+    """根据配置创建并启动内存诊断（memory_profile 未启用时返回None）
+
+    Args:
+        config: 配置对象（读取 memory_profile、memory_top、memory_frames、output_dir）
+
+    Returns:
+        已启动的内存诊断器
+    """
+    if not config.get("memory_profile", False):
+        return None
+    profiler = MemoryProfiler(
+        config.output_dir,
+        top=config.get("memory_top", 20),
+        frames=config.get("memory_frames", 1)
+    )
+    profiler.start()
+    return profiler
+
+
+class _SyntheticAPIClient:
+    """内存基准使用的离线API客户端（按固定格式生成列表和详情，不访问网络）"""
+
+    def __init__(self, count: int, content_size: int):
+        self.count = count
+        self.network_calls = 0
+        self.content = "第一条　为了规范管理，根据有关法律法规，制定本办法。\n" * max(1, content_size // 30)
+
+    def search_policies(self, law_rule_type: int, page_num: int = 1, page_size: int = 20) -> Dict[str, Any]:
+        start = (page_num - 1) * page_size
+        rows = [
+            {
+                "id": f"bench{index:08d}",
+                "title": f"基准测试政策{index}号管理办法",
+                "officeVo": {"groupName": "广东省人民政府"},
+                "passDate": "2024-01-01 00:00:00",
+                "lawRuleType": law_rule_type,
+                "formulateMode": "制定",
+                "timeliness": "现行有效",
+                "fileType": "规章",
+                "tagNames": "行政管理、基准测试",
+            }
+            for index in range(start, min(start + page_size, self.count))
+        ]
+        return {"code": 200, "data": {"rows": rows, "total": self.count}}
+
+    def get_policy_detail(self, policy_id: str) -> Dict[str, Any]:
+        return {
+            "lawRule": {
+                "id": policy_id,
+                "content": self.content,
+                "keywords": "管理,办法,基准",
+                "effectiveDate": "2024-02-01 00:00:00",
+            },
+            "list": [],
+        }
+
+    def fetch_file(self, file_path: str) -> Optional[bytes]:
+        return None
+
+    def close(self):
+        pass
+
+
+def memory_benchmark(config, sizes: Sequence[int], content_size: int = 20000) -> List[Dict[str, Any]]:
+    """离线内存基准：用合成数据跑完整的批量爬取流程，测量各规模下的内存
+
+    每个规模在独立的临时输出目录中运行（不下载附件、不写磁盘同步），
+    记录爬取结束后仍被爬虫持有的内存（retained）和运行中的分配峰值（peak），
+    均为相对运行前的 tracemalloc 增量。
+
+    Args:
+        config: 配置对象（复制后修改，不影响原配置）
+        sizes: 政策数量列表（如 [500, 1000, 2000]）
+        content_size: 每条政策详情正文的大致字符数
+
+    Returns:
+        [{"policies", "retained", "peak", "rss"}, ...]
+    """
+    import copy
+    import tempfile
+    from .crawler import PolicyCrawler
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+
+    results = []
+    try:
+        for count in sizes:
+            with tempfile.TemporaryDirectory(prefix="gd-law-membench-") as output_dir:
+                bench_config = copy.copy(config)
+                bench_config.config = dict(config.config)
+                for key, value in {
+                    "output_dir": output_dir,
+                    "request_delay": 0,
+                    "save_files": False,
+                    "writer_fsync": False,
+                    "compression": "none",
+                    "metrics_port": 0,
+                    "metrics_file": "",
+                    "trace_enabled": False,
+                    "memory_profile": False,
+                    "profile": "",
+                }.items():
+                    bench_config.set(key, value)
+
+                gc.collect()
+                baseline, _ = tracemalloc.get_traced_memory()
+                if hasattr(tracemalloc, "reset_peak"):
+                    tracemalloc.reset_peak()
+
+                crawler = PolicyCrawler(bench_config)
+                crawler.api_client = _SyntheticAPIClient(count, content_size)
+                try:
+                    crawler.crawl_batch([1])
+                    crawler.writer.flush()
+                    gc.collect()
+                    current, peak = tracemalloc.get_traced_memory()
+                finally:
+                    crawler.close()
+                del crawler
+
+                results.append({
+                    "policies": count,
+                    "retained": current - baseline,
+                    "peak": peak - baseline,
+                    "rss": current_rss(),
+                })
+                logger.info(
+                    f"[内存基准] {count} 条: 持有 {_format_bytes(current - baseline)}，"
+                    f"峰值 {_format_bytes(peak - baseline)}"
+                )
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+    return results
@@ -0,0 +1,132 @@
+"""
+RAG Markdown 模块 - 由政策元数据和附件转换结果生成 RAG 格式的 Markdown
+
+爬取（PolicyCrawler）和离线重建（rebuild 命令）共用，修改模板后递增
+TEMPLATE_VERSION。
+"""
+
+import json
+import time
+from typing import List, Optional, Tuple
+
+from .models import Policy, PolicyDetail
+from .manifest import safe_filename
+
+# 模板版本（front matter 或正文格式变化时递增）
+TEMPLATE_VERSION = 1
+
+DETAIL_URL = (
+    "https://www.gdpc.gov.cn:443/bascdata/securityJsp/nfrr_inner/internet/lawRule/"
+    "lawRuleDetail.jsp?id={id}&lawRuleType={law_rule_type}"
+)
+
+
+def markdown_filename(policy: Policy, number: int) -> str:
+    """Markdown文件名（编号_政策名称.md）"""
+    return f"{number:04d}_{safe_filename(policy.title, policy.id)}.md"
+
+
+def join_attachments(sections: List[Tuple[str, str]]) -> Optional[str]:
+    """合并多个附件的转换结果
+
+    Args:
+        sections: [(附件原文件名, 转换后的Markdown), ...]
+
+    Returns:
+        合并后的正文，没有内容时返回None
+    """
+    parts = []
+    for file_name, content in sections:
+        if content:
+            parts.append(f"\n\n## {file_name}\n\n")
+            parts.append(content)
+    if not parts:
+        return None
+    return '\n'.join(parts)
+
+
+def render(
+    policy: Policy,
+    detail: PolicyDetail,
+    markdown_content: Optional[str],
+    crawl_time: Optional[str] = None
+) -> str:
+    """生成RAG格式的Markdown文本
+
+    Args:
+        policy: 政策对象
+        detail: 政策详情
+        markdown_content: 附件转换后的正文（为空时输出提示）
+        crawl_time: 爬取时间（为空时使用当前时间）
+
+    Returns:
+        Markdown文本
+    """
+    md_lines = []
+
+    # YAML Front Matter
+    md_lines.append('---')
+    md_lines.append(f'title: "{policy.title}"')
+    md_lines.append(f'policy_id: "{policy.id}"')
+    md_lines.append(f'law_rule_type: "{policy.law_rule_type}"')
+    md_lines.append(f'office: "{policy.office}"')
+    md_lines.append(f'pass_date: "{policy.pass_date[:10]}"')
+    md_lines.append(f'effective_date: "{detail.effective_date[:10] if detail.effective_date else ""}"')
+    md_lines.append(f'file_type: "{policy.file_type}"')
+    md_lines.append(f'timeliness: "{policy.timeliness}"')
+    md_lines.append(f'formulate_mode: "{policy.formulate_mode}"')
+
+    # 关键词
+    if detail.keywords:
+        keywords_list = [k.strip() for k in detail.keywords.split(',') if k.strip()]
+        md_lines.append(f'keywords: {json.dumps(keywords_list, ensure_ascii=False)}')
+
+    # 标签
+    if policy.tag_names:
+        tags_list = [t.strip() for t in policy.tag_names.split('、') if t.strip()]
+        md_lines.append(f'tags: {json.dumps(tags_list, ensure_ascii=False)}')
+
+    # 来源链接
+    detail_url = DETAIL_URL.format(id=policy.id, law_rule_type=policy.law_rule_type)
+    md_lines.append(f'source_url: "{detail_url}"')
+    md_lines.append(f'crawl_time: "{crawl_time or time.strftime("%Y-%m-%d %H:%M:%S")}"')
+    md_lines.append('---')
+    md_lines.append('')
+
+    # 标题
+    md_lines.append(f'# {policy.title}')
+    md_lines.append('')
+
+    # 基本信息
+    md_lines.append('## 基本信息')
+    md_lines.append('')
+    md_lines.append(f'- **制定机关**: {policy.office}')
+    md_lines.append(f'- **通过日期**: {policy.pass_date[:10]}')
+    if detail.effective_date:
+        md_lines.append(f'- **生效日期**: {detail.effective_date[:10]}')
+    md_lines.append(f'- **时效性**: {policy.timeliness}')
+    md_lines.append(f'- **制定形式**: {policy.formulate_mode}')
+    md_lines.append(f'- **来源链接**: [查看原文]({detail_url})')
+    md_lines.append('')
+
+    # 关键词
+    if detail.keywords:
+        md_lines.append('## 关键词')
+        md_lines.append('')
+        keywords_list = [k.strip() for k in detail.keywords.split(',') if k.strip()][:20]
+        md_lines.append(', '.join(keywords_list))
+        md_lines.append('')
+
+    # 正文内容
+    md_lines.append('---')
+    md_lines.append('')
+    md_lines.append('## 正文内容')
+    md_lines.append('')
+    if markdown_content:
+        md_lines.append(markdown_content)
+    else:
+        md_lines.append('> **注意**: 该政策的附件文件无法自动转换为文本格式。')
+        md_lines.append('> ')
+        md_lines.append('> 请访问[来源链接](#基本信息)查看完整文档内容。')
+
+    return '\n'.join(md_lines)
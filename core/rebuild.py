@@ -0,0 +1,283 @@
+"""
+离线重建模块 - 由已保存的JSON和附件重新转换并生成Markdown（不访问网络）
+"""
+
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .converter import DocumentConverter
+from .manifest import Manifest, OutputLayout
+from .models import Policy, FileAttachment, PolicyDetail
+from .writer import atomic_write_bytes
+from . import rag_markdown
+from . import fingerprint
+from .http_cache import content_hash
+from utils.file_handler import FileHandler
+from utils.compression import ZstdCodec, ZSTD_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+
+def select_entries(
+    manifest: Manifest,
+    since: Optional[str] = None,
+    only_failed: bool = False,
+    only_stale: bool = False
+) -> List[Dict[str, Any]]:
+    """按条件筛选需要重建的清单记录
+
+    Args:
+        manifest: 输出清单
+        since: 只重建此日期（YYYY-MM-DD 或 ISO 时间）之后更新的政策
+        only_failed: 只重建有附件但之前未转换成功的政策
+        only_stale: 只重建Markdown已过期（转换器或模板已更新等）的政策
+
+    Returns:
+        清单记录列表（按 Markdown 编号排序）
+    """
+    selected = []
+    for entry in manifest.entries():
+        if not entry.get("json"):
+            continue
+        if since and (entry.get("updated_at") or "") < since:
+            continue
+        if only_failed and (entry.get("converted") is True or not entry.get("files")):
+            continue
+        if only_stale and "markdown" not in fingerprint.stale_reasons(entry, manifest.output_dir):
+            continue
+        selected.append(entry)
+    selected.sort(key=lambda entry: entry.get("markdown_number") or 0)
+    return selected
+
+
+def load_detail(data: Dict[str, Any]) -> PolicyDetail:
+    """由保存的JSON（PolicyDetail.to_dict 的输出）还原政策详情"""
+    policy_data = data.get("policy") or {}
+    policy = Policy(**{f.name: policy_data.get(f.name, "") for f in fields(Policy)})
+    attachments = []
+    for item in data.get("attachments") or []:
+        if isinstance(item, dict):
+            attachments.append(FileAttachment(
+                **{f.name: item.get(f.name, "") for f in fields(FileAttachment)}
+            ))
+    return PolicyDetail(
+        policy=policy,
+        law_rule=data.get("law_rule") or {},
+        attachments=attachments,
+        keywords=data.get("keywords") or "",
+        effective_date=data.get("effective_date") or "",
+        associate_id=data.get("associate_id") or "",
+    )
+
+
+def _plain_name(rel_path: str) -> str:
+    """去掉压缩后缀的文件名"""
+    name = os.path.basename(rel_path)
+    if name.endswith(ZstdCodec.SUFFIX):
+        name = name[:-len(ZstdCodec.SUFFIX)]
+    return name
+
+
+def _attachment_names(entry: Dict[str, Any], detail: PolicyDetail) -> List[str]:
+    """已保存附件对应的原文件名（旧清单没有 file_names 时按保存的文件名匹配）"""
+    files = entry.get("files") or []
+    names = entry.get("file_names") or []
+    if len(names) == len(files):
+        return list(names)
+
+    result = []
+    for rel_path in files:
+        stem = os.path.splitext(_plain_name(rel_path))[0]
+        name = None
+        for att in detail.attachments:
+            att_stem = os.path.splitext(att.file_name)[0]
+            safe_att_name = "".join(c for c in att_stem if c.isalnum() or c in (' ', '-', '_')).strip()
+            if safe_att_name and stem.endswith(f"_{safe_att_name}"):
+                name = att.file_name
+                break
+        if name is None:
+            # 附件名与政策名相同时保存为 编号_政策名[_序号]
+            name = next(
+                (att.file_name for att in detail.attachments
+                 if os.path.splitext(att.file_name)[0] == detail.policy.title),
+                _plain_name(rel_path)
+            )
+        result.append(name)
+    return result
+
+
+# 工作进程内复用的转换器和压缩器
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(output_dir: str, compression: Dict[str, Any]):
+    """工作进程初始化"""
+    _worker["converter"] = DocumentConverter()
+    _worker["codec"] = None
+    if compression and ZSTD_AVAILABLE:
+        # 工作进程只使用已有字典，不参与训练
+        _worker["codec"] = ZstdCodec(
+            output_dir,
+            level=compression.get("level", 10),
+            train_samples=0,
+            compress_attachments=False
+        )
+
+
+def rebuild_policy(task: Dict[str, Any]) -> Dict[str, Any]:
+    """重建单个政策的Markdown（在工作进程中执行）
+
+    Args:
+        task: {"output_dir", "layout", "entry", "markdown_number"}
+
+    Returns:
+        {"id", "markdown", "markdown_number", "converted", "inputs", "error"}
+    """
+    output_dir = task["output_dir"]
+    entry = task["entry"]
+    result = {"id": entry["id"], "markdown": None, "markdown_number": task["markdown_number"],
+              "converted": False, "inputs": fingerprint.current_versions(), "error": ""}
+    converter: DocumentConverter = _worker.get("converter") or DocumentConverter()
+    codec: Optional[ZstdCodec] = _worker.get("codec")
+
+    data = FileHandler.read_json(f"{output_dir}/{entry['json']}")
+    if not isinstance(data, dict):
+        result["error"] = "JSON读取失败"
+        return result
+    try:
+        detail = load_detail(data)
+    except (TypeError, ValueError) as e:
+        result["error"] = f"JSON格式错误: {e}"
+        return result
+    policy = detail.policy
+    result["inputs"]["detail"] = fingerprint.detail_hash(data)
+    result["inputs"]["files"] = []
+
+    # 1. 重新转换已保存的附件
+    sections = []
+    files = entry.get("files") or []
+    for rel_path, file_name in zip(files, _attachment_names(entry, detail)):
+        content = FileHandler.read_bytes(f"{output_dir}/{rel_path}")
+        if not content:
+            continue
+        result["inputs"]["files"].append(content_hash(content))
+        ext = os.path.splitext(_plain_name(rel_path))[1]
+        sections.append((file_name, converter.convert_bytes(content, ext)))
+    markdown_content = rag_markdown.join_attachments(sections)
+    result["converted"] = bool(markdown_content)
+
+    # 2. 生成Markdown（保留原路径和编号，使重建前后的文件一一对应）
+    crawl_time = (entry.get("updated_at") or "").replace("T", " ") or None
+    text = rag_markdown.render(policy, detail, markdown_content, crawl_time=crawl_time)
+    rel_path = entry.get("markdown")
+    if not rel_path:
+        layout = OutputLayout(output_dir, task["layout"])
+        rel_path = layout.relative_path(
+            "markdown", policy, rag_markdown.markdown_filename(policy, task["markdown_number"])
+        )
+        if codec is not None:
+            rel_path = codec.target_path(rel_path)
+    data = text.encode("utf-8")
+    if rel_path.endswith(ZstdCodec.SUFFIX):
+        if codec is None:
+            result["error"] = "原Markdown为zstd压缩文件，需要安装 zstandard"
+            return result
+        data = codec.compress(rel_path[:-len(ZstdCodec.SUFFIX)], data)
+    try:
+        atomic_write_bytes(f"{output_dir}/{rel_path}", data)
+    except OSError as e:
+        result["error"] = f"写入失败: {e}"
+        return result
+    result["markdown"] = rel_path
+    return result
+
+
+def rebuild(
+    config,
+    output_dir: Optional[str] = None,
+    since: Optional[str] = None,
+    only_failed: bool = False,
+    only_stale: bool = False,
+    workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, Any]:
+    """离线重建输出目录中的Markdown
+
+    读取清单中每个政策的 json/policy_*.json 和 files/ 下的附件，在多个
+    进程中重新转换并生成 Markdown，结果写回原路径并更新清单的 converted
+    和 inputs 字段。全程不访问网络。
+
+    Args:
+        config: 配置对象
+        output_dir: 输出目录（默认读取配置）
+        since: 只重建此日期之后更新的政策
+        only_failed: 只重建之前未转换成功的政策
+        only_stale: 只重建Markdown已过期的政策
+        workers: 进程数（默认CPU核数）
+        progress_callback: 进度回调 (已完成数, 总数) -> None
+
+    Returns:
+        统计信息 {"total", "rebuilt", "converted", "failed", "errors", "elapsed"}
+    """
+    output_dir = output_dir or config.output_dir
+    manifest = Manifest(output_dir)
+    if len(manifest) == 0:
+        # 旧版本输出目录没有清单，先扫描生成
+        manifest.rebuild()
+
+    entries = select_entries(manifest, since=since, only_failed=only_failed, only_stale=only_stale)
+    stats = {"total": len(entries), "rebuilt": 0, "converted": 0, "failed": 0, "errors": [], "elapsed": 0.0}
+    if not entries:
+        return stats
+
+    layout = config.get("output_layout", "flat")
+    next_number = manifest.max_number("markdown_number")
+    tasks = []
+    for entry in entries:
+        number = entry.get("markdown_number")
+        if not number:
+            next_number += 1
+            number = next_number
+        tasks.append({"output_dir": output_dir, "layout": layout, "entry": entry, "markdown_number": number})
+
+    compression = {}
+    if config.get("compression", "none") == "zstd":
+        compression = {"level": config.get("compression_level", 10)}
+
+    started = time.monotonic()
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(output_dir, compression)
+    ) as executor:
+        chunksize = max(1, min(32, len(tasks) // (workers * 4)))
+        for done, result in enumerate(executor.map(rebuild_policy, tasks, chunksize=chunksize), 1):
+            if result["markdown"]:
+                stats["rebuilt"] += 1
+                if result["converted"]:
+                    stats["converted"] += 1
+                inputs = dict((manifest.get(result["id"]) or {}).get("inputs") or {})
+                inputs.update(result["inputs"])
+                manifest.update(
+                    result["id"],
+                    markdown=result["markdown"],
+                    markdown_number=result["markdown_number"],
+                    converted=result["converted"],
+                    inputs=inputs,
+                    rebuilt_at=datetime.now().isoformat(timespec='seconds')
+                )
+            else:
+                stats["failed"] += 1
+                stats["errors"].append((result["id"], result["error"]))
+            if progress_callback:
+                progress_callback(done, len(tasks))
+
+    manifest.close()
+    stats["elapsed"] = time.monotonic() - started
+    return stats
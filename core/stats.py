@@ -0,0 +1,244 @@
+"""
+运行统计模块 - 吞吐量、延迟等轻量计数器
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from . import metrics
+from .tracing import TRACER
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """计算百分位数（输入需已排序）"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class CrawlStats:
+    """爬取运行统计
+
+    由 APIClient 和 PolicyCrawler 在调用点直接记录（不解析日志文本），
+    保存最近 window 秒内的事件用于计算速率，每个接口保留最近若干次
+    请求耗时用于计算延迟百分位。同时更新 core.metrics 中的 Prometheus
+    指标，并在启用追踪时把请求记录为 core.tracing 区间。所有方法线程安全。
+    """
+
+    def __init__(self, window: float = 60.0, latency_samples: int = 512):
+        """初始化
+
+        Args:
+            window: 速率统计窗口（秒）
+            latency_samples: 每个接口/阶段保留的耗时样本数
+        """
+        self.window = window
+        self.latency_samples = latency_samples
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+        # 滚动窗口事件：(时间, 类型, 数值)
+        self._events: Deque[Tuple[float, str, float]] = deque()
+
+        # 累计计数
+        self.requests: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.retries: Dict[str, int] = {}
+        self.rate_limits = 0
+        self.rate_limit_wait = 0.0
+        self.bytes_downloaded = 0
+        self.policies_done = 0
+        self.policies_failed = 0
+        self.cache_results: Dict[str, Dict[str, int]] = {}
+        self.skipped_stages: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+
+        # 耗时样本和次数（接口和处理阶段）
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._latency_counts: Dict[str, int] = {}
+
+    def _add_event(self, now: float, kind: str, value: float = 1.0):
+        self._events.append((now, kind, value))
+        cutoff = now - self.window
+        while self._events and self._events[0][0] < cutoff:
+            self._events.popleft()
+
+    def _add_latency(self, name: str, seconds: float):
+        samples = self._latencies.get(name)
+        if samples is None:
+            samples = deque(maxlen=self.latency_samples)
+            self._latencies[name] = samples
+        samples.append(seconds)
+        self._latency_counts[name] = self._latency_counts.get(name, 0) + 1
+
+    def record_request(
+        self,
+        endpoint: str,
+        seconds: float,
+        ok: bool = True,
+        nbytes: int = 0,
+        status: str = ""
+    ):
+        """记录一次HTTP请求
+
+        Args:
+            endpoint: 接口名（search / detail / download）
+            seconds: 耗时
+            ok: 是否成功
+            nbytes: 响应字节数
+            status: HTTP状态码或错误类型（为空时按 ok 记为 ok / error）
+        """
+        status = status or ("ok" if ok else "error")
+        metrics.REQUESTS.inc(endpoint=endpoint, status=status)
+        metrics.REQUEST_SECONDS.observe(seconds, endpoint=endpoint)
+        if nbytes:
+            metrics.DOWNLOADED_BYTES.inc(nbytes, endpoint=endpoint)
+        TRACER.complete(f"http.{endpoint}", seconds, category="http", status=status, bytes=nbytes)
+
+        now = time.monotonic()
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+            self.bytes_downloaded += nbytes
+            self._add_latency(endpoint, seconds)
+            self._add_event(now, "request")
+            if nbytes:
+                self._add_event(now, "bytes", nbytes)
+
+    def record_retry(self, endpoint: str):
+        """记录一次重试"""
+        metrics.RETRIES.inc(endpoint=endpoint)
+        with self._lock:
+            self.retries[endpoint] = self.retries.get(endpoint, 0) + 1
+
+    def record_rate_limit(self, wait_seconds: float):
+        """记录一次限流等待"""
+        metrics.RATE_LIMITS.inc()
+        metrics.RATE_LIMIT_WAIT.inc(wait_seconds)
+        with self._lock:
+            self.rate_limits += 1
+            self.rate_limit_wait += wait_seconds
+
+    def record_cache(self, endpoint: str, result: str):
+        """记录一次HTTP缓存查询
+
+        Args:
+            endpoint: 接口名
+            result: hit（有效期内直接使用）/ revalidated（304）/ unchanged（内容哈希相同）/ miss
+        """
+        metrics.HTTP_CACHE.inc(endpoint=endpoint, result=result)
+        with self._lock:
+            results = self.cache_results.setdefault(endpoint, {})
+            results[result] = results.get(result, 0) + 1
+
+    def record_failure(self, stage: str, category: str):
+        """记录一次失败（stage: detail / download / convert，category 见 core.failures）"""
+        metrics.FAILURES.inc(stage=stage, category=category)
+        with self._lock:
+            self.failures[category] = self.failures.get(category, 0) + 1
+
+    def record_skip(self, stage: str):
+        """记录一个因输入未变化而跳过的输出阶段（json / files / markdown）"""
+        metrics.STAGES_SKIPPED.inc(stage=stage)
+        with self._lock:
+            self.skipped_stages[stage] = self.skipped_stages.get(stage, 0) + 1
+
+    def record_stage(self, stage: str, seconds: float):
+        """记录处理阶段耗时（如 convert）"""
+        with self._lock:
+            self._add_latency(stage, seconds)
+
+    def record_policy(self, success: bool, retried: bool = False):
+        """记录一个政策处理完成
+        
+        Args:
+            success: 是否成功
+            retried: 是否为重试（该政策已按失败记录过一次：成功时从失败改计为成功，
+                仍失败时不重复计数；Prometheus 计数器不能减少，改计记为 result="recovered"）
+        """
+        if retried:
+            if success:
+                metrics.POLICIES.inc(result="recovered")
+        else:
+            metrics.POLICIES.inc(result="success" if success else "failed")
+        now = time.monotonic()
+        with self._lock:
+            if success:
+                self.policies_done += 1
+                if retried:
+                    self.policies_failed -= 1
+            elif not retried:
+                self.policies_failed += 1
+            self._add_event(now, "policy")
+
+    def snapshot(
+        self,
+        remaining: Optional[int] = None,
+        queue_depths: Optional[Dict[str, int]] = None
+    ) -> Dict[str, Any]:
+        """生成统计快照
+
+        Args:
+            remaining: 剩余政策数（用于估算剩余时间）
+            queue_depths: 各队列深度
+
+        Returns:
+            统计数据字典
+        """
+        now = time.monotonic()
+        with self._lock:
+            cutoff = now - self.window
+            while self._events and self._events[0][0] < cutoff:
+                self._events.popleft()
+
+            span = max(1.0, min(self.window, now - self.started))
+            window_requests = 0
+            window_policies = 0
+            window_bytes = 0.0
+            for _, kind, value in self._events:
+                if kind == "request":
+                    window_requests += 1
+                elif kind == "policy":
+                    window_policies += 1
+                elif kind == "bytes":
+                    window_bytes += value
+
+            latencies = {}
+            for name, samples in self._latencies.items():
+                values = sorted(samples)
+                latencies[name] = {
+                    "count": self._latency_counts.get(name, 0),
+                    "errors": self.errors.get(name, 0),
+                    "retries": self.retries.get(name, 0),
+                    "p50": percentile(values, 50),
+                    "p90": percentile(values, 90),
+                    "p99": percentile(values, 99),
+                }
+
+            data = {
+                "elapsed": now - self.started,
+                "requests_per_sec": window_requests / span,
+                "policies_per_sec": window_policies / span,
+                "bytes_per_sec": window_bytes / span,
+                "requests_total": sum(self.requests.values()),
+                "retries_total": sum(self.retries.values()),
+                "rate_limits": self.rate_limits,
+                "rate_limit_wait": self.rate_limit_wait,
+                "bytes_downloaded": self.bytes_downloaded,
+                "policies_done": self.policies_done,
+                "policies_failed": self.policies_failed,
+                "cache": {endpoint: dict(results) for endpoint, results in self.cache_results.items()},
+                "skipped": dict(self.skipped_stages),
+                "failures": dict(self.failures),
+                "latencies": latencies,
+                "queue_depths": dict(queue_depths or {}),
+                "eta": None,
+            }
+
+        if remaining is not None and data["policies_per_sec"] > 0:
+            data["eta"] = remaining / data["policies_per_sec"]
+        return data
@@ -0,0 +1,193 @@
+"""
+链路追踪模块 - 记录耗时区间并导出为 Chrome Trace JSON（可在 Perfetto 中查看）
+"""
+
+import os
+import time
+import threading
+from typing import Any, Dict, List, Optional
+
+from . import codec
+
+
+class _NoopSpan:
+    """未启用追踪时使用的空区间（不分配对象、不计时）"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    """一个耗时区间（退出时记录为 Chrome Trace 的完整事件）"""
+
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer._record(self.name, self.category, self.start, end - self.start, self.args)
+        return False
+
+    def set(self, **args):
+        """补充区间参数（如结果、字节数）"""
+        self.args.update(args)
+
+
+class Tracer:
+    """追踪器
+
+    禁用时 span() 直接返回共享的空区间，调用点开销只有一次属性判断。
+    启用后每个区间记录为 Chrome Trace 的 "X" 事件（按线程分轨道），
+    嵌套的区间在 Perfetto / chrome://tracing 中显示为父子关系。
+    """
+
+    def __init__(self, max_events: int = 1000000):
+        """初始化
+
+        Args:
+            max_events: 最多保留的事件数（超出后丢弃并计数）
+        """
+        self.enabled = False
+        self.max_events = max_events
+        self.dropped = 0
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+
+    def enable(self, max_events: Optional[int] = None):
+        """开始记录（清空之前的事件）"""
+        with self._lock:
+            if max_events:
+                self.max_events = max_events
+            self._events = []
+            self._threads = {}
+            self.dropped = 0
+            self._origin = time.perf_counter_ns()
+            self.enabled = True
+
+    def disable(self):
+        """停止记录"""
+        self.enabled = False
+
+    def span(self, name: str, category: str = "crawl", **args):
+        """创建耗时区间（with 语句使用）
+
+        Args:
+            name: 区间名称
+            category: 分类
+            **args: 附加参数（显示在区间详情中）
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name, category, args)
+
+    def complete(self, name: str, seconds: float, category: str = "crawl", **args):
+        """记录一个刚刚结束、耗时已知的区间（如已计时的HTTP请求）"""
+        if not self.enabled:
+            return
+        duration = int(seconds * 1e9)
+        self._record(name, category, time.perf_counter_ns() - duration, duration, args)
+
+    def sleep(self, seconds: float, reason: str = ""):
+        """等待指定时间，并记录为 sleep 区间"""
+        if not self.enabled:
+            time.sleep(seconds)
+            return
+        with _Span(self, "sleep", "sleep", {"reason": reason, "seconds": seconds}):
+            time.sleep(seconds)
+
+    def _record(self, name: str, category: str, start_ns: int, duration_ns: int, args: Dict[str, Any]):
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start_ns - self._origin) / 1000.0,
+            "dur": duration_ns / 1000.0,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            if len(self._events) >= self.max_events:
+                self.dropped += 1
+                return
+            self._events.append(event)
+            if thread.ident not in self._threads:
+                self._threads[thread.ident] = thread.name
+
+    def export(self, path: str) -> int:
+        """导出为 Chrome Trace JSON 文件
+
+        Args:
+            path: 输出路径
+
+        Returns:
+            导出的事件数
+        """
+        from .writer import atomic_write_bytes
+
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+            dropped = self.dropped
+
+        metadata = [{
+            "name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+            "args": {"name": "gd-law-crawler"},
+        }]
+        for tid, thread_name in threads.items():
+            metadata.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": thread_name},
+            })
+
+        data = {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": dropped},
+        }
+        atomic_write_bytes(path, codec.dumps(data), fsync=False)
+        return len(events)
+
+
+# 全局追踪器（默认禁用）
+TRACER = Tracer()
+
+
+def span(name: str, category: str = "crawl", **args):
+    """在全局追踪器上创建耗时区间"""
+    if not TRACER.enabled:
+        return _NOOP_SPAN
+    return _Span(TRACER, name, category, args)
+
+
+def sleep(seconds: float, reason: str = ""):
+    """等待并记录 sleep 区间"""
+    TRACER.sleep(seconds, reason)
@@ -0,0 +1,310 @@
+"""
+异步写入模块 - 独立写入线程，原子写文件
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import codec as json_codec
+from . import metrics
+from . import tracing
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFileWriter:
+    """异步文件写入器
+
+    爬取线程只负责把待写入的内容放入有界队列，由独立的写入线程完成
+    落盘。每个文件先写入同目录下的临时文件，fsync 后再通过 os.replace
+    原子替换目标文件，崩溃时不会留下被截断的文件。fsync 按批进行，
+    减少慢速磁盘上的同步开销。
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        max_queue_size: int = 256,
+        fsync: bool = True,
+        fsync_batch: int = 32,
+        fsync_interval: float = 1.0,
+        codec=None
+    ):
+        """初始化写入器
+
+        Args:
+            max_queue_size: 队列容量（满时提交方阻塞，形成背压）
+            fsync: 是否在替换前执行fsync
+            fsync_batch: 每批最多累积的文件数
+            fsync_interval: 每批最长累积时间（秒）
+            codec: 落盘压缩编解码器（utils.compression.ZstdCodec，为空时不压缩）
+        """
+        self.codec = codec
+        self.fsync = fsync
+        self.fsync_batch = max(1, fsync_batch)
+        self.fsync_interval = fsync_interval
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_queue_size))
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._seq = 0
+
+        self.written_count = 0
+        self.written_bytes = 0
+        self.error_count = 0
+
+    def start(self):
+        """启动写入线程"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run,
+                name="AsyncFileWriter",
+                daemon=True
+            )
+            self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        """当前待写入的任务数"""
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, int]:
+        """写入统计"""
+        return {
+            "queue_depth": self.queue_depth,
+            "written_count": self.written_count,
+            "written_bytes": self.written_bytes,
+            "error_count": self.error_count,
+        }
+
+    def write_bytes(self, path: str, data: bytes) -> str:
+        """提交二进制写入任务
+
+        Args:
+            path: 目标路径
+            data: 文件内容
+
+        Returns:
+            最终写入路径（启用压缩时带 .zst 后缀）
+        """
+        if self.codec is not None and self.codec.should_compress(path):
+            # 压缩在写入线程中进行，不占用爬取线程
+            final_path = self.codec.target_path(path)
+            self._submit(("write", final_path, data, path, time.monotonic()))
+            return final_path
+        self._submit(("write", path, data, None, time.monotonic()))
+        return path
+
+    def write_text(self, path: str, content: str) -> str:
+        """提交文本写入任务（UTF-8）"""
+        return self.write_bytes(path, content.encode('utf-8'))
+
+    def write_json(self, path: str, data: Any) -> str:
+        """提交JSON写入任务"""
+        return self.write_bytes(path, json_codec.dumps(data, indent=True))
+
+    def append_bytes(self, path: str, data: bytes):
+        """提交追加写入任务（按提交顺序执行，不做原子替换）"""
+        self._submit(("append", path, data, time.monotonic()))
+
+    def append_text(self, path: str, content: str):
+        """提交文本追加写入任务（UTF-8）"""
+        self.append_bytes(path, content.encode('utf-8'))
+
+    def flush(self):
+        """等待队列中所有任务完成落盘"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.join()
+
+    def close(self):
+        """写完剩余任务并停止写入线程"""
+        if self._thread is None:
+            return
+        self._queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _submit(self, task: Tuple):
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        self._queue.put(task)
+        metrics.WRITER_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _run(self):
+        """写入线程主循环"""
+        pending: List[Tuple[Any, str, str, float]] = []
+        batch_started = 0.0
+        stopping = False
+
+        while not stopping:
+            timeout = None
+            if pending:
+                timeout = max(0.0, self.fsync_interval - (time.monotonic() - batch_started))
+
+            try:
+                task = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                task = None
+
+            if task is self._STOP:
+                stopping = True
+                self._queue.task_done()
+            elif task is not None:
+                written = False
+                try:
+                    if task[0] == "append":
+                        # 追加记录（如清单）可能引用之前提交的文件，先让它们就位
+                        if pending:
+                            self._commit(pending)
+                            for _ in pending:
+                                self._queue.task_done()
+                            pending = []
+                        with tracing.span("append", "io", path=task[1]):
+                            self._append(task[1], task[2])
+                        metrics.WRITER_LATENCY.observe(time.monotonic() - task[3])
+                    else:
+                        with tracing.span("write", "io", path=task[1]):
+                            data = task[2]
+                            if task[3] is not None:
+                                data = self.codec.compress(task[3], data)
+                            if not pending:
+                                batch_started = time.monotonic()
+                            pending.append(self._write_temp(task[1], data, task[4]))
+                        written = True
+                except Exception as e:
+                    self.error_count += 1
+                    metrics.WRITER_ERRORS.inc()
+                    logger.error(f"[X] 文件写入失败: {task[1]}: {e}")
+                finally:
+                    # 临时文件要等提交后才算完成，flush() 才能保证文件已就位
+                    if not written:
+                        self._queue.task_done()
+
+            # 队列空闲、批次已满或超时时统一提交
+            if pending and (
+                stopping
+                or task is None
+                or len(pending) >= self.fsync_batch
+                or self._queue.empty()
+                or time.monotonic() - batch_started >= self.fsync_interval
+            ):
+                self._commit(pending)
+                for _ in pending:
+                    self._queue.task_done()
+                pending = []
+
+            metrics.WRITER_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _write_temp(self, path: str, data: bytes, submitted: float) -> Tuple[Any, str, str, float]:
+        """写入临时文件（暂不fsync）"""
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        self._seq += 1
+        tmp_path = f"{path}.{os.getpid()}.{self._seq}.tmp"
+        f = open(tmp_path, 'wb')
+        try:
+            f.write(data)
+            f.flush()
+        except Exception:
+            f.close()
+            self._remove_quietly(tmp_path)
+            raise
+        self.written_bytes += len(data)
+        metrics.WRITER_BYTES.inc(len(data))
+        return f, tmp_path, path, submitted
+
+    def _commit(self, pending: List[Tuple[Any, str, str, float]]):
+        """批量fsync并原子替换"""
+        with tracing.span("commit", "io", files=len(pending)):
+            self._commit_batch(pending)
+
+        # 提交到落盘的延迟（含排队、压缩和批量fsync等待）
+        now = time.monotonic()
+        for _, _, _, submitted in pending:
+            metrics.WRITER_LATENCY.observe(now - submitted)
+
+    def _commit_batch(self, pending: List[Tuple[Any, str, str, float]]):
+        directories = set()
+        for f, tmp_path, path, _ in pending:
+            try:
+                if self.fsync:
+                    os.fsync(f.fileno())
+                f.close()
+                os.replace(tmp_path, path)
+                directories.add(os.path.dirname(path) or ".")
+                self.written_count += 1
+            except Exception as e:
+                self.error_count += 1
+                metrics.WRITER_ERRORS.inc()
+                logger.error(f"[X] 文件写入失败: {path}: {e}")
+                try:
+                    f.close()
+                except Exception:
+                    pass
+                self._remove_quietly(tmp_path)
+
+        if self.fsync:
+            for directory in directories:
+                self._fsync_dir(directory)
+
+    def _append(self, path: str, data: bytes):
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'ab') as f:
+            f.write(data)
+        self.written_bytes += len(data)
+        metrics.WRITER_BYTES.inc(len(data))
+
+    @staticmethod
+    def _fsync_dir(directory: str):
+        """同步目录项（Windows不支持，忽略）"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        try:
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _remove_quietly(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def atomic_write_bytes(path: str, data: bytes, fsync: bool = True):
+    """同步原子写入（临时文件 + 替换）
+
+    Args:
+        path: 目标路径
+        data: 文件内容
+        fsync: 是否fsync
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        AsyncFileWriter._remove_quietly(tmp_path)
+        raise
@@ -0,0 +1,388 @@
+"""
+数据浏览选项卡 - 基于输出清单浏览已爬取的政策
+"""
+
+import os
+import threading
+import tkinter as tk
+from tkinter import ttk, scrolledtext
+from typing import List, Optional, Tuple
+
+from core import Config
+from core.manifest import Manifest
+from utils.file_handler import FileHandler
+
+
+class BrowserTab:
+    """数据浏览选项卡
+
+    列表数据来自 manifest.jsonl，不扫描输出目录。表格只创建固定数量的
+    行，滚动时按偏移量重新填充这些行（虚拟化），因此条目数量不影响
+    界面响应；Markdown 内容仅在选中某一行时才读取。
+    """
+
+    TYPE_NAMES = {1: "地方性法规", 2: "政府规章", 3: "规范性文件"}
+    ALL = "全部"
+    VISIBLE_ROWS = 24  # 表格固定行数
+    PREVIEW_MAX_CHARS = 200000  # 预览最多显示的字符数
+
+    COLUMNS = ("pass_date", "title", "law_rule_type", "office", "timeliness")
+
+    def __init__(self, parent, config: Config):
+        """初始化
+
+        Args:
+            parent: 父窗口
+            config: 配置对象
+        """
+        self.config = config
+        self.loaded = False
+        self._loading = False
+        self._filter_after_id = None
+
+        # (通过日期, 标题, 类型, 发布机关, 时效性, 政策ID)，按日期倒序
+        self._rows: List[Tuple[str, str, int, str, str, str]] = []
+        self._filtered: List[int] = []  # 过滤后的行号
+        self._offset = 0  # 表格第一行对应的过滤结果下标
+        self._selected: Optional[int] = None  # 选中的过滤结果下标
+        self._manifest: Optional[Manifest] = None
+
+        # 创建主框架（统一间距：12px）
+        self.frame = ttk.Frame(parent, padding="12")
+
+        # 创建界面
+        self._create_widgets()
+
+    def _create_widgets(self):
+        """创建界面组件"""
+        # 数据来源（统一间距：组件间距8px，内部padding 10px）
+        source_frame = ttk.Frame(self.frame)
+        source_frame.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 8))
+        source_frame.columnconfigure(1, weight=1)
+
+        ttk.Label(source_frame, text="输出目录:").grid(row=0, column=0, sticky="w", padx=6)
+        self.output_dir = tk.StringVar(value=self.config.get("output_dir", "crawled_data"))
+        ttk.Entry(source_frame, textvariable=self.output_dir, width=50).grid(row=0, column=1, sticky="ew", padx=6)
+        ttk.Button(source_frame, text="重新加载", command=self.load).grid(row=0, column=2, padx=6)
+
+        # 过滤条件
+        filter_frame = ttk.LabelFrame(self.frame, text="筛选", padding="10")
+        filter_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(0, 8))
+
+        self.keyword_var = tk.StringVar()
+        self.type_var = tk.StringVar(value=self.ALL)
+        self.office_var = tk.StringVar(value=self.ALL)
+        self.timeliness_var = tk.StringVar(value=self.ALL)
+        self.date_from_var = tk.StringVar()
+        self.date_to_var = tk.StringVar()
+
+        ttk.Label(filter_frame, text="标题:").grid(row=0, column=0, sticky="w", padx=5, pady=3)
+        ttk.Entry(filter_frame, textvariable=self.keyword_var, width=24).grid(row=0, column=1, sticky="w", padx=5, pady=3)
+
+        ttk.Label(filter_frame, text="类型:").grid(row=0, column=2, sticky="w", padx=5, pady=3)
+        self.type_combo = ttk.Combobox(
+            filter_frame,
+            textvariable=self.type_var,
+            values=[self.ALL] + list(self.TYPE_NAMES.values()),
+            state="readonly",
+            width=12
+        )
+        self.type_combo.grid(row=0, column=3, sticky="w", padx=5, pady=3)
+
+        ttk.Label(filter_frame, text="时效性:").grid(row=0, column=4, sticky="w", padx=5, pady=3)
+        self.timeliness_combo = ttk.Combobox(
+            filter_frame, textvariable=self.timeliness_var, values=[self.ALL], state="readonly", width=10
+        )
+        self.timeliness_combo.grid(row=0, column=5, sticky="w", padx=5, pady=3)
+
+        ttk.Label(filter_frame, text="发布机关:").grid(row=1, column=0, sticky="w", padx=5, pady=3)
+        self.office_combo = ttk.Combobox(
+            filter_frame, textvariable=self.office_var, values=[self.ALL], width=24
+        )
+        self.office_combo.grid(row=1, column=1, sticky="w", padx=5, pady=3)
+
+        ttk.Label(filter_frame, text="通过日期:").grid(row=1, column=2, sticky="w", padx=5, pady=3)
+        date_frame = ttk.Frame(filter_frame)
+        date_frame.grid(row=1, column=3, columnspan=3, sticky="w", padx=5, pady=3)
+        ttk.Entry(date_frame, textvariable=self.date_from_var, width=12).pack(side=tk.LEFT)
+        ttk.Label(date_frame, text=" 至 ").pack(side=tk.LEFT)
+        ttk.Entry(date_frame, textvariable=self.date_to_var, width=12).pack(side=tk.LEFT)
+        ttk.Label(date_frame, text="（YYYY-MM-DD，可只填年份）", foreground="gray").pack(side=tk.LEFT, padx=(6, 0))
+
+        for var in (
+            self.keyword_var, self.type_var, self.office_var,
+            self.timeliness_var, self.date_from_var, self.date_to_var
+        ):
+            var.trace_add("write", lambda *args: self._schedule_filter())
+
+        # 政策列表（固定行数，滚动条由本类控制）
+        list_frame = ttk.Frame(self.frame)
+        list_frame.grid(row=2, column=0, sticky="nsew", padx=(0, 8))
+        list_frame.rowconfigure(0, weight=1)
+        list_frame.columnconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(
+            list_frame,
+            columns=self.COLUMNS,
+            show="headings",
+            height=self.VISIBLE_ROWS,
+            selectmode="browse"
+        )
+        headings = {
+            "pass_date": ("通过日期", 90, tk.NO),
+            "title": ("标题", 320, tk.YES),
+            "law_rule_type": ("类型", 80, tk.NO),
+            "office": ("发布机关", 160, tk.NO),
+            "timeliness": ("时效性", 70, tk.NO),
+        }
+        for column, (text, width, stretch) in headings.items():
+            self.tree.heading(column, text=text)
+            self.tree.column(column, width=width, minwidth=50, stretch=stretch)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+
+        self.scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self._items = [self.tree.insert("", "end", values=("",) * len(self.COLUMNS)) for _ in range(self.VISIBLE_ROWS)]
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_to(self._offset - 3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_to(self._offset + 3))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self.VISIBLE_ROWS))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self.VISIBLE_ROWS))
+
+        self.count_label = ttk.Label(list_frame, text="未加载", foreground="gray")
+        self.count_label.grid(row=1, column=0, columnspan=2, sticky="w", pady=(6, 0))
+
+        # Markdown预览
+        preview_frame = ttk.LabelFrame(self.frame, text="预览", padding="6")
+        preview_frame.grid(row=2, column=1, sticky="nsew")
+        preview_frame.rowconfigure(0, weight=1)
+        preview_frame.columnconfigure(0, weight=1)
+
+        self.preview_text = scrolledtext.ScrolledText(
+            preview_frame,
+            wrap=tk.CHAR,
+            width=50,
+            font=("Consolas", 9),
+            relief=tk.FLAT,
+            borderwidth=0
+        )
+        self.preview_text.grid(row=0, column=0, sticky="nsew")
+        self.preview_text.config(state=tk.DISABLED)
+
+        # 配置网格权重
+        self.frame.columnconfigure(0, weight=3)
+        self.frame.columnconfigure(1, weight=2)
+        self.frame.rowconfigure(2, weight=1)
+
+    def ensure_loaded(self):
+        """首次显示时加载清单"""
+        if not self.loaded and not self._loading:
+            self.load()
+
+    def load(self):
+        """在后台线程加载清单"""
+        if self._loading:
+            return
+        self._loading = True
+        self.count_label.config(text="正在加载清单...")
+        output_dir = self.output_dir.get().strip() or "crawled_data"
+
+        def worker():
+            manifest = None
+            rows = []
+            error = None
+            try:
+                manifest = Manifest(output_dir)
+                for entry in manifest.entries():
+                    law_rule_type = entry.get("law_rule_type") or 0
+                    rows.append((
+                        str(entry.get("pass_date") or ""),
+                        str(entry.get("title") or ""),
+                        law_rule_type if isinstance(law_rule_type, int) else 0,
+                        str(entry.get("office") or ""),
+                        str(entry.get("timeliness") or ""),
+                        entry["id"],
+                    ))
+                rows.sort(key=lambda row: row[0], reverse=True)
+            except Exception as e:
+                error = str(e)
+            self.frame.after(0, lambda: self._on_loaded(manifest, rows, error))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_loaded(self, manifest: Optional[Manifest], rows: List[Tuple], error: Optional[str]):
+        """加载完成（主线程）"""
+        self._loading = False
+        self.loaded = True
+        if error:
+            self.count_label.config(text=f"加载失败: {error}")
+            return
+
+        self._manifest = manifest
+        self._rows = rows
+
+        offices = sorted({row[3] for row in rows if row[3]})
+        timeliness = sorted({row[4] for row in rows if row[4]})
+        self.office_combo.config(values=[self.ALL] + offices)
+        self.timeliness_combo.config(values=[self.ALL] + timeliness)
+
+        if not rows and manifest is not None:
+            self.count_label.config(text=f"清单为空（{manifest.path}），可用 index --rebuild 从已有文件重建")
+        self._apply_filter()
+
+    def _schedule_filter(self):
+        """输入停顿后再过滤（避免每次按键都遍历全部条目）"""
+        if self._filter_after_id is not None:
+            self.frame.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.frame.after(150, self._apply_filter)
+
+    def _apply_filter(self):
+        """按当前条件过滤"""
+        self._filter_after_id = None
+
+        keyword = self.keyword_var.get().strip()
+        type_name = self.type_var.get()
+        law_rule_type = next((k for k, v in self.TYPE_NAMES.items() if v == type_name), None)
+        office = self.office_var.get().strip()
+        if office == self.ALL:
+            office = ""
+        timeliness = self.timeliness_var.get()
+        if timeliness == self.ALL:
+            timeliness = ""
+        date_from = self.date_from_var.get().strip()
+        date_to = self.date_to_var.get().strip()
+
+        filtered = []
+        for i, (pass_date, title, row_type, row_office, row_timeliness, _) in enumerate(self._rows):
+            if law_rule_type is not None and row_type != law_rule_type:
+                continue
+            if timeliness and row_timeliness != timeliness:
+                continue
+            if office and office not in row_office:
+                continue
+            # 日期为 YYYY-MM-DD 字符串，按前缀比较即可支持只填年份/年月
+            if date_from and pass_date[:len(date_from)] < date_from:
+                continue
+            if date_to and pass_date[:len(date_to)] > date_to:
+                continue
+            if keyword and keyword not in title:
+                continue
+            filtered.append(i)
+
+        self._filtered = filtered
+        self._selected = None
+        self._offset = 0
+        self._render()
+
+        if self._rows:
+            self.count_label.config(text=f"共 {len(self._rows)} 条，筛选后 {len(filtered)} 条")
+
+    def _render(self):
+        """用当前偏移量填充固定的表格行"""
+        total = len(self._filtered)
+        selection = None
+        for i, item in enumerate(self._items):
+            index = self._offset + i
+            if index < total:
+                pass_date, title, law_rule_type, office, timeliness, _ = self._rows[self._filtered[index]]
+                values = (pass_date, title, self.TYPE_NAMES.get(law_rule_type, law_rule_type), office, timeliness)
+                if index == self._selected:
+                    selection = item
+            else:
+                values = ("",) * len(self.COLUMNS)
+            self.tree.item(item, values=values)
+
+        # 选中状态跟随数据而不是固定的行
+        if selection is not None:
+            if self.tree.selection() != (selection,):
+                self.tree.selection_set(selection)
+        elif self.tree.selection():
+            self.tree.selection_remove(self.tree.selection())
+
+        if total > 0:
+            first = self._offset / total
+            last = min(1.0, (self._offset + self.VISIBLE_ROWS) / total)
+            self.scrollbar.set(first, last)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _scroll_to(self, offset: int):
+        """滚动到指定偏移量"""
+        max_offset = max(0, len(self._filtered) - self.VISIBLE_ROWS)
+        offset = max(0, min(offset, max_offset))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _on_scrollbar(self, *args):
+        """滚动条回调（moveto / scroll）"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self._filtered)))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.VISIBLE_ROWS
+            self._scroll_to(self._offset + step)
+
+    def _on_mousewheel(self, event):
+        """鼠标滚轮（Windows/macOS）"""
+        step = -event.delta // 120 if abs(event.delta) >= 120 else -event.delta
+        self._scroll_to(self._offset + step * 3)
+        return "break"
+
+    def _move_selection(self, step: int):
+        """键盘移动选中行，超出可见区域时滚动"""
+        if not self._filtered:
+            return "break"
+        if self._selected is None:
+            target = self._offset
+        else:
+            target = max(0, min(len(self._filtered) - 1, self._selected + step))
+        if target < self._offset:
+            self._offset = target
+        elif target >= self._offset + self.VISIBLE_ROWS:
+            self._offset = target - self.VISIBLE_ROWS + 1
+        self._selected = target
+        self._render()
+        self._show_preview(target)
+        return "break"
+
+    def _on_select(self, event=None):
+        """表格选中事件"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        index = self._offset + self._items.index(selection[0])
+        if index >= len(self._filtered) or index == self._selected:
+            return
+        self._selected = index
+        self._show_preview(index)
+
+    def _show_preview(self, index: int):
+        """读取并显示选中政策的Markdown"""
+        policy_id = self._rows[self._filtered[index]][5]
+        paths = self._manifest.resolve(policy_id, "markdown") if self._manifest else []
+
+        if paths and os.path.exists(paths[0]):
+            try:
+                content = FileHandler.read_text(paths[0]) or ""
+                if len(content) > self.PREVIEW_MAX_CHARS:
+                    content = content[:self.PREVIEW_MAX_CHARS] + "\n\n...（内容过长，已截断）"
+            except Exception as e:
+                content = f"读取失败: {e}"
+        else:
+            entry = self._manifest.get(policy_id) if self._manifest else None
+            lines = [f"{key}: {value}" for key, value in (entry or {}).items()]
+            content = "没有Markdown文件\n\n" + "\n".join(lines)
+
+        self.preview_text.config(state=tk.NORMAL)
+        self.preview_text.delete("1.0", tk.END)
+        self.preview_text.insert("1.0", content)
+        self.preview_text.config(state=tk.DISABLED)
@@ -4,7 +4,7 @@
 
 import tkinter as tk
 from tkinter import ttk, filedialog
-from typing import Callable
+from typing import Callable, List
 
 from core import Config
 
@@ -12,6 +12,8 @@ from core import Config
 class CrawlTab:
     """爬取配置选项卡"""
     
+    PROFILE_OFF = "关闭"
+    
     def __init__(
         self,
         parent,
@@ -61,6 +63,14 @@ class CrawlTab:
             command=self._on_mode_change
         ).grid(row=0, column=1, sticky="w", padx=5)
         
+        ttk.Radiobutton(
+            mode_frame,
+            text="增量更新（只爬取新增或变化的政策）",
+            variable=self.crawl_mode,
+            value="refresh",
+            command=self._on_mode_change
+        ).grid(row=0, column=2, sticky="w", padx=5)
+        
         # 政策类型选择
         type_frame = ttk.LabelFrame(self.frame, text="政策类型", padding="10")
         type_frame.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(0, 8))
@@ -207,9 +217,64 @@ class CrawlTab:
         
         proxy_frame.columnconfigure(1, weight=1)
         
+        # 筛选条件（获取列表后、获取详情前应用）
+        filter_frame = ttk.LabelFrame(self.frame, text="筛选条件（可选，多个值用逗号分隔）", padding="10")
+        filter_frame.grid(row=5, column=0, columnspan=2, sticky="ew", pady=(0, 8))
+        
+        ttk.Label(filter_frame, text="通过日期:").grid(row=0, column=0, sticky="w", padx=6, pady=4)
+        date_frame = ttk.Frame(filter_frame)
+        date_frame.grid(row=0, column=1, sticky="w", padx=6, pady=4)
+        self.filter_date_from = tk.StringVar(value=self.config.get("filter_date_from", ""))
+        ttk.Entry(date_frame, textvariable=self.filter_date_from, width=12).grid(row=0, column=0)
+        ttk.Label(date_frame, text=" 至 ").grid(row=0, column=1)
+        self.filter_date_to = tk.StringVar(value=self.config.get("filter_date_to", ""))
+        ttk.Entry(date_frame, textvariable=self.filter_date_to, width=12).grid(row=0, column=2)
+        ttk.Label(date_frame, text="  (YYYY-MM-DD)", foreground="gray").grid(row=0, column=3)
+        
+        ttk.Label(filter_frame, text="时效性:").grid(row=0, column=2, sticky="w", padx=6, pady=4)
+        self.filter_timeliness = tk.StringVar(value=",".join(self.config.get("filter_timeliness", []) or []))
+        ttk.Combobox(
+            filter_frame,
+            textvariable=self.filter_timeliness,
+            values=["", "现行有效", "已修改", "已废止", "尚未生效"],
+            width=12
+        ).grid(row=0, column=3, sticky="w", padx=6, pady=4)
+        
+        ttk.Label(filter_frame, text="制定机关:").grid(row=1, column=0, sticky="w", padx=6, pady=4)
+        self.filter_offices = tk.StringVar(value=",".join(self.config.get("filter_offices", []) or []))
+        ttk.Entry(filter_frame, textvariable=self.filter_offices).grid(row=1, column=1, sticky="ew", padx=6, pady=4)
+        
+        ttk.Label(filter_frame, text="标题关键字:").grid(row=1, column=2, sticky="w", padx=6, pady=4)
+        self.filter_title_keywords = tk.StringVar(value=",".join(self.config.get("filter_title_keywords", []) or []))
+        ttk.Entry(filter_frame, textvariable=self.filter_title_keywords).grid(row=1, column=3, sticky="ew", padx=6, pady=4)
+        
+        filter_frame.columnconfigure(1, weight=1)
+        filter_frame.columnconfigure(3, weight=1)
+        
+        # 性能分析（结果写入输出目录）
+        profile_frame = ttk.LabelFrame(self.frame, text="性能分析（可选）", padding="10")
+        profile_frame.grid(row=6, column=0, columnspan=2, sticky="ew", pady=(0, 8))
+        
+        ttk.Label(profile_frame, text="分析模式:").grid(row=0, column=0, sticky="w", padx=6, pady=4)
+        
+        self.profile_mode = tk.StringVar(value=self.config.get("profile", "") or self.PROFILE_OFF)
+        ttk.Combobox(
+            profile_frame,
+            textvariable=self.profile_mode,
+            values=[self.PROFILE_OFF, "cprofile", "sample"],
+            state="readonly",
+            width=12
+        ).grid(row=0, column=1, sticky="w", padx=6, pady=4)
+        
+        ttk.Label(
+            profile_frame,
+            text="cprofile: 确定性分析(.pstats)  sample: 采样分析(火焰图 .collapsed)",
+            foreground="gray"
+        ).grid(row=0, column=2, sticky="w", padx=6, pady=4)
+        
         # 按钮区域
         button_frame = ttk.Frame(self.frame)
-        button_frame.grid(row=5, column=0, columnspan=2, pady=20)
+        button_frame.grid(row=7, column=0, columnspan=2, pady=20)
         
         # 按钮（统一宽度：14字符，统一间距：12px）
         self.start_button = ttk.Button(
@@ -293,6 +358,12 @@ class CrawlTab:
             tk.messagebox.showwarning("警告", "请至少选择一种政策类型")
             return
         
+        from core.filters import valid_date
+        for value in (self.filter_date_from.get().strip(), self.filter_date_to.get().strip()):
+            if not valid_date(value):
+                tk.messagebox.showwarning("警告", f"无效的日期: {value}\n格式: YYYY-MM-DD")
+                return
+        
         # 准备参数
         crawl_type = self.crawl_mode.get()
         
@@ -312,7 +383,13 @@ class CrawlTab:
             "download_pdf": self.download_pdf.get(),
             "download_all_files": self.download_all_files.get(),
             "use_proxy": self.use_proxy.get(),
-            "kuaidaili_api_key": kuaidaili_api_key
+            "kuaidaili_api_key": kuaidaili_api_key,
+            "profile": "" if self.profile_mode.get() == self.PROFILE_OFF else self.profile_mode.get(),
+            "filter_date_from": self.filter_date_from.get().strip(),
+            "filter_date_to": self.filter_date_to.get().strip(),
+            "filter_offices": self._split_values(self.filter_offices.get()),
+            "filter_timeliness": self._split_values(self.filter_timeliness.get()),
+            "filter_title_keywords": self._split_values(self.filter_title_keywords.get())
         }
         
         # 禁用开始按钮，启用停止按钮
@@ -322,6 +399,11 @@ class CrawlTab:
         # 调用回调
         self.start_callback(crawl_type, **kwargs)
     
+    @staticmethod
+    def _split_values(text: str) -> List[str]:
+        """逗号分隔的输入转为列表（支持中文逗号）"""
+        return [item.strip() for item in text.replace('，', ',').split(',') if item.strip()]
+    
     def _on_stop(self):
         """停止爬取按钮点击事件"""
         self.stop_callback()
@@ -0,0 +1,183 @@
+"""
+运行监控选项卡
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, Optional
+
+from core import Config
+
+
+def _format_bytes(value: float) -> str:
+    """格式化字节数"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{value:.1f} {unit}" if unit != "B" else f"{int(value)} B"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def _format_duration(seconds: Optional[float]) -> str:
+    """格式化时长"""
+    if seconds is None:
+        return "-"
+    seconds = int(max(0, seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours > 0:
+        return f"{hours}小时{minutes}分{secs}秒"
+    if minutes > 0:
+        return f"{minutes}分{secs}秒"
+    return f"{secs}秒"
+
+
+class DashboardTab:
+    """运行监控选项卡：吞吐量、延迟、重试/限流、队列深度和剩余时间"""
+
+    # 接口/阶段显示名称
+    ENDPOINT_NAMES = {
+        "search": "列表查询",
+        "detail": "详情获取",
+        "download": "附件下载",
+        "convert": "文档转换",
+    }
+
+    def __init__(self, parent, config: Config, snapshot_provider: Callable[[], Optional[Dict]]):
+        """初始化
+
+        Args:
+            parent: 父窗口
+            config: 配置对象
+            snapshot_provider: 返回统计快照的函数（没有运行中的爬虫时返回None）
+        """
+        self.config = config
+        self.snapshot_provider = snapshot_provider
+        self.timer_id = None
+
+        # 创建主框架（统一间距：12px）
+        self.frame = ttk.Frame(parent, padding="12")
+
+        # 创建界面
+        self._create_widgets()
+
+        # 启动定时刷新
+        self._refresh()
+
+    def _create_widgets(self):
+        """创建界面组件"""
+        # 吞吐量（统一间距：组件间距8px，内部padding 10px）
+        rate_frame = ttk.LabelFrame(self.frame, text="吞吐量（最近60秒）", padding="10")
+        rate_frame.grid(row=0, column=0, sticky="ew", pady=(0, 8))
+
+        self.value_labels = {}
+        items = [
+            ("requests_per_sec", "请求/秒:"),
+            ("policies_per_sec", "政策/秒:"),
+            ("bytes_per_sec", "下载速率:"),
+            ("eta", "预计剩余:"),
+        ]
+        for i, (key, text) in enumerate(items):
+            ttk.Label(rate_frame, text=text).grid(row=i // 2, column=(i % 2) * 2, sticky="w", padx=5, pady=3)
+            label = ttk.Label(rate_frame, text="-", font=("", 10, "bold"), width=16)
+            label.grid(row=i // 2, column=(i % 2) * 2 + 1, sticky="w", padx=5, pady=3)
+            self.value_labels[key] = label
+
+        # 累计计数
+        count_frame = ttk.LabelFrame(self.frame, text="累计", padding="10")
+        count_frame.grid(row=1, column=0, sticky="ew", pady=(0, 8))
+
+        items = [
+            ("requests_total", "请求数:"),
+            ("retries_total", "重试次数:"),
+            ("rate_limits", "限流次数:"),
+            ("rate_limit_wait", "限流等待:"),
+            ("bytes_downloaded", "已下载:"),
+            ("write_queue", "写入队列:"),
+        ]
+        for i, (key, text) in enumerate(items):
+            ttk.Label(count_frame, text=text).grid(row=i // 3, column=(i % 3) * 2, sticky="w", padx=5, pady=3)
+            label = ttk.Label(count_frame, text="-", font=("", 10), width=14)
+            label.grid(row=i // 3, column=(i % 3) * 2 + 1, sticky="w", padx=5, pady=3)
+            self.value_labels[key] = label
+
+        # 延迟
+        latency_frame = ttk.LabelFrame(self.frame, text="耗时分布（最近样本，秒）", padding="10")
+        latency_frame.grid(row=2, column=0, sticky="nsew")
+        latency_frame.rowconfigure(0, weight=1)
+        latency_frame.columnconfigure(0, weight=1)
+
+        columns = ("name", "count", "errors", "retries", "p50", "p90", "p99")
+        self.latency_tree = ttk.Treeview(latency_frame, columns=columns, show="headings", height=6)
+        headings = {
+            "name": ("接口/阶段", 140),
+            "count": ("次数", 80),
+            "errors": ("失败", 80),
+            "retries": ("重试", 80),
+            "p50": ("P50", 90),
+            "p90": ("P90", 90),
+            "p99": ("P99", 90),
+        }
+        for column, (text, width) in headings.items():
+            self.latency_tree.heading(column, text=text)
+            self.latency_tree.column(column, width=width, minwidth=60, stretch=tk.YES if column == "name" else tk.NO)
+        self.latency_tree.grid(row=0, column=0, sticky="nsew")
+
+        self._latency_rows = {}
+
+        # 配置网格权重
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(2, weight=1)
+
+    def _refresh(self):
+        """定时从爬虫读取统计快照"""
+        snapshot = None
+        try:
+            snapshot = self.snapshot_provider()
+        except Exception:
+            snapshot = None
+
+        if snapshot:
+            self.update_stats(snapshot)
+
+        self.timer_id = self.frame.after(1000, self._refresh)
+
+    def update_stats(self, snapshot: Dict):
+        """更新显示
+
+        Args:
+            snapshot: CrawlStats.snapshot() 返回的数据
+        """
+        labels = self.value_labels
+        labels["requests_per_sec"].config(text=f"{snapshot['requests_per_sec']:.2f}")
+        labels["policies_per_sec"].config(text=f"{snapshot['policies_per_sec']:.2f}")
+        labels["bytes_per_sec"].config(text=f"{_format_bytes(snapshot['bytes_per_sec'])}/s")
+        labels["eta"].config(text=_format_duration(snapshot.get("eta")))
+        labels["requests_total"].config(text=str(snapshot["requests_total"]))
+        labels["retries_total"].config(text=str(snapshot["retries_total"]))
+        labels["rate_limits"].config(text=str(snapshot["rate_limits"]))
+        labels["rate_limit_wait"].config(text=_format_duration(snapshot["rate_limit_wait"]))
+        labels["bytes_downloaded"].config(text=_format_bytes(snapshot["bytes_downloaded"]))
+        labels["write_queue"].config(text=str(snapshot["queue_depths"].get("write", 0)))
+
+        for name, data in snapshot["latencies"].items():
+            values = (
+                self.ENDPOINT_NAMES.get(name, name),
+                data["count"],
+                data["errors"],
+                data["retries"],
+                f"{data['p50']:.3f}",
+                f"{data['p90']:.3f}",
+                f"{data['p99']:.3f}",
+            )
+            item = self._latency_rows.get(name)
+            if item is None:
+                self._latency_rows[name] = self.latency_tree.insert("", "end", values=values)
+            else:
+                self.latency_tree.item(item, values=values)
+
+    def stop_timer(self):
+        """停止定时器"""
+        if self.timer_id:
+            self.frame.after_cancel(self.timer_id)
+            self.timer_id = None
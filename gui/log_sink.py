@@ -0,0 +1,114 @@
+"""
+日志输出组件 - 批量刷新、行数受限的GUI日志
+"""
+
+import queue
+import logging
+import threading
+import tkinter as tk
+
+
+class QueueLogHandler(logging.Handler):
+    """把日志放入有界队列的处理器（可在任意线程调用）
+
+    队列满时丢弃新记录并计数，避免日志洪峰拖垮界面。
+    """
+
+    def __init__(self, max_queue_size: int = 5000):
+        """初始化
+
+        Args:
+            max_queue_size: 队列容量
+        """
+        super().__init__()
+        self.queue: "queue.Queue[str]" = queue.Queue(maxsize=max(1, max_queue_size))
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def emit(self, record):
+        try:
+            msg = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        try:
+            self.queue.put_nowait(msg)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+
+    def take_dropped(self) -> int:
+        """取出并清零丢弃计数"""
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        return dropped
+
+
+class LogSink:
+    """定时批量把队列中的日志写入文本框
+
+    文本框只保留最近 max_lines 行（完整日志写入日志文件），每次刷新
+    最多处理 batch_size 条，一次 insert 完成，不再逐条调度和 update_idletasks。
+    """
+
+    def __init__(
+        self,
+        text_widget,
+        handler: QueueLogHandler,
+        max_lines: int = 2000,
+        interval_ms: int = 200,
+        batch_size: int = 500
+    ):
+        """初始化
+
+        Args:
+            text_widget: 日志文本框
+            handler: 日志队列处理器
+            max_lines: 文本框最多保留的行数
+            interval_ms: 刷新间隔（毫秒）
+            batch_size: 每次刷新最多处理的记录数
+        """
+        self.text_widget = text_widget
+        self.handler = handler
+        self.max_lines = max(100, max_lines)
+        self.interval_ms = max(50, interval_ms)
+        self.batch_size = max(1, batch_size)
+        self._after_id = None
+
+    def start(self):
+        """启动刷新定时器"""
+        if self._after_id is None:
+            self._drain()
+
+    def stop(self):
+        """停止刷新定时器"""
+        if self._after_id is not None:
+            self.text_widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _drain(self):
+        """取出一批日志写入文本框"""
+        lines = []
+        try:
+            while len(lines) < self.batch_size:
+                lines.append(self.handler.queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        dropped = self.handler.take_dropped()
+        if dropped:
+            lines.append(f"[日志过多，已省略 {dropped} 条，完整内容见日志文件]")
+
+        if lines:
+            self.text_widget.insert(tk.END, '\n'.join(lines) + '\n')
+            self._trim()
+            self.text_widget.see(tk.END)
+
+        self._after_id = self.text_widget.after(self.interval_ms, self._drain)
+
+    def _trim(self):
+        """删除超出上限的旧行"""
+        line_count = int(self.text_widget.index('end-1c').split('.')[0])
+        excess = line_count - self.max_lines
+        if excess > 0:
+            self.text_widget.delete('1.0', f'{excess + 1}.0')
@@ -7,12 +7,17 @@ from tkinter import ttk, messagebox, scrolledtext
 import sys
 import threading
 import logging
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-from core import Config, PolicyCrawler, CrawlProgress
+from core import Config, CrawlProgress
 from .crawl_tab import CrawlTab
 from .progress_tab import ProgressTab
-from .settings_tab import SettingsTab
+from .log_sink import QueueLogHandler, LogSink
+from utils import Logger
+
+if TYPE_CHECKING:
+    from core import PolicyCrawler
+    from core.profiling import Profiler
 
 
 class MainWindow:
@@ -55,12 +60,21 @@ class MainWindow:
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
         
         # 爬虫实例
-        self.crawler: Optional[PolicyCrawler] = None
+        self.crawler: Optional["PolicyCrawler"] = None
         self.crawl_thread: Optional[threading.Thread] = None
         self.is_crawling = False
+        self.profiler: Optional["Profiler"] = None
+        
+        # 进度更新合并：后台线程只保存最新进度，由界面定时器按固定频率刷新
+        self._pending_progress: Optional[CrawlProgress] = None
+        self._progress_tick_id = None
+        self._progress_interval = max(50, int(self.config.get("gui_refresh_interval_ms", 150)))
         
         # 创建界面
         self._create_widgets()
+        
+        # 启动进度刷新定时器
+        self._progress_tick()
     
     def _create_widgets(self):
         """创建界面组件"""
@@ -79,14 +93,20 @@ class MainWindow:
         self.notebook = ttk.Notebook(main_frame)
         self.notebook.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
         
-        # 创建各个选项卡
+        # 创建各个选项卡（爬取配置和进度页立即创建，其余页面首次切换到时再创建）
         self.crawl_tab = CrawlTab(self.notebook, self.config, self._on_start_crawl, self._on_stop_crawl)
         self.progress_tab = ProgressTab(self.notebook, self.config)
-        self.settings_tab = SettingsTab(self.notebook, self.config)
+        self.dashboard_tab = None
+        self.browser_tab = None
+        self.settings_tab = None
+        self._lazy_tabs = {}
         
         self.notebook.add(self.crawl_tab.frame, text="  爬取配置  ")
         self.notebook.add(self.progress_tab.frame, text="  爬取进度  ")
-        self.notebook.add(self.settings_tab.frame, text="  设置  ")
+        self._add_lazy_tab("dashboard_tab", "  运行监控  ", self._create_dashboard_tab)
+        self._add_lazy_tab("browser_tab", "  数据浏览  ", self._create_browser_tab)
+        self._add_lazy_tab("settings_tab", "  设置  ", self._create_settings_tab)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         
         # 创建底部日志区域（统一间距：8px）
         log_frame = ttk.LabelFrame(main_frame, text="日志输出", padding="8")
@@ -120,7 +140,7 @@ class MainWindow:
         """开始爬取回调
         
         Args:
-            crawl_type: 爬取类型 ('single' 或 'batch')
+            crawl_type: 爬取类型 ('single'、'batch' 或 'refresh')
             **kwargs: 爬取参数
         """
         if self.is_crawling:
@@ -135,7 +155,13 @@ class MainWindow:
             if value is not None:
                 self.config.set(key, value)
         
-        # 创建爬虫实例
+        # 性能分析（只分析之后启动的爬取、写入线程，不含界面主线程）
+        if self.config.get("profile"):
+            from core.profiling import create_profiler
+            self.profiler = create_profiler(self.config, include_current_thread=False)
+        
+        # 创建爬虫实例（延迟导入网络和转换模块，加快界面启动）
+        from core import PolicyCrawler
         self.crawler = PolicyCrawler(self.config, progress_callback=self._update_progress)
         
         # 初始化进度显示
@@ -174,12 +200,13 @@ class MainWindow:
                 logging.info("\n[测试模式] 获取第一页政策列表...")
                 result = self.crawler.api_client.search_policies(law_rule_type, page_num=1, page_size=20)
                 
+                # 校验并转换为Policy对象
+                from core.codec import decode_policies
+                policies = []
                 if result and result.get('data', {}).get('rows'):
-                    # 转换为Policy对象
-                    from core import Policy
-                    rows = result['data']['rows']
-                    policies = [Policy.from_dict(row) for row in rows]
-                    
+                    policies, _ = decode_policies(result['data']['rows'])
+                
+                if policies:
                     logging.info(f"获取到 {len(policies)} 条政策")
                     
                     policy = policies[0]
@@ -195,14 +222,18 @@ class MainWindow:
                     # 更新统计信息
                     if success:
                         self.crawler.progress.completed_count = 1
-                        self.crawler.progress.completed_policies.append(policy.id)
+                        self.crawler.progress.completed_policies.add(policy.id)
                         self._show_completion("爬取完成", "单个政策爬取成功！")
                     else:
                         self.crawler.progress.failed_count = 1
+                        from core.failures import describe
+                        failure = self.crawler.last_failure or {}
                         self.crawler.progress.failed_policies.append({
                             'id': policy.id,
                             'title': policy.title,
-                            'reason': '爬取失败'
+                            'reason': describe(failure["category"]) if failure else '爬取失败',
+                            'category': failure.get("category", ""),
+                            'detail': failure.get("reason", "")
                         })
                         self._show_error("爬取失败", "政策爬取失败，请查看日志")
                     
@@ -214,7 +245,7 @@ class MainWindow:
                     self.crawler.progress.end_time = datetime.now()
                     self._update_progress(self.crawler.progress)
             
-            elif crawl_type == 'batch':
+            elif crawl_type in ('batch', 'refresh'):
                 # 批量爬取（crawl_batch内部会处理进度更新）
                 # 初始化进度对象（start_time会在crawl_batch开始时设置）
                 from core import CrawlProgress
@@ -222,12 +253,21 @@ class MainWindow:
                 # 注意：start_time在crawl_batch方法开始时设置，这样搜索列表时就开始计时
                 
                 law_rule_types = self.config.get("law_rule_types", [1, 2, 3])
-                progress = self.crawler.crawl_batch(law_rule_types)
+                refresh = crawl_type == 'refresh'
+                progress = self.crawler.crawl_batch(law_rule_types, refresh=refresh)
                 
                 # 确保最终进度已更新
                 self._update_progress(progress)
                 
-                self._show_completion("爬取完成", f"批量爬取完成！\n成功: {progress.completed_count}\n失败: {progress.failed_count}")
+                if refresh:
+                    self._show_completion(
+                        "更新完成",
+                        f"增量更新完成！\n新增或变化: {progress.total_count}\n"
+                        f"已更新: {progress.completed_count}\n失败: {progress.failed_count}\n"
+                        f"变化记录: {self.crawler.CHANGES_FILENAME}"
+                    )
+                else:
+                    self._show_completion("爬取完成", f"批量爬取完成！\n成功: {progress.completed_count}\n失败: {progress.failed_count}")
         
         except Exception as e:
             self._show_error("错误", f"爬取过程中发生错误:\n{str(e)}")
@@ -238,6 +278,9 @@ class MainWindow:
             self.is_crawling = False
             if self.crawler:
                 self.crawler.close()
+            if self.profiler is not None:
+                self.profiler.stop()
+                self.profiler = None
             
             # 恢复按钮状态（在主线程中执行）
             self.root.after(0, self._restore_button_state)
@@ -268,11 +311,21 @@ class MainWindow:
     def _update_progress(self, progress: CrawlProgress):
         """更新进度（从后台线程调用）
         
+        只记录最新的进度对象，多次回调在下一个界面刷新周期合并为一次更新。
+        
         Args:
             progress: 进度对象
         """
-        # 使用after方法在主线程中更新UI
-        self.root.after(0, self.progress_tab.update_progress, progress)
+        self._pending_progress = progress
+    
+    def _progress_tick(self):
+        """界面刷新定时器：应用最近一次进度（在主线程中执行）"""
+        progress = self._pending_progress
+        if progress is not None:
+            self._pending_progress = None
+            self.progress_tab.update_progress(progress)
+        
+        self._progress_tick_id = self.root.after(self._progress_interval, self._progress_tick)
     
     def _show_completion(self, title: str, message: str):
         """显示完成消息（线程安全）"""
@@ -289,41 +342,65 @@ class MainWindow:
     
     def _setup_logging(self):
         """配置日志系统"""
-        # 创建自定义的日志处理器，输出到GUI的日志文本框
-        class TextHandler(logging.Handler):
-            def __init__(self, text_widget):
-                super().__init__()
-                self.text_widget = text_widget
-            
-            def emit(self, record):
-                msg = self.format(record)
-                def append():
-                    self.text_widget.insert(tk.END, msg + '\n')
-                    self.text_widget.see(tk.END)
-                    self.text_widget.update_idletasks()
-                # 确保在主线程中更新GUI
-                self.text_widget.after(0, append)
-        
-        # 配置根日志记录器
-        logger = logging.getLogger()
-        logger.setLevel(logging.INFO)
-        
-        # 移除现有的处理器
-        logger.handlers.clear()
-        
-        # 添加GUI文本框处理器
-        text_handler = TextHandler(self.log_text)
-        text_handler.setLevel(logging.INFO)
         formatter = logging.Formatter('%(message)s')
+        
+        # GUI文本框：日志先进入有界队列，由定时器批量写入，文本框只保留最近的行
+        text_handler = QueueLogHandler(self.config.get("gui_log_queue_size", 5000))
+        text_handler.setLevel(logging.INFO)
         text_handler.setFormatter(formatter)
-        logger.addHandler(text_handler)
-        
-        # 添加控制台处理器（用于调试）
-        if sys.__stdout__:
-            console_handler = logging.StreamHandler(sys.__stdout__)
-            console_handler.setLevel(logging.INFO)
-            console_handler.setFormatter(formatter)
-            logger.addHandler(console_handler)
+        
+        self.log_sink = LogSink(
+            self.log_text,
+            text_handler,
+            max_lines=self.config.get("gui_log_max_lines", 2000),
+            interval_ms=self.config.get("gui_refresh_interval_ms", 150)
+        )
+        self.log_sink.start()
+        
+        # 根日志记录器只把记录放入队列，由后台线程写入文本框队列、
+        # 日志文件（保存完整日志，文本框中被截断的旧行可在此查看）和控制台
+        Logger.setup_from_config(self.config, extra_handlers=[text_handler])
+    
+    def _add_lazy_tab(self, attr: str, text: str, factory):
+        """添加延迟创建的选项卡（先放一个空容器）
+        
+        Args:
+            attr: 创建后保存选项卡对象的属性名
+            text: 选项卡标题
+            factory: 创建函数，参数为容器框架
+        """
+        container = ttk.Frame(self.notebook)
+        container.rowconfigure(0, weight=1)
+        container.columnconfigure(0, weight=1)
+        self.notebook.add(container, text=text)
+        self._lazy_tabs[str(container)] = (attr, container, factory)
+    
+    def _create_dashboard_tab(self, parent):
+        from .dashboard_tab import DashboardTab
+        return DashboardTab(
+            parent, self.config,
+            lambda: self.crawler.stats_snapshot() if self.crawler else None
+        )
+    
+    def _create_browser_tab(self, parent):
+        from .browser_tab import BrowserTab
+        tab = BrowserTab(parent, self.config)
+        tab.ensure_loaded()
+        return tab
+    
+    def _create_settings_tab(self, parent):
+        from .settings_tab import SettingsTab
+        return SettingsTab(parent, self.config)
+    
+    def _on_tab_changed(self, event=None):
+        """选项卡切换事件（首次显示时创建延迟选项卡）"""
+        lazy = self._lazy_tabs.pop(self.notebook.select(), None)
+        if lazy is None:
+            return
+        attr, container, factory = lazy
+        tab = factory(container)
+        tab.frame.grid(row=0, column=0, sticky="nsew")
+        setattr(self, attr, tab)
     
     def _on_closing(self):
         """窗口关闭事件"""
@@ -338,10 +415,18 @@ class MainWindow:
         # 停止进度页面的定时器
         if hasattr(self, 'progress_tab'):
             self.progress_tab.stop_timer()
+        if getattr(self, 'dashboard_tab', None):
+            self.dashboard_tab.stop_timer()
+        if self._progress_tick_id:
+            self.root.after_cancel(self._progress_tick_id)
+            self._progress_tick_id = None
+        if hasattr(self, 'log_sink'):
+            self.log_sink.stop()
         
         # 关闭爬虫
         if self.crawler:
             self.crawler.close()
+        Logger.shutdown()
         
         # 销毁窗口
         self.root.destroy()
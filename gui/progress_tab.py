@@ -23,6 +23,11 @@ class ProgressTab:
         self.current_progress = None  # 保存当前进度对象
         self.timer_id = None  # 定时器ID
         
+        # 失败列表增量更新状态
+        self._failed_source = None  # 已显示的失败列表对象
+        self._failed_rendered = 0  # 已显示的失败记录数
+        self._failed_placeholder = None  # “暂无失败记录”占位行
+        
         # 创建主框架（统一间距：12px）
         self.frame = ttk.Frame(parent, padding="12")
         
@@ -102,6 +107,12 @@ class ProgressTab:
         ttk.Label(stats_frame, text="用时:").grid(row=row, column=0, sticky="w", padx=5, pady=3)
         self.time_label = ttk.Label(stats_frame, text="0秒", font=("", 10))
         self.time_label.grid(row=row, column=1, sticky="w", padx=5, pady=3)
+        row += 1
+        
+        # 写入队列
+        ttk.Label(stats_frame, text="待写入:").grid(row=row, column=0, sticky="w", padx=5, pady=3)
+        self.write_queue_label = ttk.Label(stats_frame, text="0", font=("", 10))
+        self.write_queue_label.grid(row=row, column=1, sticky="w", padx=5, pady=3)
         
         # 当前政策信息
         current_frame = ttk.LabelFrame(self.frame, text="当前政策", padding="10")
@@ -174,6 +185,7 @@ class ProgressTab:
         self.success_label.config(text=str(progress.completed_count))
         self.failed_label.config(text=str(progress.failed_count))
         self.rate_label.config(text=f"{progress.success_rate:.2f}%")
+        self.write_queue_label.config(text=str(progress.write_queue_depth))
         
         # 保存当前进度对象（用于定时器自动更新用时）
         self.current_progress = progress
@@ -184,22 +196,42 @@ class ProgressTab:
         self.current_id_label.config(text=progress.current_policy_id or "-")
         self.current_title_label.config(text=progress.current_policy_title or "-")
         
-        # 更新失败列表
-        # 清空现有项
-        for item in self.failed_tree.get_children():
-            self.failed_tree.delete(item)
-        
-        # 如果有失败的政策，添加新项
-        if progress.failed_policies:
-            for failed in progress.failed_policies:
-                self.failed_tree.insert("", "end", values=(
-                    failed.get("id", ""),
-                    failed.get("title", ""),
-                    failed.get("reason", "")
-                ))
-        else:
+        # 更新失败列表（只追加新增的行）
+        self._update_failed_tree(progress.failed_policies)
+    
+    def _update_failed_tree(self, failed_policies):
+        """增量更新失败列表
+        
+        Args:
+            failed_policies: 失败记录列表
+        """
+        # 换了新的进度对象（重新开始爬取）时清空重建
+        if failed_policies is not self._failed_source or len(failed_policies) < self._failed_rendered:
+            children = self.failed_tree.get_children()
+            if children:
+                self.failed_tree.delete(*children)
+            self._failed_source = failed_policies
+            self._failed_rendered = 0
+            self._failed_placeholder = None
+        
+        count = len(failed_policies)
+        if count == 0:
             # 如果没有失败项，显示提示信息
-            self.failed_tree.insert("", "end", values=("", "暂无失败记录", ""))
+            if self._failed_placeholder is None:
+                self._failed_placeholder = self.failed_tree.insert("", "end", values=("", "暂无失败记录", ""))
+            return
+        
+        if self._failed_placeholder is not None:
+            self.failed_tree.delete(self._failed_placeholder)
+            self._failed_placeholder = None
+        
+        for failed in failed_policies[self._failed_rendered:count]:
+            self.failed_tree.insert("", "end", values=(
+                failed.get("id", ""),
+                failed.get("title", ""),
+                failed.get("reason", "")
+            ))
+        self._failed_rendered = count
     
     def _start_time_update_timer(self):
         """启动定时器，每秒自动更新用时显示"""
@@ -0,0 +1,192 @@
+"""
+压缩存储工具 - zstd 落盘压缩与小文件字典训练
+"""
+
+import os
+import io
+import threading
+from typing import BinaryIO, Dict, List, Optional
+
+# 检查依赖库
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+
+class ZstdCodec:
+    """zstd 压缩编解码器
+
+    JSON/Markdown 这类小文本文件单独压缩时压缩率有限，因此先收集一批
+    样本训练字典，之后的小文件使用字典压缩。字典保存在输出目录的
+    zstd.dict 中，zstd 帧头记录字典ID，读取时自动匹配。
+    附件中 DOCX/PDF 等本身已压缩的格式不再压缩。
+    """
+
+    SUFFIX = ".zst"
+    DICT_FILENAME = "zstd.dict"
+
+    # 使用字典压缩的小文本文件
+    TEXT_EXTS = (".json", ".md")
+
+    # 本身已压缩，再压缩收益很小
+    INCOMPRESSIBLE_EXTS = (
+        ".docx", ".xlsx", ".pptx", ".pdf", ".zip", ".rar", ".7z", ".gz",
+        ".ofd", ".jpg", ".jpeg", ".png", ".gif",
+    )
+
+    # 参与字典训练的单个样本上限（字节）
+    MAX_SAMPLE_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        dict_dir: str,
+        level: int = 10,
+        dict_size: int = 112640,
+        train_samples: int = 500,
+        compress_attachments: bool = True
+    ):
+        """初始化编解码器
+
+        Args:
+            dict_dir: 字典文件所在目录（通常为输出根目录）
+            level: 压缩级别
+            dict_size: 字典大小（字节）
+            train_samples: 收集多少个样本后训练字典，0 表示不训练（只使用已有字典）
+            compress_attachments: 是否压缩可压缩的附件（如DOC）
+        """
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard未安装: pip install zstandard")
+
+        self.dict_path = os.path.join(dict_dir, self.DICT_FILENAME)
+        self.level = level
+        self.dict_size = dict_size
+        self.train_samples = train_samples
+        self.compress_attachments = compress_attachments
+
+        self._samples: List[bytes] = []
+        self._dict = None
+        self._lock = threading.Lock()
+        self._plain = zstandard.ZstdCompressor(level=level)
+        self._with_dict = None
+
+        if os.path.exists(self.dict_path):
+            with open(self.dict_path, 'rb') as f:
+                self._set_dict(zstandard.ZstdCompressionDict(f.read()))
+
+    def should_compress(self, path: str) -> bool:
+        """判断文件是否需要压缩"""
+        lower = path.lower()
+        if lower.endswith(self.SUFFIX):
+            return False
+        if lower.endswith(self.TEXT_EXTS):
+            return True
+        if not self.compress_attachments:
+            return False
+        return not lower.endswith(self.INCOMPRESSIBLE_EXTS)
+
+    def target_path(self, path: str) -> str:
+        """压缩后的文件路径"""
+        if self.should_compress(path):
+            return path + self.SUFFIX
+        return path
+
+    def compress(self, path: str, data: bytes) -> bytes:
+        """压缩文件内容（供写入线程调用）
+
+        Args:
+            path: 原始文件路径（用于判断文件类型）
+            data: 原始内容
+
+        Returns:
+            压缩后的内容
+        """
+        with self._lock:
+            if path.lower().endswith(self.TEXT_EXTS):
+                if self._with_dict is not None:
+                    return self._with_dict.compress(data)
+                self._collect_sample(data)
+            return self._plain.compress(data)
+
+    def _collect_sample(self, data: bytes):
+        """收集训练样本，够数后训练字典"""
+        if self.train_samples <= 0 or len(data) > self.MAX_SAMPLE_SIZE:
+            return
+        self._samples.append(data)
+        if len(self._samples) < self.train_samples:
+            return
+
+        samples, self._samples = self._samples, []
+        try:
+            trained = zstandard.train_dictionary(self.dict_size, samples)
+        except Exception:
+            # 样本太少或太相似时训练可能失败，继续不用字典压缩
+            return
+
+        tmp_path = f"{self.dict_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(trained.as_bytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.dict_path)
+        self._set_dict(trained)
+
+    def _set_dict(self, compression_dict):
+        self._dict = compression_dict
+        self._with_dict = zstandard.ZstdCompressor(level=self.level, dict_data=compression_dict)
+
+
+# 读取时按字典文件路径缓存字典
+_dict_cache: Dict[str, object] = {}
+_dict_cache_lock = threading.Lock()
+
+
+def _find_dict(path: str, max_depth: int = 5):
+    """从文件所在目录向上查找 zstd.dict"""
+    directory = os.path.dirname(os.path.abspath(path))
+    for _ in range(max_depth):
+        dict_path = os.path.join(directory, ZstdCodec.DICT_FILENAME)
+        if os.path.exists(dict_path):
+            with _dict_cache_lock:
+                if dict_path not in _dict_cache:
+                    with open(dict_path, 'rb') as f:
+                        _dict_cache[dict_path] = zstandard.ZstdCompressionDict(f.read())
+                return _dict_cache[dict_path]
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+    return None
+
+
+def open_decompressed(path: str) -> BinaryIO:
+    """以流的方式打开文件，.zst 文件边读边解压
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        二进制只读文件对象
+    """
+    f = open(path, 'rb')
+    if not path.endswith(ZstdCodec.SUFFIX):
+        return f
+
+    if not ZSTD_AVAILABLE:
+        f.close()
+        raise RuntimeError("zstandard未安装，无法读取压缩文件: pip install zstandard")
+
+    header = f.read(18)
+    f.seek(0)
+    dict_data = None
+    try:
+        if zstandard.get_frame_parameters(header).dict_id:
+            dict_data = _find_dict(path)
+    except Exception:
+        pass
+
+    decompressor = zstandard.ZstdDecompressor(dict_data=dict_data) if dict_data \
+        else zstandard.ZstdDecompressor()
+    return io.BufferedReader(decompressor.stream_reader(f, closefd=True))
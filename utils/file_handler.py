@@ -3,17 +3,61 @@
 """
 
 import os
+import io
 import json
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, List, Optional, TextIO
 from pathlib import Path
 
+from .compression import open_decompressed
+
 
 class FileHandler:
     """文件处理器"""
     
+    @staticmethod
+    def open_stream(filepath: str) -> BinaryIO:
+        """以二进制流打开文件（.zst 压缩文件边读边解压）
+        
+        Args:
+            filepath: 文件路径
+            
+        Returns:
+            二进制只读文件对象
+        """
+        return open_decompressed(filepath)
+    
+    @staticmethod
+    def open_text(filepath: str) -> TextIO:
+        """以UTF-8文本流打开文件（.zst 压缩文件边读边解压）
+        
+        Args:
+            filepath: 文件路径
+            
+        Returns:
+            文本只读文件对象
+        """
+        return io.TextIOWrapper(open_decompressed(filepath), encoding='utf-8')
+    
+    @staticmethod
+    def read_bytes(filepath: str) -> Optional[bytes]:
+        """读取文件全部内容（自动解压 .zst）
+        
+        Args:
+            filepath: 文件路径
+            
+        Returns:
+            文件内容
+        """
+        try:
+            with open_decompressed(filepath) as f:
+                return f.read()
+        except Exception as e:
+            print(f"读取文件失败: {e}")
+            return None
+    
     @staticmethod
     def read_json(filepath: str) -> Optional[Dict]:
-        """读取JSON文件
+        """读取JSON文件（自动解压 .zst）
         
         Args:
             filepath: 文件路径
@@ -22,7 +66,7 @@ class FileHandler:
             JSON数据字典
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
+            with FileHandler.open_text(filepath) as f:
                 return json.load(f)
         except Exception as e:
             print(f"读取JSON失败: {e}")
@@ -51,7 +95,7 @@ class FileHandler:
     
     @staticmethod
     def read_text(filepath: str) -> Optional[str]:
-        """读取文本文件
+        """读取文本文件（自动解压 .zst）
         
         Args:
             filepath: 文件路径
@@ -60,7 +104,7 @@ class FileHandler:
             文本内容
         """
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
+            with FileHandler.open_text(filepath) as f:
                 return f.read()
         except Exception as e:
             print(f"读取文本失败: {e}")
@@ -1,17 +1,193 @@
 """
-日志模块
+日志模块 - 队列化日志管道（后台线程落盘）、JSON Lines 格式、按模块设置级别
 """
 
+import json
+import queue
+import atexit
 import logging
+import logging.handlers
 import sys
-from typing import Optional
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
 from pathlib import Path
 
 
+# LogRecord 的标准属性，其余属性（通过 extra= 传入）作为结构化字段输出
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON Lines 格式化器
+
+    每条记录输出一行 JSON：时间、级别、模块、线程、消息，以及调用方通过
+    extra= 传入的字段（如 policy_id、endpoint、attempt）。
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage().strip(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """放入有界队列的处理器
+
+    队列满时 WARNING 以下的记录直接丢弃并计数（调用方不阻塞）；WARNING 及以上
+    （失败原因、异常堆栈）最多等待 BLOCK_TIMEOUT 秒，仍放不进去才丢弃。
+    """
+
+    BLOCK_TIMEOUT = 1.0
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record, timeout=self.BLOCK_TIMEOUT)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """停止时等待队列腾出空间再放入结束标记（队列满时 put_nowait 会失败）"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
 class Logger:
     """日志管理器"""
     
     _loggers = {}
+    _listener: Optional[logging.handlers.QueueListener] = None
+    _queue_handler: Optional[DroppingQueueHandler] = None
+    
+    @classmethod
+    def setup(
+        cls,
+        level: str = "INFO",
+        log_file: Optional[str] = None,
+        log_format: str = "text",
+        log_levels: Optional[Dict[str, str]] = None,
+        console: bool = True,
+        extra_handlers: Optional[List[logging.Handler]] = None,
+        queue_size: int = 10000
+    ):
+        """配置根日志记录器
+        
+        各线程只把记录放入有界队列（不持有 stdout / 文件锁），由后台
+        监听线程写入控制台、日志文件和 extra_handlers。重复调用会先关闭
+        之前的监听线程。
+        
+        Args:
+            level: 根日志级别
+            log_file: 日志文件路径（为空不写文件）
+            log_format: 日志文件格式: text / json（JSON Lines）
+            log_levels: 按模块设置级别，如 {"core.api_client": "WARNING"}
+            console: 是否输出到控制台
+            extra_handlers: 其他处理器（如GUI文本框）
+            queue_size: 队列容量（满时丢弃 WARNING 以下的新记录）
+        """
+        cls.shutdown()
+        
+        handlers: List[logging.Handler] = []
+        if console and sys.__stdout__:
+            console_handler = logging.StreamHandler(sys.__stdout__)
+            console_handler.setFormatter(logging.Formatter('%(message)s'))
+            handlers.append(console_handler)
+        
+        if log_file:
+            try:
+                Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+                file_handler = logging.FileHandler(log_file, encoding='utf-8')
+                if log_format == "json":
+                    file_handler.setFormatter(JsonFormatter())
+                else:
+                    file_handler.setFormatter(logging.Formatter(
+                        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S'
+                    ))
+                handlers.append(file_handler)
+            except OSError as e:
+                print(f"日志文件打开失败: {e}")
+        
+        handlers.extend(extra_handlers or [])
+        
+        cls._queue_handler = DroppingQueueHandler(queue.Queue(maxsize=max(1, queue_size)))
+        cls._listener = _QueueListener(
+            cls._queue_handler.queue, *handlers, respect_handler_level=True
+        )
+        cls._listener.start()
+        
+        root = logging.getLogger()
+        root.handlers.clear()
+        root.addHandler(cls._queue_handler)
+        root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+        
+        for name, module_level in (log_levels or {}).items():
+            logging.getLogger(name).setLevel(getattr(logging, str(module_level).upper(), logging.INFO))
+    
+    @classmethod
+    def setup_from_config(cls, config, **kwargs):
+        """按配置（log_level、log_file、log_format、log_levels）配置日志
+        
+        Args:
+            config: 配置对象
+            **kwargs: 传给 setup() 的其他参数
+        """
+        cls.setup(
+            level=config.get("log_level", "INFO"),
+            log_file=config.get("log_file") or None,
+            log_format=config.get("log_format", "text"),
+            log_levels=config.get("log_levels") or {},
+            queue_size=config.get("log_queue_size", 10000),
+            **kwargs
+        )
+    
+    @classmethod
+    def shutdown(cls):
+        """写完队列中剩余的日志并停止后台线程"""
+        if cls._listener is None:
+            return
+        root = logging.getLogger()
+        if cls._queue_handler in root.handlers:
+            root.removeHandler(cls._queue_handler)
+        cls._listener.stop()
+        for handler in cls._listener.handlers:
+            try:
+                handler.close()
+            except Exception:
+                pass
+        dropped = cls._queue_handler.dropped
+        cls._listener = None
+        cls._queue_handler = None
+        if dropped and sys.__stderr__:
+            print(f"[警告] 日志队列已满，共丢弃 {dropped} 条日志（可调大 log_queue_size）", file=sys.__stderr__)
+    
+    @classmethod
+    def dropped_count(cls) -> int:
+        """队列满时丢弃的日志条数"""
+        return cls._queue_handler.dropped if cls._queue_handler is not None else 0
     
     @classmethod
     def get_logger(
@@ -84,3 +260,5 @@ class Logger:
         """记录调试信息"""
         cls.get_logger().debug(message)
 
+
+atexit.register(Logger.shutdown)